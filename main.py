@@ -7,13 +7,33 @@ Author: Klaus
 MIT License
 """
 
+import os
+
 from dotenv import load_dotenv
 
 load_dotenv()
 
-from src.app.main import app  # noqa
+APP_IMPORT_PATH = "src.app.main:app"
+
+
+def __getattr__(name: str):
+    # Keep ``main:app`` importable without loading the app when run as a
+    # script; uvicorn imports it itself from APP_IMPORT_PATH.
+    if name == "app":
+        from src.app.main import app
+
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 if __name__ == "__main__":
-    import uvicorn
+    workers = int(os.getenv("WEB_WORKERS", "1"))
+    if workers > 1:
+        # Preloaded workers behind a thread_id-sticky proxy
+        from src.app.launcher import run
+
+        run(workers, host="0.0.0.0", port=8084)
+    else:
+        import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8084)
+        uvicorn.run(APP_IMPORT_PATH, host="0.0.0.0", port=8084)
@@ -7,38 +7,68 @@ Author: Klaus
 MIT License
 """
 
-# Import modules
-from . import services as _services
-from . import utils as _utils
+from importlib import import_module
 
-# Import classes directly and create namespaces
-from .models.gemini import Gemini as GeminiModel
-from .data_models.graph_state import CarSystemState
-from .nodes.input_guard_rail import InputGuardRail
-from .nodes.output_guard_rail import OutputGuardRail
-from .data_models.agent_card import AgentCard
-from .nodes.reasoning_node import ReasoningNode
 
+class _LazyNamespace:
+    """Namespace whose attributes are imported on first access."""
 
-# Create namespace objects
-class models:
-    GeminiModel = GeminiModel
+    def __init__(self, name: str, attributes: dict[str, str]):
+        self._name = name
+        self._attributes = attributes
 
+    def __getattr__(self, attr: str):
+        try:
+            target = self._attributes[attr]
+        except KeyError:
+            raise AttributeError(
+                f"namespace {self._name!r} has no attribute {attr!r}"
+            ) from None
+        module_name, _, class_name = target.rpartition(".")
+        value = getattr(import_module(module_name, __name__), class_name)
+        # Cache on the instance so __getattr__ is not hit again
+        setattr(self, attr, value)
+        return value
 
-class nodes:
-    InputGuardRail = InputGuardRail
-    OutputGuardRail = OutputGuardRail
-    ReasoningNode = ReasoningNode
+    def __dir__(self):
+        return sorted(self._attributes)
 
+    def __repr__(self):
+        return f"<namespace {self._name}>"
+
+
+# Create namespace objects (classes are imported on first access)
+models = _LazyNamespace(
+    "models",
+    {"GeminiModel": ".models.gemini.Gemini"},
+)
+
+nodes = _LazyNamespace(
+    "nodes",
+    {
+        "InputGuardRail": ".nodes.input_guard_rail.InputGuardRail",
+        "OutputGuardRail": ".nodes.output_guard_rail.OutputGuardRail",
+        "ReasoningNode": ".nodes.reasoning_node.ReasoningNode",
+    },
+)
 
 # State schema
-class schemas:
-    CarSystemState = CarSystemState
-    AgentCard = AgentCard
+schemas = _LazyNamespace(
+    "schemas",
+    {
+        "CarSystemState": ".data_models.graph_state.CarSystemState",
+        "AgentCard": ".data_models.agent_card.AgentCard",
+    },
+)
+
 
+def __getattr__(name: str):
+    # Make modules available as namespaces without importing them eagerly
+    if name in ("services", "utils"):
+        module = import_module(f".{name}", __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Make modules available as namespaces
-services = _services
-utils = _utils
 
 __all__ = ["models", "nodes", "schemas", "services", "utils"]
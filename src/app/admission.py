@@ -0,0 +1,173 @@
+"""
+File: admission.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Any
+
+from fastapi import HTTPException
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AdmissionController:
+    """Bound the graph executions running in this worker.
+
+    Up to ``max_in_flight`` requests run at once; up to ``max_queue`` more
+    wait at most ``queue_timeout`` seconds for a slot. Anything beyond that
+    is rejected right away (429 when the queue is full, 503 when the wait
+    times out) with a ``Retry-After`` header, so admitted requests keep a
+    stable latency under overload.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        max_queue: int,
+        queue_timeout: float,
+        retry_after: int,
+    ):
+        """Initialize the controller."""
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.peak_in_flight = 0
+
+    @classmethod
+    def from_env(
+        cls,
+        prefix: str = "CHAT",
+        max_in_flight: int = 16,
+        max_queue: int = 8,
+        queue_timeout: float = 2,
+        retry_after: int = 1,
+    ) -> AdmissionController:
+        """Build a controller from ``<prefix>_*`` environment variables.
+
+        The keyword arguments are the defaults for unset variables.
+        """
+        return cls(
+            max_in_flight=int(
+                os.getenv(f"{prefix}_MAX_IN_FLIGHT", str(max_in_flight))
+            ),
+            max_queue=int(os.getenv(f"{prefix}_MAX_QUEUE", str(max_queue))),
+            queue_timeout=float(
+                os.getenv(f"{prefix}_QUEUE_TIMEOUT", str(queue_timeout))
+            ),
+            retry_after=int(
+                os.getenv(f"{prefix}_RETRY_AFTER", str(retry_after))
+            ),
+        )
+
+    def _reject(self, status_code: int, detail: str) -> HTTPException:
+        logger.warning(
+            "🚦 Admission rejected (%d): %s [in_flight=%d, waiting=%d]",
+            status_code,
+            detail,
+            self.in_flight,
+            self.waiting,
+        )
+        return HTTPException(
+            status_code=status_code,
+            detail=detail,
+            headers={"Retry-After": str(self.retry_after)},
+        )
+
+    async def acquire(self) -> None:
+        """
+        Take an execution slot, waiting in the bounded queue if needed.
+
+        Raises:
+            HTTPException: 429 if the queue is full, 503 on queue timeout.
+        """
+        if self._semaphore.locked():
+            if self.waiting >= self.max_queue:
+                self.rejected_queue_full += 1
+                raise self._reject(429, "Server busy, queue is full.")
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(
+                    self._semaphore.acquire(), timeout=self.queue_timeout
+                )
+            except asyncio.TimeoutError:
+                self.rejected_timeout += 1
+                raise self._reject(
+                    503, "Server busy, timed out waiting for a slot."
+                ) from None
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+
+        self.in_flight += 1
+        self.admitted += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def release(self) -> None:
+        """Give the execution slot back."""
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def metrics(self) -> dict[str, Any]:
+        """Return admission metrics."""
+        return {
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "queue_depth": self.waiting,
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+        }
+
+
+class AdmittedStreamingResponse(StreamingResponse):
+    """Streaming response that releases its admission slot when done.
+
+    Releasing in ``__call__`` (rather than in the body generator) also
+    covers clients that disconnect before the body starts streaming.
+    """
+
+    def __init__(self, *args, admission: AdmissionController, **kwargs):
+        """Initialize the response with the controller holding its slot."""
+        super().__init__(*args, **kwargs)
+        self._admission = admission
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """Send the response, then release the slot."""
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self._admission.release()
+
+
+# Per-worker controller for /chat
+chat_admission = AdmissionController.from_env("CHAT")
+
+# Per-worker controller for /chat/batch (each slot is a whole batch)
+batch_admission = AdmissionController.from_env(
+    "BATCH", max_in_flight=2, max_queue=4, queue_timeout=5, retry_after=30
+)
+
+# Per-worker controller for /a2a (agents served to other orchestrators)
+a2a_admission = AdmissionController.from_env("A2A")
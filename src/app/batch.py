@@ -0,0 +1,146 @@
+"""
+File: batch.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+import json
+import time
+from typing import Any
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
+
+from src.app.schemas.app_dto import ChatRequest
+from src.data_models.graph_state import CarSystemState
+from src.data_models.state_codec import encode_state
+from src.models.scheduler import run_with_priority
+from src.utils.cancellation import (
+    CancelToken,
+    RequestCancelledError,
+    with_cancellation,
+)
+from src.utils.deadline import with_deadline
+from src.utils.logger import get_logger
+from src.utils.vehicle import with_vehicle
+
+logger = get_logger(__name__)
+
+# How often the batch checks for a disconnected client (seconds)
+_DISCONNECT_POLL = 0.5
+
+
+def _final_answer(result: dict[str, Any]) -> str:
+    """Return the last AI message of a final graph state."""
+    for msg in reversed(result.get("messages") or []):
+        if isinstance(msg, AIMessage):
+            return str(msg.content)
+    return ""
+
+
+def run_batch_item(
+    graph: Any, index: int, item: ChatRequest, token: CancelToken
+) -> dict[str, Any]:
+    """
+    Run one batch item through the graph at batch priority.
+
+    Args:
+        graph: The compiled chat graph.
+        index: Position of the item in the request.
+        item: The chat request.
+        token: Cancellation token shared by the batch.
+
+    Returns:
+        dict[str, Any]: The NDJSON record of the item.
+    """
+    start = time.perf_counter()
+    record: dict[str, Any] = {"index": index, "thread_id": item.thread_id}
+    budget_s = (item.latency_budget_ms or 0) / 1000
+    config = with_cancellation(with_deadline(RunnableConfig(), budget_s), token)
+    config = with_vehicle(config, item.vehicle_id)
+    state = CarSystemState(messages=[HumanMessage(content=item.message)])
+    try:
+        token.raise_if_cancelled()
+        result = run_with_priority("batch", graph.invoke, state, config)
+        record.update(
+            status="ok",
+            processing_status=result.get("processing_status"),
+            answer=_final_answer(result),
+            error=result.get("error_message"),
+            state_bytes=len(encode_state(result)),
+        )
+    except RequestCancelledError:
+        record.update(status="cancelled")
+    except Exception as e:
+        logger.error("Batch item %d failed: %s", index, e)
+        record.update(status="error", error=str(e))
+    record["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return record
+
+
+async def run_batch(
+    graph: Any,
+    items: list[ChatRequest],
+    concurrency: int,
+    is_disconnected: Callable[[], Awaitable[bool]] | None = None,
+) -> AsyncIterator[str]:
+    """
+    Run batch items with bounded concurrency, yielding NDJSON lines.
+
+    Lines are emitted in completion order. A disconnected client cancels
+    the items still queued or running.
+
+    Args:
+        graph: The compiled chat graph (shared by every item).
+        items: The chat requests.
+        concurrency: Maximum items running at once.
+        is_disconnected: Async disconnect probe of the HTTP request.
+    """
+    token = CancelToken()
+    semaphore = asyncio.Semaphore(concurrency)
+    start = time.perf_counter()
+
+    async def run_item(index: int, item: ChatRequest) -> dict[str, Any]:
+        async with semaphore:
+            return await asyncio.to_thread(
+                run_batch_item, graph, index, item, token
+            )
+
+    pending = {
+        asyncio.create_task(run_item(i, item)) for i, item in enumerate(items)
+    }
+    counts = {"ok": 0, "error": 0, "cancelled": 0}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=_DISCONNECT_POLL,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for task in done:
+                record = task.result()
+                counts[record["status"]] += 1
+                yield json.dumps(record, ensure_ascii=False) + "\n"
+            if not done and is_disconnected and await is_disconnected():
+                logger.info("🔌 Batch client disconnected, cancelling")
+                return
+        summary = {
+            "summary": True,
+            "items": len(items),
+            **counts,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        }
+        yield json.dumps(summary) + "\n"
+    finally:
+        if pending:
+            token.cancel("client disconnected")
+            # Queued items never start; running ones stop at the next check
+            for task in pending:
+                task.cancel()
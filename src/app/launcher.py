@@ -0,0 +1,503 @@
+"""
+File: launcher.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+import itertools
+import json
+import multiprocessing
+from multiprocessing.connection import wait
+import os
+from pathlib import Path
+import re
+import signal
+import tempfile
+import time
+
+import anyio
+import httpx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from src.utils.logger import get_logger
+from src.utils.sharding import shard_for
+
+logger = get_logger(__name__)
+
+# Headers that must not be forwarded between the proxy and the workers
+HOP_BY_HOP_HEADERS = {
+    "connection",
+    "content-length",
+    "host",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailers",
+    "transfer-encoding",
+    "upgrade",
+}
+
+PROXY_METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "HEAD"]
+
+TELEMETRY_SAMPLES_PATH = "/telemetry/samples"
+
+# Telemetry of a vehicle lives in the worker owning its vehicle_id
+TELEMETRY_VEHICLE_RE = re.compile(r"^/telemetry/vehicles/([^/]+)")
+
+
+def routing_key(request: Request, body: bytes) -> str | None:
+    """
+    Return the routing key of a request.
+
+    Telemetry reads are keyed by the vehicle_id of their path; the other
+    requests by their thread_id (X-Thread-Id header or JSON body field).
+    """
+    match = TELEMETRY_VEHICLE_RE.match(request.url.path)
+    if match:
+        return match.group(1)
+    header = request.headers.get("x-thread-id")
+    if header:
+        return header
+    if not body or "json" not in request.headers.get("content-type", ""):
+        return None
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return None
+    if isinstance(payload, dict) and payload.get("thread_id"):
+        return str(payload["thread_id"])
+    return None
+
+
+def _serve_worker(index: int, sockets: list[str]) -> None:
+    """Worker process entry point: serve the preloaded app on a socket."""
+    import uvicorn
+
+    from src.app.main import app
+
+    # Read by sharding.owns (e.g. the vehicles whose history is mapped)
+    os.environ["WORKER_INDEX"] = str(index)
+    os.environ["WORKER_COUNT"] = str(len(sockets))
+    # Telemetry reads of vehicles owned by the others (see FleetView)
+    os.environ["WORKER_SOCKETS"] = os.pathsep.join(sockets)
+    logger.info("👷 Worker %d serving on %s", index, sockets[index])
+    uvicorn.Server(
+        uvicorn.Config(app, uds=sockets[index], log_config=None, lifespan="on")
+    ).run()
+
+
+class WorkerSupervisor:
+    """Fork the worker processes and restart the ones that exit.
+
+    The preloaded parent forks a supervisor process before starting any
+    thread; the supervisor stays single-threaded and forks every worker,
+    restarted ones included. Workers thus start with the registry and
+    compiled graph already in memory, and no fork ever copies a process
+    whose other threads may hold locks.
+    """
+
+    def __init__(
+        self, workers: int, socket_dir: str, stop_timeout: float = 10.0
+    ):
+        """Initialize the supervisor (no process is started yet)."""
+        self._context = multiprocessing.get_context("fork")
+        self.sockets = [
+            str(Path(socket_dir) / f"worker-{i}.sock") for i in range(workers)
+        ]
+        self.stop_timeout = stop_timeout
+        self._process: multiprocessing.process.BaseProcess | None = None
+
+    def _spawn(self, index: int) -> multiprocessing.process.BaseProcess:
+        with suppress(FileNotFoundError):
+            os.unlink(self.sockets[index])
+        process = self._context.Process(
+            target=_serve_worker,
+            args=(index, self.sockets),
+            name=f"worker-{index}",
+        )
+        process.start()
+        return process
+
+    def start(self) -> None:
+        """Fork the supervisor process, which forks the workers."""
+        # Fork before any other thread starts in this process
+        self._process = self._context.Process(
+            target=self._supervise, name="worker-supervisor"
+        )
+        self._process.start()
+
+    def _supervise(self) -> None:
+        """Supervisor process: run the workers until SIGTERM."""
+        stopping = False
+
+        def on_term(signum: int, frame: object) -> None:
+            nonlocal stopping
+            stopping = True
+
+        signal.signal(signal.SIGTERM, on_term)
+        # Ctrl-C reaches the whole group: the parent decides when to stop
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        processes = [self._spawn(i) for i in range(len(self.sockets))]
+        while not stopping:
+            wait([p.sentinel for p in processes], timeout=1.0)
+            for index, process in enumerate(processes):
+                if process.is_alive() or stopping:
+                    continue
+                logger.warning(
+                    "👷 Worker %d exited (code %s), restarting",
+                    index,
+                    process.exitcode,
+                )
+                processes[index] = self._spawn(index)
+
+        for process in processes:
+            process.terminate()
+        deadline = time.monotonic() + self.stop_timeout
+        for process in processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.kill()
+                process.join()
+
+    def stop(self) -> None:
+        """Stop every worker (SIGTERM, then SIGKILL after stop_timeout)."""
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join(self.stop_timeout + 5.0)
+            if self._process.is_alive():
+                self._process.kill()
+        for path in self.sockets:
+            with suppress(FileNotFoundError):
+                os.unlink(path)
+
+
+class ShardingProxy:
+    """Front proxy routing each thread_id to the same worker.
+
+    Administration requests (``/admin/*``) are sent to every worker, and
+    the answer lists the result of each one.
+
+    Requests with a thread_id (``X-Thread-Id`` header or JSON body field)
+    are sent to ``shard_for(thread_id)``; the others are round-robined.
+    Telemetry is sharded by vehicle_id instead: reads go to the worker
+    owning the vehicle of their path, and sample batches are split per
+    owning worker, with the counts of the workers summed.
+    Responses are streamed through unchanged (SSE and NDJSON included),
+    and closing the client connection closes the upstream one, so the
+    worker sees the disconnect and cancels the graph run.
+    """
+
+    def __init__(self, sockets: list[str]):
+        """Initialize one HTTP client per worker socket."""
+        self.sockets = sockets
+        self._clients = [
+            httpx.AsyncClient(
+                transport=httpx.AsyncHTTPTransport(uds=path),
+                base_url="http://worker",
+                timeout=httpx.Timeout(None, connect=5.0),
+            )
+            for path in sockets
+        ]
+        self._round_robin = itertools.count()
+
+    def pick(self, thread_id: str | None) -> int:
+        """Worker index for a request."""
+        if thread_id:
+            return shard_for(thread_id, len(self._clients))
+        return next(self._round_robin) % len(self._clients)
+
+    async def forward(self, request: Request) -> Response:
+        """Forward a request to its worker and stream the response."""
+        body = await request.body()
+        if request.method == "POST" and (
+            request.url.path == TELEMETRY_SAMPLES_PATH
+        ):
+            return await self._forward_samples(request, body)
+        index = self.pick(routing_key(request, body))
+        client = self._clients[index]
+        try:
+            response = await client.send(
+                self._upstream(request, index, body), stream=True
+            )
+        except httpx.TransportError as e:
+            return _unavailable(index, e)
+        headers = {
+            k: v
+            for k, v in response.headers.items()
+            if k.lower() not in HOP_BY_HOP_HEADERS
+        }
+        headers["X-Worker"] = str(index)
+        return StreamingResponse(
+            self._relay(response),
+            status_code=response.status_code,
+            headers=headers,
+        )
+
+    def _upstream(
+        self, request: Request, index: int, body: bytes
+    ) -> httpx.Request:
+        return self._clients[index].build_request(
+            request.method,
+            request.url.path,
+            params=request.query_params,
+            headers=[
+                (k, v)
+                for k, v in request.headers.items()
+                if k.lower() not in HOP_BY_HOP_HEADERS
+            ],
+            content=body,
+        )
+
+    async def _forward_samples(self, request: Request, body: bytes) -> Response:
+        """Split a telemetry batch by owning worker and sum the counts."""
+        try:
+            payload = json.loads(body)
+            groups: dict[int, list] = {}
+            for sample in payload["samples"]:
+                index = shard_for(str(sample["vehicle_id"]), len(self._clients))
+                groups.setdefault(index, []).append(sample)
+        except (ValueError, KeyError, TypeError):
+            groups = {}
+        if len(groups) <= 1:
+            # One owner (or an invalid batch, for a worker to reject)
+            index = next(iter(groups), None)
+            if index is None:
+                index = self.pick(None)
+            try:
+                response = await self._clients[index].send(
+                    self._upstream(request, index, body)
+                )
+            except httpx.TransportError as e:
+                return _unavailable(index, e)
+            return Response(
+                response.content,
+                status_code=response.status_code,
+                media_type=response.headers.get("content-type"),
+                headers={"X-Worker": str(index)},
+            )
+
+        limit = int(os.getenv("TELEMETRY_MAX_BATCH", "10000"))
+        if sum(len(group) for group in groups.values()) > limit:
+            return JSONResponse(
+                status_code=413,
+                content={"detail": f"At most {limit} samples per batch."},
+            )
+        results = await asyncio.gather(
+            *(
+                self._clients[index].send(
+                    self._upstream(
+                        request,
+                        index,
+                        json.dumps({**payload, "samples": group}).encode(),
+                    )
+                )
+                for index, group in groups.items()
+            ),
+            return_exceptions=True,
+        )
+        counts: dict[str, int] = {}
+        for index, result in zip(groups, results, strict=True):
+            if isinstance(result, httpx.TransportError):
+                return _unavailable(index, result)
+            if isinstance(result, BaseException):
+                raise result
+            if result.status_code != 200:
+                # Samples sent to the other workers are kept; a retried
+                # batch reports them as stale
+                return Response(
+                    result.content,
+                    status_code=result.status_code,
+                    media_type=result.headers.get("content-type"),
+                    headers={"X-Worker": str(index)},
+                )
+            for key, value in result.json().items():
+                counts[key] = counts.get(key, 0) + value
+        return JSONResponse(
+            counts, headers={"X-Worker": ",".join(map(str, sorted(groups)))}
+        )
+
+    async def broadcast(self, request: Request) -> JSONResponse:
+        """Send a request to every worker and list their answers."""
+        body = await request.body()
+        results = await asyncio.gather(
+            *(
+                client.send(self._upstream(request, index, body))
+                for index, client in enumerate(self._clients)
+            ),
+            return_exceptions=True,
+        )
+        workers = []
+        for index, result in enumerate(results):
+            if isinstance(result, httpx.TransportError):
+                logger.warning("👷 Worker %d unavailable: %s", index, result)
+                workers.append(
+                    {
+                        "worker": index,
+                        "status": 503,
+                        "detail": "Worker unavailable.",
+                    }
+                )
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            try:
+                content = result.json()
+            except ValueError:
+                content = {"detail": result.text}
+            if not isinstance(content, dict):
+                content = {"result": content}
+            workers.append(
+                {"worker": index, "status": result.status_code, **content}
+            )
+        # 200 only if every worker succeeded, else the worst status
+        status = max(w["status"] for w in workers)
+        return JSONResponse(status_code=status, content={"workers": workers})
+
+    @staticmethod
+    async def _relay(response: httpx.Response) -> AsyncIterator[bytes]:
+        try:
+            async for chunk in response.aiter_raw():
+                yield chunk
+        finally:
+            # Also runs on client disconnect (cancelled scope)
+            with anyio.CancelScope(shield=True):
+                await response.aclose()
+
+    async def ready(self, request: Request) -> JSONResponse:
+        """Ready once every worker reports ready."""
+        results = await asyncio.gather(
+            *(client.get("/ready") for client in self._clients),
+            return_exceptions=True,
+        )
+        workers = [
+            {
+                "worker": i,
+                "ready": isinstance(r, httpx.Response) and r.status_code == 200,
+            }
+            for i, r in enumerate(results)
+        ]
+        ready = all(w["ready"] for w in workers)
+        return JSONResponse(
+            status_code=200 if ready else 503,
+            content={
+                "status": "ready" if ready else "starting",
+                "workers": workers,
+            },
+        )
+
+    async def aclose(self) -> None:
+        """Close the worker clients."""
+        for client in self._clients:
+            await client.aclose()
+
+    def create_app(self) -> Starlette:
+        """Build the ASGI app of the proxy."""
+
+        @asynccontextmanager
+        async def lifespan(app: Starlette):
+            try:
+                yield
+            finally:
+                await self.aclose()
+
+        return Starlette(
+            routes=[
+                Route("/ready", self.ready, methods=["GET"]),
+                Route(
+                    "/admin/{path:path}", self.broadcast, methods=PROXY_METHODS
+                ),
+                Route("/{path:path}", self.forward, methods=PROXY_METHODS),
+            ],
+            lifespan=lifespan,
+        )
+
+
+def _unavailable(index: int, error: Exception) -> JSONResponse:
+    logger.warning("👷 Worker %d unavailable: %s", index, error)
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Worker unavailable."},
+        headers={"Retry-After": "1"},
+    )
+
+
+def run(
+    workers: int,
+    host: str = "0.0.0.0",
+    port: int = 8084,
+    socket_dir: str | None = None,
+) -> None:
+    """
+    Preload the app, fork the workers and serve the sharding proxy.
+
+    Args:
+        workers: Number of worker processes.
+        host: Public host of the proxy.
+        port: Public port of the proxy.
+        socket_dir: Directory of the worker Unix sockets (temporary
+            directory by default).
+    """
+    import uvicorn
+
+    from src.app import main as app_main
+
+    start = time.perf_counter()
+    app_main.preload()
+    logger.info(
+        "🚀 Preloaded registry and graph in %.2fs, forking %d workers",
+        time.perf_counter() - start,
+        workers,
+    )
+
+    socket_dir = socket_dir or tempfile.mkdtemp(prefix="agentic-ai-")
+    supervisor = WorkerSupervisor(workers, socket_dir)
+    supervisor.start()
+    proxy = ShardingProxy(supervisor.sockets)
+    try:
+        uvicorn.run(proxy.create_app(), host=host, port=port)
+    finally:
+        supervisor.stop()
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Multi-process server with thread_id-sticky routing."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("WEB_WORKERS", str(os.cpu_count() or 1))),
+        help="Worker processes (default: WEB_WORKERS or CPU count)",
+    )
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument(
+        "--port", type=int, default=int(os.getenv("PORT", "8084"))
+    )
+    parser.add_argument(
+        "--socket-dir",
+        default=os.getenv("WORKER_SOCKET_DIR"),
+        help="Directory for the worker sockets (default: temporary)",
+    )
+    args = parser.parse_args()
+    run(args.workers, args.host, args.port, args.socket_dir)
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    main()
@@ -7,24 +7,161 @@ Author: Klaus
 MIT License
 """
 
+import asyncio
+from contextlib import asynccontextmanager, suppress
+import os
+from typing import Any
+
 from fastapi import FastAPI
+from starlette.responses import JSONResponse
 
+from src.app.routers.a2a_router import router as a2a_router
+from src.app.routers.admin_router import router as admin_router
 from src.app.routers.chat_router import router as chat_router
-from src.utils.agent_initializer import initialize_external_agents
+from src.app.routers.metrics_router import router as metrics_router
+from src.app.routers.telemetry_router import router as telemetry_router
+from src.graphs.factory import create_chat_graph, create_chat_models
+from src.services.agent_registry import AgentRegistry
+from src.services.car.fleet_view import FleetView
+from src.services.car.history import TelemetryHistory
+from src.services.remote_agent import RemoteAgentClient
+from src.utils.agent_initializer import (
+    DEFAULT_CARDS_PATH,
+    initialize_external_agents,
+    reload_external_agents,
+    warm_up_models,
+)
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
-def app_lifespan(app: FastAPI):
+async def _warm_up(app: FastAPI) -> None:
+    """
+    Warm agent and node connections, then mark the app as ready.
+
+    Only loaded agents are warmed: with AGENT_LAZY_INIT their models are
+    built on first use, on the pooled client the node models warmed when
+    their configuration is the same. A failed warm-up is reported in the
+    readiness checks and the app is ready anyway, since a cold connection
+    only costs latency on the first request.
+    """
+    try:
+        if os.getenv("WARMUP_ON_STARTUP", "true").lower() == "true":
+            models = {
+                **AgentRegistry.list_models(),
+                **app.state.graph_models,
+            }
+            app.state.readiness["warm_up"] = await asyncio.to_thread(
+                warm_up_models, models
+            )
+    except Exception as e:
+        logger.error(f"Warm-up failed: {e}")
+        app.state.readiness["warm_up_error"] = str(e)
+    app.state.ready = True
+    logger.info("✅ Application ready")
+
+
+def _cards_signature(path: str) -> tuple[int, int] | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+async def _watch_agent_cards(interval: float) -> None:
+    """Reload the agent cards whenever the file changes."""
+    last = _cards_signature(DEFAULT_CARDS_PATH)
+    while True:
+        await asyncio.sleep(interval)
+        signature = _cards_signature(DEFAULT_CARDS_PATH)
+        if signature is None or signature == last:
+            continue
+        last = signature
+        try:
+            await asyncio.to_thread(reload_external_agents)
+        except Exception as e:
+            # Keep serving the previous cards until the file is fixed
+            logger.error(f"Agent cards reload failed: {e}")
+
+
+async def _evict_idle_agents(interval: float) -> None:
+    """Unload agent models that stayed idle past AGENT_IDLE_TTL."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(AgentRegistry.evict_idle)
+        except Exception as e:
+            logger.error(f"Agent eviction failed: {e}")
+
+
+# Registry and graph built before forking workers (see preload)
+_preloaded: dict[str, Any] | None = None
+
+
+def preload() -> None:
+    """
+    Build the agent registry and the compiled graph in this process.
+
+    Called by the multi-process launcher before forking, so workers share
+    the loaded modules, models and graph copy-on-write and skip their own
+    initialization. Connections are opened after the fork (warm-up).
+    """
+    global _preloaded
+    initialize_external_agents()
+    graph_models = create_chat_models()
+    _preloaded = {
+        "graph_models": graph_models,
+        "graph": create_chat_graph(graph_models).compile(),
+    }
+
+
+@asynccontextmanager
+async def app_lifespan(app: FastAPI):
     """App lifespan for initializing agents and models."""
+    app.state.ready = False
+    app.state.readiness = {"registry": False, "graph": False}
     try:
-        # Initialize external agents
-        initialize_external_agents()
+        if _preloaded is not None:
+            app.state.graph_models = _preloaded["graph_models"]
+            app.state.graph = _preloaded["graph"]
+        else:
+            # Build agent and node models concurrently, off the event loop
+            _, app.state.graph_models = await asyncio.gather(
+                asyncio.to_thread(initialize_external_agents),
+                asyncio.to_thread(create_chat_models),
+            )
+            # Compiled once and shared by every /chat request
+            app.state.graph = create_chat_graph(
+                app.state.graph_models
+            ).compile()
+        app.state.readiness["registry"] = True
+        app.state.readiness["graph"] = True
     except Exception as e:
         logger.error(f"Failed to initialize application: {e}")
         raise
-    yield
+
+    # Warm-up runs in the background; /ready reports when it is done
+    tasks = [asyncio.create_task(_warm_up(app))]
+    watch_interval = float(os.getenv("AGENT_CARDS_WATCH_INTERVAL", "0"))
+    if watch_interval > 0:
+        tasks.append(asyncio.create_task(_watch_agent_cards(watch_interval)))
+    idle_ttl = float(os.getenv("AGENT_IDLE_TTL", "0"))
+    if idle_ttl > 0:
+        # Sweep a few times per TTL so eviction lags it by a fraction
+        interval = max(1.0, idle_ttl / 4)
+        tasks.append(asyncio.create_task(_evict_idle_agents(interval)))
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        await asyncio.to_thread(RemoteAgentClient.close)
+        await asyncio.to_thread(FleetView.close)
+        await asyncio.to_thread(TelemetryHistory.flush)
 
 
 app = FastAPI(lifespan=app_lifespan)
@@ -50,4 +187,26 @@ def health_check():
     }
 
 
+@app.get("/ready")
+def readiness_check():
+    """
+    Readiness endpoint.
+
+    Returns 200 once the agent registry is loaded, the chat graph is
+    compiled and backend connections are warm; 503 before that.
+    """
+    ready = getattr(app.state, "ready", False)
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "starting",
+            "checks": getattr(app.state, "readiness", {}),
+        },
+    )
+
+
+app.include_router(a2a_router)
+app.include_router(admin_router)
 app.include_router(chat_router)
+app.include_router(metrics_router)
+app.include_router(telemetry_router)
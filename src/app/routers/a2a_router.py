@@ -0,0 +1,268 @@
+"""
+File: a2a_router.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+import json
+from typing import Any
+import uuid
+
+from fastapi import APIRouter, HTTPException, Request
+from langchain_core.runnables import RunnableConfig
+from starlette.responses import JSONResponse
+
+from src.app.admission import AdmittedStreamingResponse, a2a_admission
+from src.data_models.agent_card import AgentCard
+from src.services.agent_registry import AgentRegistry
+from src.services.remote_agent import result_text
+from src.utils.cancellation import (
+    CancelToken,
+    RequestCancelledError,
+    with_cancellation,
+)
+from src.utils.logger import get_logger
+from src.utils.stream import with_stream_callback
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/a2a")
+
+# JSON-RPC error codes
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INTERNAL_ERROR = -32603
+AGENT_NOT_FOUND = -32001
+
+
+def _local_card(agent_name: str) -> AgentCard | None:
+    """Card of an agent served by this process (not a remote one)."""
+    card = AgentRegistry.get_card(agent_name)
+    if card is None or card.url is not None:
+        return None
+    return card
+
+
+def _error(rpc_id: Any, code: int, message: str) -> dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "id": rpc_id,
+        "error": {"code": code, "message": message},
+    }
+
+
+def _rpc_error(rpc_id: Any, code: int, message: str) -> JSONResponse:
+    return JSONResponse(_error(rpc_id, code, message))
+
+
+def _text_part(text: str) -> list[dict[str, str]]:
+    return [{"kind": "text", "text": text}]
+
+
+def _sse(rpc_id: Any, result: dict[str, Any]) -> str:
+    return _sse_payload({"jsonrpc": "2.0", "id": rpc_id, "result": result})
+
+
+def _sse_payload(payload: dict[str, Any]) -> str:
+    return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+async def _until_done_or_gone(
+    invocation: asyncio.Task, http_request: Request, token: CancelToken
+) -> None:
+    """Wait for ``invocation``, cancelling ``token`` if the caller leaves."""
+    while not invocation.done():
+        await asyncio.wait({invocation}, timeout=0.25)
+        if not invocation.done() and await http_request.is_disconnected():
+            token.cancel("caller disconnected")
+            return
+
+
+def _artifact_update(
+    task_id: str, artifact_id: str, text: str, append: bool
+) -> dict[str, Any]:
+    return {
+        "kind": "artifact-update",
+        "taskId": task_id,
+        "append": append,
+        "artifact": {"artifactId": artifact_id, "parts": _text_part(text)},
+    }
+
+
+class _EventSink:
+    """Stream callback queuing a delegated agent's events for the SSE.
+
+    Called from the worker thread running the agent; events are handed
+    to the event loop thread-safely.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        """Initialize the sink for the loop serving the response."""
+        self._loop = loop
+        self.queue: asyncio.Queue[tuple[str, str]] = asyncio.Queue()
+
+    def stream(self, text: str, type: str = "chunk", **fields: Any) -> None:
+        """Queue an event (``agent_chunk`` or ``agent_reasoning``)."""
+        self._loop.call_soon_threadsafe(self.queue.put_nowait, (type, text))
+
+    def pending(self) -> int:
+        """Number of events not yet sent to the caller."""
+        return self.queue.qsize()
+
+
+@router.get("/{agent_name}/.well-known/agent-card.json")
+def agent_card(agent_name: str) -> dict:
+    """
+    Return the card of an agent served by this process.
+
+    Raises:
+        HTTPException: 404 if the agent is unknown or not served here.
+    """
+    card = _local_card(agent_name)
+    if card is None:
+        raise HTTPException(status_code=404, detail="Agent not found.")
+    return card.model_dump(mode="json", exclude_none=True)
+
+
+@router.post("/{agent_name}")
+async def a2a_rpc(agent_name: str, http_request: Request):
+    """
+    A2A JSON-RPC endpoint of an agent (``message/send``, ``message/stream``).
+
+    Lets another orchestrator delegate to the agents of this process by
+    setting ``url`` on its card to this endpoint. Agents that are remote
+    here are not served (no proxy chains).
+
+    Returns:
+        JSONResponse | AdmittedStreamingResponse: The JSON-RPC response,
+            or an SSE stream of JSON-RPC responses for ``message/stream``.
+
+    Raises:
+        HTTPException: 429/503 when over the admission limits.
+    """
+    try:
+        payload = await http_request.json()
+    except ValueError:
+        return _rpc_error(None, INVALID_REQUEST, "Invalid JSON.")
+    rpc_id = payload.get("id")
+    method = payload.get("method")
+    message = (payload.get("params") or {}).get("message") or {}
+    card = _local_card(agent_name)
+    if card is None:
+        return _rpc_error(rpc_id, AGENT_NOT_FOUND, "Agent not found.")
+    if method not in ("message/send", "message/stream"):
+        return _rpc_error(rpc_id, METHOD_NOT_FOUND, f"Unknown {method!r}.")
+    query = result_text(message)
+
+    await a2a_admission.acquire()
+    token = CancelToken()
+    config = with_cancellation(RunnableConfig(), token)
+    if method == "message/send":
+        invocation = asyncio.create_task(
+            asyncio.to_thread(AgentRegistry.invoke, card.name, query, config)
+        )
+        try:
+            await _until_done_or_gone(invocation, http_request, token)
+            answer = await invocation
+        except RequestCancelledError:
+            logger.info("🔌 A2A %s: caller disconnected", card.name)
+            return _rpc_error(rpc_id, INTERNAL_ERROR, "Request cancelled.")
+        except Exception as e:
+            logger.error("A2A %s failed: %s", card.name, e)
+            return _rpc_error(rpc_id, INTERNAL_ERROR, f"Agent failed: {e}")
+        finally:
+            a2a_admission.release()
+        return JSONResponse(
+            {
+                "jsonrpc": "2.0",
+                "id": rpc_id,
+                "result": {
+                    "kind": "message",
+                    "role": "agent",
+                    "messageId": uuid.uuid4().hex,
+                    "parts": _text_part(answer),
+                },
+            }
+        )
+
+    async def events() -> AsyncIterator[str]:
+        task_id = uuid.uuid4().hex
+        artifact_id = uuid.uuid4().hex
+        sink = _EventSink(asyncio.get_running_loop())
+        invocation = asyncio.create_task(
+            asyncio.to_thread(
+                AgentRegistry.invoke,
+                card.name,
+                query,
+                with_stream_callback(config, sink),
+            )
+        )
+        streamed = False
+        try:
+            while not (invocation.done() and sink.queue.empty()):
+                try:
+                    kind, text = await asyncio.wait_for(
+                        sink.queue.get(), timeout=0.1
+                    )
+                except asyncio.TimeoutError:
+                    continue
+                if kind == "agent_chunk":
+                    streamed = True
+                    yield _sse(
+                        rpc_id,
+                        _artifact_update(task_id, artifact_id, text, True),
+                    )
+                elif kind == "agent_reasoning":
+                    yield _sse(
+                        rpc_id,
+                        {
+                            "kind": "status-update",
+                            "taskId": task_id,
+                            "status": {
+                                "state": "working",
+                                "message": {
+                                    "kind": "message",
+                                    "role": "agent",
+                                    "messageId": uuid.uuid4().hex,
+                                    "parts": _text_part(text),
+                                },
+                            },
+                            "final": False,
+                        },
+                    )
+            try:
+                answer = await invocation
+            except Exception as e:
+                logger.error("A2A %s failed: %s", card.name, e)
+                # Tell the caller instead of closing the stream silently
+                yield _sse_payload(
+                    _error(rpc_id, INTERNAL_ERROR, f"Agent failed: {e}")
+                )
+                return
+            if not streamed:
+                # Non-streaming agent: the answer is a single artifact
+                yield _sse(
+                    rpc_id,
+                    _artifact_update(task_id, artifact_id, answer, False),
+                )
+            yield _sse(
+                rpc_id,
+                {
+                    "kind": "status-update",
+                    "taskId": task_id,
+                    "status": {"state": "completed"},
+                    "final": True,
+                },
+            )
+        finally:
+            # The caller went away: stop the delegated run
+            token.cancel("caller disconnected")
+
+    return AdmittedStreamingResponse(
+        events(), media_type="text/event-stream", admission=a2a_admission
+    )
@@ -0,0 +1,72 @@
+"""
+File: admin_router.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+import asyncio
+import os
+import secrets
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+
+from src.utils.agent_initializer import reload_external_agents
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def require_admin_token(http_request: Request) -> None:
+    """
+    Allow a request only with ``Authorization: Bearer <ADMIN_TOKEN>``.
+
+    Raises:
+        HTTPException: 403 when ADMIN_TOKEN is not set (admin endpoints
+            are disabled), 401 for a missing or wrong token.
+    """
+    expected = os.getenv("ADMIN_TOKEN", "")
+    if not expected:
+        raise HTTPException(
+            status_code=403,
+            detail="Admin endpoints are disabled (ADMIN_TOKEN is not set).",
+        )
+    scheme, _, token = http_request.headers.get("Authorization", "").partition(
+        " "
+    )
+    if scheme.lower() != "bearer" or not secrets.compare_digest(
+        token.encode(), expected.encode()
+    ):
+        logger.warning("Rejected admin request: invalid token")
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid admin token.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin_token)])
+
+
+@router.post("/agents/reload")
+async def reload_agents() -> dict:
+    """
+    Reload data/agent_cards.json into this worker's registry.
+
+    Only added or changed agents are rebuilt; unchanged agents keep their
+    model and warm connection. Behind the launcher, the proxy sends the
+    request to every worker and lists their results.
+
+    Returns:
+        dict: The added, changed and removed agents.
+
+    Raises:
+        HTTPException: 400 when the new cards are invalid (nothing changes).
+    """
+    try:
+        return await asyncio.to_thread(reload_external_agents)
+    except (ValueError, FileNotFoundError) as e:
+        logger.error(f"Agent reload failed: {e}")
+        raise HTTPException(status_code=400, detail=str(e)) from e
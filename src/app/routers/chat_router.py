@@ -8,45 +8,152 @@ MIT License
 """
 
 from asyncio import Queue
+import os
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Request
 from langchain_core.messages import HumanMessage
 from langchain_core.runnables import RunnableConfig
 from starlette.responses import StreamingResponse
 
-from src.app.schemas.app_dto import ChatRequest
+from src.app.admission import (
+    AdmittedStreamingResponse,
+    batch_admission,
+    chat_admission,
+)
+from src.app.batch import run_batch
+from src.app.schemas.app_dto import BatchChatRequest, ChatRequest
 from src.data_models.graph_state import CarSystemState
 from src.graphs.factory import create_chat_graph
+from src.models.scheduler import run_with_priority
+from src.utils.cancellation import with_cancellation
+from src.utils.deadline import with_deadline
 from src.utils.logger import get_logger
-from src.utils.stream import Streamer
+from src.utils.stream import Streamer, with_stream_callback
+from src.utils.vehicle import with_vehicle
 
 logger = get_logger(__name__)
 
 router = APIRouter()
 
 
+def get_compiled_graph(http_request: Request):
+    """Return the graph compiled at startup, compiling one if missing."""
+    graph = getattr(http_request.app.state, "graph", None)
+    if graph is None:
+        graph = create_chat_graph().compile()
+    return graph
+
+
+def latency_budget_seconds(
+    request: ChatRequest, http_request: Request
+) -> float | None:
+    """Resolve the request latency budget (body, header, then default)."""
+    budget_ms = request.latency_budget_ms
+    if budget_ms is None:
+        header = http_request.headers.get("X-Latency-Budget-Ms")
+        try:
+            budget_ms = float(header) if header else None
+        except ValueError:
+            logger.warning("Invalid X-Latency-Budget-Ms header: %r", header)
+    if budget_ms is None:
+        budget_ms = float(os.getenv("CHAT_LATENCY_BUDGET_MS", "0"))
+    return budget_ms / 1000 if budget_ms > 0 else None
+
+
 @router.post("/chat")
-async def chat(request: ChatRequest) -> StreamingResponse:
+async def chat(
+    request: ChatRequest, http_request: Request
+) -> StreamingResponse:
     """
     Ask the chat model a question.
 
     Args:
         request (ChatRequest): The request containing the question.
+        http_request (Request): The raw HTTP request (app state access).
 
     Returns:
         StreamingResponse: The streaming response containing the answer.
+
+    Raises:
+        HTTPException: 429/503 when over the admission limits.
     """
-    stream_queue = Queue()
-    streamer = Streamer(stream_queue)
-
-    graph = create_chat_graph().compile()
-    config = RunnableConfig()
-    state = CarSystemState(
-        messages=[HumanMessage(content=request.message)],
-        stream_callback=streamer,
-    )
+    # Fast 429/503 with Retry-After when the worker is saturated
+    await chat_admission.acquire()
+    try:
+        stream_queue = Queue()
+        # Disconnects cancel the graph run through the token in its config
+        streamer = Streamer(
+            stream_queue, is_disconnected=http_request.is_disconnected
+        )
+
+        graph = get_compiled_graph(http_request)
+        # The deadline starts counting once the request is admitted
+        config = with_deadline(
+            RunnableConfig(), latency_budget_seconds(request, http_request)
+        )
+        config = with_cancellation(config, streamer.cancel_token)
+        config = with_stream_callback(config, streamer)
+        config = with_vehicle(config, request.vehicle_id)
+        state = CarSystemState(messages=[HumanMessage(content=request.message)])
+
+        return AdmittedStreamingResponse(
+            content=streamer.run_task(
+                run_with_priority, "interactive", graph.invoke, state, config
+            ),
+            media_type="text/event-stream",
+            admission=chat_admission,
+        )
+    except Exception:
+        chat_admission.release()
+        raise
+
 
-    return StreamingResponse(
-        content=streamer.run_task(graph.invoke, state, config),
-        media_type="text/event-stream",
+@router.post("/chat/batch")
+async def chat_batch(
+    request: BatchChatRequest, http_request: Request
+) -> StreamingResponse:
+    """
+    Run many chat requests through the shared graph.
+
+    Items run with bounded concurrency at batch priority (interactive
+    /chat calls are served first by the LLM scheduler). Results are
+    streamed as NDJSON in completion order, followed by a summary line.
+
+    Args:
+        request (BatchChatRequest): The items and optional concurrency.
+        http_request (Request): The raw HTTP request (app state access).
+
+    Returns:
+        StreamingResponse: One JSON record per line.
+
+    Raises:
+        HTTPException: 413 when the batch is too large, 429/503 when over
+            the batch admission limits.
+    """
+    max_items = int(os.getenv("BATCH_MAX_ITEMS", "1000"))
+    if len(request.items) > max_items:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large ({len(request.items)} > {max_items}).",
+        )
+    max_concurrency = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+    concurrency = min(
+        request.max_concurrency or max_concurrency, max_concurrency
     )
+
+    await batch_admission.acquire()
+    try:
+        graph = get_compiled_graph(http_request)
+        return AdmittedStreamingResponse(
+            content=run_batch(
+                graph,
+                request.items,
+                concurrency,
+                is_disconnected=http_request.is_disconnected,
+            ),
+            media_type="application/x-ndjson",
+            admission=batch_admission,
+        )
+    except Exception:
+        batch_admission.release()
+        raise
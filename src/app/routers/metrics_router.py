@@ -0,0 +1,57 @@
+"""
+File: metrics_router.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+from fastapi import APIRouter
+
+from src.app.admission import (
+    a2a_admission,
+    batch_admission,
+    chat_admission,
+)
+from src.models.client_pool import LLMClientPool
+from src.models.micro_batcher import MicroBatcher
+from src.models.resilience import Resilience
+from src.models.scheduler import LLMScheduler
+from src.nodes.agent_branch import AgentBranch
+from src.services.agent_registry import AgentRegistry
+from src.services.car.fleet_view import FleetView
+from src.services.car.history import TelemetryHistory
+from src.services.car.telemetry import TelemetryService
+from src.services.intent_planner import IntentPlanner
+from src.services.remote_agent import RemoteAgentClient
+from src.utils.tool_result_store import ToolResultStore
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+def metrics() -> dict:
+    """
+    Runtime metrics of this worker.
+
+    Returns:
+        dict: Metrics grouped by component.
+    """
+    return {
+        "chat_admission": chat_admission.metrics(),
+        "batch_admission": batch_admission.metrics(),
+        "a2a_admission": a2a_admission.metrics(),
+        "llm_client_pool": LLMClientPool.metrics(),
+        "llm_scheduler": LLMScheduler.metrics(),
+        "llm_resilience": Resilience.metrics(),
+        "micro_batchers": MicroBatcher.metrics(),
+        "agent_registry": AgentRegistry.metrics(),
+        "remote_agents": RemoteAgentClient.metrics(),
+        "agent_branches": AgentBranch.metrics(),
+        "intent_planner": IntentPlanner.metrics(),
+        "telemetry": TelemetryService.metrics(),
+        "telemetry_history": TelemetryHistory.metrics(),
+        "fleet_view": FleetView.metrics(),
+        "tool_result_store": ToolResultStore.metrics(),
+    }
@@ -0,0 +1,145 @@
+"""
+File: telemetry_router.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+import asyncio
+from dataclasses import asdict
+import os
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from pydantic import ValidationError
+
+from src.app.schemas.app_dto import TelemetryBatch
+from src.services.car.fleet_view import FleetView, encode_snapshots
+from src.services.car.history import TelemetryHistory
+from src.services.car.telemetry import TelemetryService
+
+router = APIRouter(prefix="/telemetry")
+
+
+def _ingest(body: bytes) -> dict[str, int]:
+    batch = TelemetryBatch.model_validate_json(body)
+    limit = int(os.getenv("TELEMETRY_MAX_BATCH", "10000"))
+    if len(batch.samples) > limit:
+        raise HTTPException(
+            status_code=413, detail=f"At most {limit} samples per batch."
+        )
+    return TelemetryService.ingest(batch.samples)
+
+
+@router.post("/samples")
+async def ingest_samples(http_request: Request) -> dict:
+    """
+    Ingest a batch of telemetry samples (``TelemetryBatch``).
+
+    The body is parsed and stored in a worker thread, so large batches
+    do not hold the event loop serving chat traffic.
+
+    Returns:
+        dict: ``accepted``, ``stale`` (older than the vehicle's latest
+            sample) and ``rejected`` (vehicle limit reached) counts.
+
+    Raises:
+        HTTPException: 422 for an invalid batch, 413 for a too large one.
+    """
+    body = await http_request.body()
+    try:
+        return await asyncio.to_thread(_ingest, body)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=422,
+            # The input of a JSON error is the raw (bytes) body
+            detail=e.errors(include_url=False, include_input=False),
+        ) from e
+
+
+@router.get("/snapshots")
+def snapshots(local: bool = False) -> dict:
+    """
+    Return the latest snapshot of every vehicle, as columns.
+
+    With the launcher, the tables of every worker are combined;
+    ``local`` returns only the vehicles of the worker answering.
+
+    Returns:
+        dict: ``vehicle_ids``, ``columns`` (per field, a list aligned with
+            the ids; missing values are null) and ``unavailable_workers``.
+    """
+    if local:
+        ids, cols = TelemetryService.snapshots()
+        unavailable = 0
+    else:
+        ids, cols, unavailable = FleetView.snapshots()
+    return {
+        **encode_snapshots(ids, cols),
+        "unavailable_workers": unavailable,
+    }
+
+
+@router.get("/vehicles/{vehicle_id}")
+def latest_snapshot(vehicle_id: str) -> dict:
+    """
+    Return the latest telemetry snapshot of a vehicle.
+
+    Raises:
+        HTTPException: 404 if the vehicle has no telemetry.
+    """
+    snapshot = TelemetryService.latest(vehicle_id)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Vehicle not found.")
+    return snapshot
+
+
+@router.get("/vehicles/{vehicle_id}/samples")
+def recent_samples(vehicle_id: str, limit: int = 100) -> dict:
+    """
+    Return the most recent samples of a vehicle, oldest first.
+
+    Raises:
+        HTTPException: 404 if the vehicle has no telemetry.
+    """
+    samples = TelemetryService.recent(vehicle_id, limit)
+    if not samples:
+        raise HTTPException(status_code=404, detail="Vehicle not found.")
+    return {"vehicle_id": vehicle_id, "samples": samples}
+
+
+@router.get("/vehicles/{vehicle_id}/consumption")
+def consumption(vehicle_id: str) -> dict:
+    """
+    Return the real consumption estimated from a vehicle's history.
+
+    Raises:
+        HTTPException: 404 if the history is too short for an estimate.
+    """
+    estimate = TelemetryHistory.consumption(vehicle_id)
+    if estimate is None:
+        raise HTTPException(
+            status_code=404, detail="Not enough history for an estimate."
+        )
+    return {"vehicle_id": vehicle_id, **asdict(estimate)}
+
+
+@router.get("/vehicles/{vehicle_id}/history")
+def history(
+    vehicle_id: str,
+    start: float | None = None,
+    end: float | None = None,
+    points: int = Query(default=500, ge=1, le=10000),
+) -> dict:
+    """
+    Return a vehicle's history between ``start`` and ``end`` (Unix time,
+    default: all of it), averaged into at most ``points`` time bins.
+
+    Raises:
+        HTTPException: 404 if the vehicle has no history.
+    """
+    rows = TelemetryHistory.downsampled(vehicle_id, start, end, points)
+    if rows is None:
+        raise HTTPException(status_code=404, detail="Vehicle not found.")
+    return {"vehicle_id": vehicle_id, "points": rows}
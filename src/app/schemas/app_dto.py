@@ -9,6 +9,8 @@ MIT License
 
 from pydantic import BaseModel, Field
 
+from src.data_models.telemetry import TelemetrySample
+
 
 class ChatRequest(BaseModel):
     """
@@ -17,3 +19,41 @@ class ChatRequest(BaseModel):
 
     message: str = Field(..., description="The query to chat about.")
     thread_id: str = Field(..., description="The thread for context tracking.")
+    latency_budget_ms: int | None = Field(
+        None,
+        gt=0,
+        description=(
+            "End-to-end latency budget; overrides X-Latency-Budget-Ms and "
+            "CHAT_LATENCY_BUDGET_MS."
+        ),
+    )
+    vehicle_id: str | None = Field(
+        None,
+        min_length=1,
+        description="Vehicle the query is about (default: DEFAULT_VEHICLE_ID).",
+    )
+
+
+class BatchChatRequest(BaseModel):
+    """
+    Request schema for the batch chat endpoint.
+    """
+
+    items: list[ChatRequest] = Field(
+        ..., min_length=1, description="The queries to run."
+    )
+    max_concurrency: int | None = Field(
+        None,
+        gt=0,
+        description="Items run at once (capped by BATCH_MAX_CONCURRENCY).",
+    )
+
+
+class TelemetryBatch(BaseModel):
+    """
+    Request schema for the telemetry ingestion endpoint.
+    """
+
+    samples: list[TelemetrySample] = Field(
+        ..., min_length=1, description="Samples of any number of vehicles."
+    )
@@ -7,13 +7,27 @@ Author: Klaus
 MIT License
 """
 
-from typing import Annotated, Any, Optional, TypedDict
+from typing import Annotated, Optional, TypedDict
 
 from langchain_core.messages import BaseMessage
 
 
+def merge_agent_results(
+    current: list[dict] | None, update: list[dict] | None
+) -> list[dict]:
+    """Reducer of the parallel agent branches (None clears the results)."""
+    if update is None:
+        return []
+    return (current or []) + update
+
+
 class CarSystemState(TypedDict):
-    """State schema for the car system agentic AI workflow"""
+    """State schema for the car system agentic AI workflow.
+
+    Only compact, serializable fields belong here (see state_codec).
+    Per-request runtime objects such as the stream callback, deadline and
+    cancel token travel in the run config instead.
+    """
 
     messages: Annotated[list[BaseMessage], "append"]
     # Processing status
@@ -23,5 +37,5 @@ class CarSystemState(TypedDict):
     recommendations: Optional[list[str]]
     # Error handling
     error_message: Optional[str]
-    # Stream callback for real-time updates
-    stream_callback: Optional[Any]
+    # Answers of the agent branches of a fan-out round (see AgentBranch)
+    agent_results: Annotated[list[dict], merge_agent_results]
@@ -0,0 +1,53 @@
+"""
+File: state_codec.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from src.data_models.graph_state import CarSystemState
+
+# LangGraph's checkpoint serializer: msgpack with LangChain message support
+_serde = JsonPlusSerializer()
+
+
+def encode_state(state: Mapping[str, Any]) -> bytes:
+    """
+    Encode a graph state as msgpack (the LangGraph checkpoint format).
+
+    Raises:
+        TypeError: If the state holds a value msgpack cannot encode (e.g.
+            a live runtime object, which belongs in the run config).
+    """
+    kind, data = _serde.dumps_typed(dict(state))
+    if kind != "msgpack":
+        raise TypeError(f"State is not msgpack-serializable (got {kind!r})")
+    return data
+
+
+def decode_state(data: bytes) -> CarSystemState:
+    """Decode a state produced by ``encode_state``."""
+    return CarSystemState(**_serde.loads_typed(("msgpack", data)))
+
+
+def state_size_report(state: Mapping[str, Any]) -> dict[str, int]:
+    """
+    Encoded size of each state field, in bytes.
+
+    Returns:
+        dict[str, int]: Bytes per field plus ``total`` (the whole state).
+    """
+    report = {
+        key: len(encode_state({key: value})) for key, value in state.items()
+    }
+    report["total"] = len(encode_state(state))
+    return report
@@ -7,7 +7,7 @@ Author: Klaus
 MIT License
 """
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class InputGuardRailOutput(BaseModel):
@@ -15,3 +15,15 @@ class InputGuardRailOutput(BaseModel):
 
     is_valid: bool
     error_message: str | None = None
+
+
+class InputGuardRailVerdict(InputGuardRailOutput):
+    """Verdict of one message in a batched input guard rail check."""
+
+    id: str = Field(..., description="Id of the validated message block.")
+
+
+class InputGuardRailBatchOutput(BaseModel):
+    """Output model for batched input guard rail checks."""
+
+    verdicts: list[InputGuardRailVerdict]
@@ -0,0 +1,32 @@
+"""
+File: telemetry.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+from pydantic import BaseModel, Field
+
+
+class TelemetrySample(BaseModel):
+    """One telemetry reading of a vehicle."""
+
+    vehicle_id: str = Field(..., min_length=1, description="Vehicle id")
+    timestamp: float | None = Field(
+        default=None,
+        description="Unix time of the reading (default: time received)",
+    )
+    fuel_liters: float = Field(..., ge=0, description="Fuel in the tank")
+    autonomy_km_l: float = Field(
+        ..., gt=0, description="Current autonomy (km per liter)"
+    )
+    odometer_km: float | None = Field(
+        default=None, ge=0, description="Odometer reading"
+    )
+    latitude: float | None = Field(default=None, ge=-90, le=90)
+    longitude: float | None = Field(default=None, ge=-180, le=180)
+    speed_kmh: float | None = Field(
+        default=None, ge=0, description="Speed at the time of the reading"
+    )
@@ -7,71 +7,157 @@ Author: Klaus
 MIT License
 """
 
+import os
+import re
+
+from langchain_core.tools import BaseTool
 from langgraph.constants import END, START
 from langgraph.graph import StateGraph
 
 from src.data_models.graph_state import CarSystemState
+from src.models.base._chat_model import ChatModel
+from src.models.cassette import wrap_with_cassette
 from src.models.gemini import Gemini
+from src.nodes.agent_branch import AgentBranch
 from src.nodes.input_guard_rail import InputGuardRail
 from src.nodes.output_guard_rail import OutputGuardRail
+from src.nodes.planner_node import PlannerNode
 from src.nodes.reasoning_node import ReasoningNode
+from src.services.agent_registry import AgentRegistry
+from src.services.intent_planner import IntentPlanner
 from src.tools.calculations import is_trip_possible
 from src.tools.registry_interaction import invoke_agent, list_registered_agents
+from src.tools.tool_results import read_tool_result
 from src.utils.prompt_loader import load_prompt_from_markdown
 
 
-def create_chat_graph() -> StateGraph:
-    """Create a not compiled graph.
+def _node_model(
+    name: str, prompt: str, tools: list[BaseTool] | None = None
+) -> ChatModel:
+    """Gemini model of a graph node, behind its cassette when enabled."""
+    return wrap_with_cassette(
+        lambda: Gemini(
+            model="gemini-2.5-flash", prompt=prompt, tools=tools, name=name
+        ),
+        name,
+        prompt=prompt,
+        tools=tools,
+    )
+
+
+def create_chat_models() -> dict[str, ChatModel]:
+    """Create the models used by the graph nodes.
 
     Returns:
-        StateGraph: The compiled chat graph.
+        dict[str, ChatModel]: Models keyed by node name.
     """
     # Load prompts for graph nodes
     input_guard_rail_prompt = load_prompt_from_markdown("input_guard_rail")
     reasoning_node_prompt = load_prompt_from_markdown("reasoning_node")
     output_guard_rail_prompt = load_prompt_from_markdown("output_guard_rail")
-    # Input guard rail agent
-    input_guard_rail_agent = Gemini(
-        model="gemini-2.5-flash", prompt=input_guard_rail_prompt
-    )
-    # Reasoning agent (orchestration + quick feasibility)
-    reasoning_agent = Gemini(
-        model="gemini-2.5-flash",
-        prompt=reasoning_node_prompt,
-        tools=[list_registered_agents, invoke_agent, is_trip_possible],
-    )
-    # Output guard rail agent
-    output_guard_rail_agent = Gemini(
-        model="gemini-2.5-flash", prompt=output_guard_rail_prompt
-    )
+    return {
+        # Input guard rail agent
+        "input_guard_rail": _node_model(
+            "input_guard_rail", input_guard_rail_prompt
+        ),
+        # Reasoning agent (orchestration + quick feasibility)
+        "reasoning_node": _node_model(
+            "reasoning_node",
+            reasoning_node_prompt,
+            tools=[
+                list_registered_agents,
+                invoke_agent,
+                is_trip_possible,
+                read_tool_result,
+            ],
+        ),
+        # Output guard rail agent
+        "output_guard_rail": _node_model(
+            "output_guard_rail", output_guard_rail_prompt
+        ),
+    }
+
+
+def _agent_node_names(fallback: str) -> dict[str, str]:
+    """Branch node name of each agent registered now."""
+    nodes: dict[str, str] = {}
+    for card in AgentRegistry.list_cards():
+        node = "agent_" + re.sub(r"\W+", "_", card.name.lower()).strip("_")
+        if node != fallback and node not in nodes.values():
+            nodes[card.name] = node
+    return nodes
+
+
+def create_chat_graph(
+    models: dict[str, ChatModel] | None = None,
+    parallel_agents: bool | None = None,
+    intent_planner: bool | None = None,
+) -> StateGraph:
+    """Create a not compiled graph.
+
+    With ``parallel_agents`` (default: GRAPH_PARALLEL_AGENTS), the agents
+    called by the reasoning node run as graph branches: one node per
+    agent registered when the graph is built, plus a shared branch node
+    for agents registered later. The ``invoke_agent`` calls of a model
+    turn are sent to their branches in parallel and joined back into
+    reasoning.
+
+    With ``intent_planner`` (default: INTENT_PLANNER_ENABLED), common
+    intents are answered by a deterministic plan between the input guard
+    rail and the reasoning node (see IntentPlanner).
+
+    Args:
+        models: Node models from create_chat_models(). Created if omitted.
+        parallel_agents: Build the agent fan-out topology.
+        intent_planner: Run the intent planner ahead of reasoning.
+
+    Returns:
+        StateGraph: The compiled chat graph.
+    """
+    models = models or create_chat_models()
+    if parallel_agents is None:
+        parallel_agents = (
+            os.getenv("GRAPH_PARALLEL_AGENTS", "false").lower() == "true"
+        )
+    if intent_planner is None:
+        intent_planner = IntentPlanner.enabled()
 
     # create the graph
     # node definition
     entrypoint = START
     input_guard_rail_name = "input_guard_rail"
+    planner_node_name = "planner_node"
     reasoning_node_name = "reasoning_node"
     output_guard_rail_name = "output_guard_rail"
+    agent_branch_name = "agent_branch"
     exit_zone = END
+    agent_nodes = (
+        _agent_node_names(agent_branch_name) if parallel_agents else None
+    )
 
     input_guard_rail = InputGuardRail(
         routing_options={
-            "next_node": reasoning_node_name,
+            "next_node": (
+                planner_node_name if intent_planner else reasoning_node_name
+            ),
             "end": output_guard_rail_name,
         },
-        model=input_guard_rail_agent,
+        model=models[input_guard_rail_name],
     )
 
     reasoning_node = ReasoningNode(
         routing_options={
             "next_node": output_guard_rail_name,
             "end": output_guard_rail_name,
+            "agent_branch": agent_branch_name,
         },
-        model=reasoning_agent,
+        model=models[reasoning_node_name],
+        agent_nodes=agent_nodes,
     )
 
     output_guard_rail = OutputGuardRail(
         routing_options={"end": exit_zone},
-        model=output_guard_rail_agent,
+        model=models[output_guard_rail_name],
     )
 
     # workflow
@@ -79,6 +165,21 @@ def create_chat_graph() -> StateGraph:
     workflow.add_node(input_guard_rail_name, input_guard_rail)
     workflow.add_node(reasoning_node_name, reasoning_node)
     workflow.add_node(output_guard_rail_name, output_guard_rail)
+    if intent_planner:
+        workflow.add_node(
+            planner_node_name,
+            PlannerNode(
+                routing_options={
+                    "next_node": output_guard_rail_name,
+                    "fallback": reasoning_node_name,
+                }
+            ),
+        )
+    if agent_nodes is not None:
+        # Branches join back into reasoning once the round completes
+        for node in [agent_branch_name, *agent_nodes.values()]:
+            workflow.add_node(node, AgentBranch(node))
+            workflow.add_edge(node, reasoning_node_name)
     workflow.add_edge(entrypoint, input_guard_rail_name)
     # Remove fixed edges - let nodes handle routing dynamically
     workflow.add_edge(output_guard_rail_name, exit_zone)
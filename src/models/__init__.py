@@ -6,6 +6,8 @@ Author: Klaus
 MIT License
 """
 
+from .cassette import CassetteModel
+from .client_pool import LLMClientPool
 from .gemini import Gemini as GeminiModel
 
-__all__ = ["GeminiModel"]
+__all__ = ["CassetteModel", "GeminiModel", "LLMClientPool"]
@@ -8,20 +8,44 @@ MIT License
 """
 
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Collection
 import os
 
-from langchain_core.messages import BaseMessage, ToolMessage
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    ToolMessage,
+    message_chunk_to_message,
+)
 from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import BaseTool
 from pydantic import BaseModel
 
 from src.data_models.agent_card import AgentCard
+from src.utils.cancellation import (
+    cancellation_scope,
+    get_cancel_token,
+    raise_if_cancelled,
+)
+from src.utils.deadline import (
+    DeadlineExceededError,
+    deadline_scope,
+    get_deadline,
+    nearly_expired,
+    remaining,
+)
 from src.utils.logger import get_logger
-from src.utils.stream import stream_if_available
+from src.utils.stream import get_stream_callback, stream_if_available
+from src.utils.tool_result_store import READ_TOOL_NAME, ToolResultStore
 
 logger = get_logger(__name__)
 
 
+def _call_name(call) -> str:
+    """Tool name of a tool call (dict or object)."""
+    return getattr(call, "name", None) or call.get("name", "")
+
+
 class ChatModel(ABC):
     """
     Base class for all chat models.
@@ -32,9 +56,19 @@ class ChatModel(ABC):
         prompt: str,
         agent_card: AgentCard | None = None,
         tools: list[BaseTool] | None = None,
+        name: str | None = None,
+        hedge: bool | None = None,
     ):
         self.prompt = prompt
         self.agent_card: AgentCard | None = agent_card
+        # Node or agent name used for metrics
+        self.name = (
+            name
+            or (agent_card.name if agent_card else None)
+            or (type(self).__name__)
+        )
+        # Hedge slow calls (None follows LLM_HEDGE_ENABLED)
+        self.hedge = hedge
         self.tools: list[BaseTool] = tools or []
         if self.tools:
             self.set_tools(self.tools)
@@ -72,10 +106,29 @@ class ChatModel(ABC):
         messages: list[BaseMessage],
         max_tool_iters: int | None = None,
         config: RunnableConfig | None = None,
-    ) -> tuple[list[BaseMessage], str | None, str | None]:
+        on_chunk: Callable[[str], None] | None = None,
+        on_tool_call: Callable[[str], None] | None = None,
+        defer: Collection[str] = (),
+    ) -> tuple[list[BaseMessage], str | None, str | None, bool]:
         """
         Invoke once and iteratively fulfill tool calls if present.
-        Returns updated messages and optional error message.
+        Returns updated messages, the final text, an optional error
+        message and whether the answer is partial.
+
+        Calls to the tools named in ``defer`` are not executed: the loop
+        runs the other calls of the turn and returns with no final text,
+        leaving the deferred calls unanswered for the caller to dispatch
+        (see the agent fan-out of ReasoningNode).
+
+        With ``on_chunk`` or ``on_tool_call``, every model turn is
+        streamed: text chunks are passed to ``on_chunk`` as they arrive
+        and tool names to ``on_tool_call`` as soon as they are parsed,
+        before the turn completes.
+
+        When the request deadline in ``config`` is nearly reached (or a
+        model call runs into it), the loop stops and the best partial
+        result gathered so far is returned as the final text, with the
+        partial flag set, instead of iterating past the budget.
         """
         # Get max_tool_iters from environment variable or use default
         if max_tool_iters is None:
@@ -88,88 +141,202 @@ class ChatModel(ABC):
             except Exception:
                 tool_map = {}
 
-            # First invoke
-            resp = self.invoke(messages)
-            messages.append(resp)
-
-            if not tool_map:
-                return messages, None, None
-
-            for _ in range(max_tool_iters):
-                tool_calls = getattr(resp, "tool_calls", None)
-                if not tool_calls:
-                    # Try to extract final text
-                    final_text = getattr(resp, "content", None)
-                    return messages, final_text, None
-                # Log only the tool names to avoid long lines
-                try:
-                    tool_names = [
-                        getattr(c, "name", None) or c.get("name", "")
-                        for c in tool_calls
-                    ]
-                except Exception:
-                    tool_names = []
-                logger.debug("invoke_with_tools: tool_calls=%r", tool_names)
-                for call in tool_calls:
-                    name = getattr(call, "name", None) or call.get("name", "")
-                    args = (
-                        getattr(call, "args", None)
-                        or call.get("args", {})
-                        or {}
-                    )
-                    call_id = (
-                        getattr(call, "id", None) or call.get("id", "") or ""
+            left = remaining(config)
+            if left is not None and left <= 0:
+                return (
+                    messages,
+                    None,
+                    "Deadline exceeded before model call.",
+                    False,
+                )
+
+            def turn(history: list[BaseMessage]) -> BaseMessage:
+                if on_chunk is None and on_tool_call is None:
+                    return self.invoke(history)
+                return self._streamed_turn(history, on_chunk, on_tool_call)
+
+            with (
+                deadline_scope(get_deadline(config)),
+                cancellation_scope(get_cancel_token(config)),
+            ):
+                # First invoke
+                raise_if_cancelled(config)
+                resp = turn(messages)
+                messages.append(resp)
+
+                if not tool_map:
+                    return messages, None, None, False
+
+                for _ in range(max_tool_iters):
+                    tool_calls = getattr(resp, "tool_calls", None)
+                    if not tool_calls:
+                        # Try to extract final text
+                        final_text = getattr(resp, "content", None)
+                        return messages, final_text, None, False
+                    deferred = [c for c in tool_calls if _call_name(c) in defer]
+                    self._run_tool_calls(
+                        [c for c in tool_calls if c not in deferred],
+                        tool_map,
+                        messages,
+                        config,
                     )
-                    tool = tool_map.get(name)
-                    if not tool:
+                    if deferred:
+                        return messages, None, None, False
+                    if nearly_expired(config):
                         logger.warning(
-                            f"invoke_with_tools: tool not found: {name}"
-                        )
-                        messages.append(
-                            ToolMessage(
-                                name=name or "",
-                                tool_call_id=call_id,
-                                content=f"Tool '{name}' not found.",
-                            )
-                        )
-                        continue
-                    try:
-                        config = args.get("config", {})
-                        stream_if_available(
-                            config.get("stream_callback"),
-                            f"Invocando ferramenta: {name}...",
-                            type="reasoning",
-                        )
-                        result = tool.invoke(input=args, config=config)
-
-                        messages.append(
-                            ToolMessage(
-                                name=name or "",
-                                tool_call_id=call_id,
-                                content=str(result),
-                            )
-                        )
-                    except Exception as e:
-                        error_msg = f"Tool '{name}' execution error: {e!s}"
-                        logger.error(error_msg)
-                        messages.append(
-                            ToolMessage(
-                                name=name or "",
-                                tool_call_id=call_id,
-                                content=error_msg,
-                            )
+                            "invoke_with_tools: deadline near, returning "
+                            "partial result"
                         )
-                # Re-invoke after tools
-                resp = self.invoke(messages)
-                messages.append(resp)
+                        return self._stop_partial(messages)
+                    # Re-invoke after tools (unless the client is gone)
+                    raise_if_cancelled(config)
+                    resp = turn(messages)
+                    messages.append(resp)
 
             return (
                 messages,
                 None,
                 "Max tool iterations reached without final answer.",
+                False,
+            )
+        except DeadlineExceededError:
+            if not any(isinstance(m, ToolMessage) for m in messages):
+                return messages, None, "Deadline exceeded.", False
+            logger.warning(
+                "invoke_with_tools: deadline exceeded, returning partial result"
             )
+            return self._stop_partial(messages)
         except Exception as e:
-            return messages, None, f"Error during model execution: {e!s}"
+            return (
+                messages,
+                None,
+                f"Error during model execution: {e!s}",
+                False,
+            )
+
+    def _stop_partial(
+        self, messages: list[BaseMessage]
+    ) -> tuple[list[BaseMessage], str, None, bool]:
+        """End the tool loop with the partial result gathered so far."""
+        partial = self._partial_result(messages)
+        messages.append(AIMessage(content=partial))
+        return messages, partial, None, True
+
+    def _run_tool_calls(
+        self,
+        tool_calls: list,
+        tool_map: dict[str, BaseTool],
+        messages: list[BaseMessage],
+        config: RunnableConfig | None,
+    ) -> None:
+        """Execute tool calls and append their ToolMessages."""
+        # Log only the tool names to avoid long lines
+        try:
+            tool_names = [_call_name(c) for c in tool_calls]
+        except Exception:
+            tool_names = []
+        logger.debug("invoke_with_tools: tool_calls=%r", tool_names)
+        for call in tool_calls:
+            # Pending tool calls are dropped once the request is cancelled
+            raise_if_cancelled(config)
+            name = _call_name(call)
+            args = getattr(call, "args", None) or call.get("args", {}) or {}
+            call_id = getattr(call, "id", None) or call.get("id", "") or ""
+            tool = tool_map.get(name)
+            if not tool:
+                logger.warning("invoke_with_tools: tool not found: %s", name)
+                messages.append(
+                    ToolMessage(
+                        name=name or "",
+                        tool_call_id=call_id,
+                        content=f"Tool '{name}' not found.",
+                    )
+                )
+                continue
+            try:
+                stream_if_available(
+                    get_stream_callback(config),
+                    f"Invocando ferramenta: {name}...",
+                    type="reasoning",
+                )
+                # The request config (deadline included) reaches the tool
+                result = tool.invoke(input=args, config=config)
+
+                content = str(result)
+                if name != READ_TOOL_NAME:
+                    # Large results stay out of the re-sent history
+                    content = ToolResultStore.compact(
+                        content, readable=READ_TOOL_NAME in tool_map
+                    )
+                messages.append(
+                    ToolMessage(
+                        name=name or "",
+                        tool_call_id=call_id,
+                        content=content,
+                    )
+                )
+            except Exception as e:
+                error_msg = f"Tool '{name}' execution error: {e!s}"
+                logger.error(error_msg)
+                messages.append(
+                    ToolMessage(
+                        name=name or "",
+                        tool_call_id=call_id,
+                        content=error_msg,
+                    )
+                )
+
+    def _streamed_turn(
+        self,
+        messages: list[BaseMessage],
+        on_chunk: Callable[[str], None] | None,
+        on_tool_call: Callable[[str], None] | None = None,
+    ) -> BaseMessage:
+        """Stream one model turn, forwarding its text; return the message."""
+        merged = None
+        for chunk in self.stream(messages):
+            content = getattr(chunk, "content", "")
+            if isinstance(content, list):
+                # Multi-part content: keep the text parts only
+                content = "".join(
+                    p if isinstance(p, str) else str(p.get("text", ""))
+                    for p in content
+                )
+            if content and on_chunk is not None:
+                on_chunk(content)
+            if on_tool_call is not None:
+                # Only the first chunk of each tool call carries its name
+                for call in getattr(chunk, "tool_call_chunks", None) or []:
+                    if call.get("name"):
+                        on_tool_call(call["name"])
+            merged = chunk if merged is None else merged + chunk
+        if merged is None:
+            return AIMessage(content="")
+        return message_chunk_to_message(merged)
+
+    @staticmethod
+    def _partial_result(messages: list[BaseMessage]) -> str:
+        """Best answer available when the deadline stops the tool loop."""
+        for msg in reversed(messages):
+            if isinstance(msg, AIMessage) and msg.content:
+                return str(msg.content)
+        tool_results = [
+            f"- {msg.name}: {msg.content}"
+            for msg in messages
+            if isinstance(msg, ToolMessage)
+        ]
+        return "Resultados parciais (tempo esgotado):\n" + "\n".join(
+            tool_results
+        )
+
+    def warm_up(self) -> bool:
+        """
+        Open the backend connection with a cheap call.
+
+        Returns:
+            bool: True if the backend was warmed, False if not supported.
+        """
+        return False
 
     def has_tools(self) -> bool:
         return bool(self.tools)
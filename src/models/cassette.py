@@ -0,0 +1,389 @@
+"""
+File: cassette.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+from threading import Lock
+import time
+from typing import Any
+
+from langchain_core.messages import (
+    BaseMessage,
+    ToolMessage,
+    message_to_dict,
+    messages_from_dict,
+)
+from langchain_core.tools import BaseTool
+from pydantic import BaseModel
+
+from src.data_models.agent_card import AgentCard
+from src.models.base._chat_model import ChatModel
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CASSETTE_MODES = ["record", "replay"]
+
+
+def _message_key(message: BaseMessage, loose: bool) -> dict[str, Any]:
+    """Reduce a message to the fields that identify a request."""
+    key: dict[str, Any] = {"type": message.type}
+    if isinstance(message, ToolMessage):
+        key["name"] = message.name or ""
+        # Tool results may be non-deterministic (random telemetry, weather),
+        # the loose key only keeps the tool name.
+        if not loose:
+            key["content"] = str(message.content)
+        return key
+    key["content"] = message.content
+    tool_calls = getattr(message, "tool_calls", None) or []
+    if tool_calls:
+        key["tool_calls"] = [
+            {"name": c.get("name", ""), "args": c.get("args", {})}
+            for c in tool_calls
+        ]
+    return key
+
+
+def fingerprint(
+    kind: str,
+    prompt: str,
+    messages: list[BaseMessage],
+    tools: list[BaseTool] | None = None,
+    schema: str | None = None,
+    loose: bool = False,
+) -> str:
+    """
+    Compute a stable fingerprint for a model request.
+
+    Tool call ids are ignored since the provider generates them randomly.
+
+    Args:
+        kind: The call kind (invoke, stream or structured).
+        prompt: The system prompt of the model.
+        messages: The messages sent to the model.
+        tools: The tools bound to the model.
+        schema: The structured output schema name, if any.
+        loose: Ignore tool result contents.
+
+    Returns:
+        str: The hex digest identifying the request.
+    """
+    payload = {
+        "kind": kind,
+        "prompt": prompt,
+        "schema": schema,
+        "tools": sorted(t.name for t in (tools or [])),
+        "messages": [_message_key(m, loose) for m in messages],
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+class CassetteModel(ChatModel):
+    """
+    Record/replay chat model backed by a cassette file.
+
+    In record mode every call is forwarded to the wrapped model and the
+    response, streamed chunks and timings are appended to the cassette. In
+    replay mode the cassette is served back without network access, sleeping
+    the recorded latencies multiplied by ``latency_scale``; no model is
+    needed, only the prompt and tools that identify the requests.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        mode: str = "replay",
+        model: ChatModel | None = None,
+        prompt: str | None = None,
+        tools: list[BaseTool] | None = None,
+        latency_scale: float = 1.0,
+        agent_card: AgentCard | None = None,
+    ):
+        """
+        Initialize the cassette model.
+
+        Args:
+            path: The cassette file (JSON lines, gzip if ending in ".gz").
+            mode: Either "record" or "replay".
+            model: The model to wrap. Required in record mode.
+            prompt: The system prompt. Defaults to the wrapped model prompt.
+            tools: The tools. Defaults to the wrapped model tools.
+            latency_scale: Multiplier for replayed latencies (0 disables).
+            agent_card: The agent card. Defaults to the wrapped model card.
+
+        Raises:
+            ValueError: If the mode is invalid or the model is missing.
+        """
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Invalid cassette mode: {mode}")
+        if mode == "record" and model is None:
+            raise ValueError("A model is required to record a cassette")
+
+        self.path = Path(path)
+        self.mode = mode
+        self.wrapped = model
+        self.latency_scale = max(latency_scale, 0.0)
+        self._lock = Lock()
+        self._entries: dict[str, list[dict[str, Any]]] = {}
+        self._cursors: dict[str, int] = {}
+
+        if prompt is None:
+            prompt = model.prompt if model else ""
+        if tools is None and model is not None:
+            tools = model.get_tools()
+        super().__init__(
+            prompt,
+            agent_card=agent_card or (model.agent_card if model else None),
+            tools=tools,
+            name=model.name if model else self.path.stem,
+        )
+
+        if self.mode == "replay":
+            self._load()
+        logger.debug(
+            f"📼 CassetteModel: {self.mode} -> {self.path} "
+            f"({len(self._entries)} fingerprints)"
+        )
+
+    def _open(self, mode: str):
+        if self.path.suffix == ".gz":
+            return gzip.open(self.path, mode + "t", encoding="utf-8")
+        return open(self.path, mode, encoding="utf-8")
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            raise FileNotFoundError(f"Cassette not found: {self.path}")
+        with self._open("r") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                for key in (entry["fingerprint"], entry.get("loose")):
+                    if key:
+                        self._entries.setdefault(key, []).append(entry)
+
+    def _append(self, entry: dict[str, Any]) -> None:
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._open("a") as file:
+                file.write(line + "\n")
+
+    def _keys(
+        self,
+        kind: str,
+        messages: list[BaseMessage],
+        schema: str | None = None,
+    ) -> tuple[str, str]:
+        args = (kind, self.prompt, messages, self.tools, schema)
+        return fingerprint(*args), fingerprint(*args, loose=True)
+
+    def _next_entry(self, strict: str, loose: str) -> dict[str, Any]:
+        """Return the next recorded entry, preferring the strict match."""
+        with self._lock:
+            for key in (strict, loose):
+                entries = self._entries.get(key)
+                if not entries:
+                    continue
+                # Identical requests are served in recorded order; the last
+                # entry is repeated once the sequence is exhausted.
+                cursor = self._cursors.get(key, 0)
+                self._cursors[key] = cursor + 1
+                return entries[min(cursor, len(entries) - 1)]
+        raise LookupError(f"Cassette miss for fingerprint {strict}")
+
+    def _sleep(self, seconds: float) -> None:
+        if self.latency_scale and seconds > 0:
+            time.sleep(seconds * self.latency_scale)
+
+    def invoke(self, messages: list[BaseMessage] | None = None) -> BaseMessage:
+        """
+        Invoke the wrapped model or replay the recorded response.
+
+        Raises:
+            ValueError: Messages are required
+            LookupError: The request is not in the cassette (replay mode)
+        """
+        if not messages:
+            raise ValueError("Messages are required")
+        strict, loose = self._keys("invoke", messages)
+
+        if self.mode == "replay":
+            entry = self._next_entry(strict, loose)
+            self._sleep(entry.get("latency", 0.0))
+            return messages_from_dict([entry["response"]])[0]
+
+        start = time.perf_counter()
+        response = self.wrapped.invoke(messages)
+        self._append(
+            {
+                "fingerprint": strict,
+                "loose": loose,
+                "kind": "invoke",
+                "latency": round(time.perf_counter() - start, 4),
+                "response": message_to_dict(response),
+            }
+        )
+        return response
+
+    def stream(
+        self, messages: list[BaseMessage] | None = None
+    ) -> Iterator[Any]:
+        """
+        Stream the wrapped model or replay the recorded chunks.
+
+        Raises:
+            ValueError: Messages are required
+            LookupError: The request is not in the cassette (replay mode)
+        """
+        if not messages:
+            raise ValueError("Messages are required")
+        strict, loose = self._keys("stream", messages)
+
+        if self.mode == "replay":
+            return self._replay_stream(self._next_entry(strict, loose))
+        return self._record_stream(messages, strict, loose)
+
+    def _replay_stream(self, entry: dict[str, Any]) -> Iterator[Any]:
+        for chunk in entry.get("chunks", []):
+            self._sleep(chunk.get("delay", 0.0))
+            yield messages_from_dict([chunk["message"]])[0]
+
+    def _record_stream(
+        self, messages: list[BaseMessage], strict: str, loose: str
+    ) -> Iterator[Any]:
+        chunks = []
+        last = time.perf_counter()
+        for chunk in self.wrapped.stream(messages):
+            now = time.perf_counter()
+            chunks.append(
+                {
+                    "delay": round(now - last, 4),
+                    "message": message_to_dict(chunk),
+                }
+            )
+            last = now
+            yield chunk
+        self._append(
+            {
+                "fingerprint": strict,
+                "loose": loose,
+                "kind": "stream",
+                "chunks": chunks,
+            }
+        )
+
+    def invoke_with_structured_output(
+        self, schema: type[BaseModel], messages: list[BaseMessage] | None = None
+    ) -> dict[str, Any]:
+        """
+        Invoke with structured output, recording the raw and parsed results.
+
+        Raises:
+            LookupError: The request is not in the cassette (replay mode)
+        """
+        messages = messages or []
+        strict, loose = self._keys("structured", messages, schema.__name__)
+
+        if self.mode == "replay":
+            entry = self._next_entry(strict, loose)
+            self._sleep(entry.get("latency", 0.0))
+            raw = entry.get("raw")
+            parsed = entry.get("parsed")
+            return {
+                "raw": messages_from_dict([raw])[0] if raw else None,
+                "parsed": schema.model_validate(parsed) if parsed else None,
+                "parsing_error": None,
+            }
+
+        start = time.perf_counter()
+        response = self.wrapped.invoke_with_structured_output(
+            schema, messages=messages
+        )
+        raw = response.get("raw") if isinstance(response, dict) else None
+        parsed = (
+            response.get("parsed") if isinstance(response, dict) else response
+        )
+        self._append(
+            {
+                "fingerprint": strict,
+                "loose": loose,
+                "kind": "structured",
+                "latency": round(time.perf_counter() - start, 4),
+                "raw": message_to_dict(raw) if raw is not None else None,
+                "parsed": (
+                    parsed.model_dump()
+                    if isinstance(parsed, BaseModel)
+                    else None
+                ),
+            }
+        )
+        return response
+
+    def warm_up(self) -> bool:
+        """Warm up the wrapped model; replay needs no connection."""
+        if self.mode == "record":
+            return self.wrapped.warm_up()
+        return True
+
+    def set_tools(self, tools: list[BaseTool] | None):
+        """
+        Keep the tools locally; tool calls are always executed for real.
+        """
+        self.tools = tools or []
+        wrapped = getattr(self, "wrapped", None)
+        if wrapped is not None and self.tools != wrapped.get_tools():
+            wrapped.set_tools(self.tools)
+
+
+def wrap_with_cassette(
+    build: Callable[[], ChatModel],
+    name: str,
+    prompt: str,
+    tools: list[BaseTool] | None = None,
+    agent_card: AgentCard | None = None,
+) -> ChatModel:
+    """
+    Wrap a model with a cassette when LLM_CASSETTE_MODE is set.
+
+    Each model gets its own cassette file ``<LLM_CASSETTE_DIR>/<name>.jsonl``.
+    In replay mode the model is never built, so no provider client (nor
+    its API key or SDK) is needed.
+
+    Args:
+        build: Builds the model to wrap.
+        name: The cassette name (usually the node or agent name).
+        prompt: The system prompt of the model.
+        tools: The tools of the model.
+        agent_card: The agent card of the model, if any.
+
+    Returns:
+        ChatModel: The cassette model, or the built model when disabled.
+    """
+    mode = os.getenv("LLM_CASSETTE_MODE", "").strip().lower()
+    if mode not in CASSETTE_MODES:
+        return build()
+    cassette_dir = Path(os.getenv("LLM_CASSETTE_DIR", "data/cassettes"))
+    return CassetteModel(
+        path=cassette_dir / f"{name}.jsonl",
+        mode=mode,
+        model=build() if mode == "record" else None,
+        prompt=prompt,
+        tools=tools,
+        latency_scale=float(os.getenv("LLM_CASSETTE_LATENCY_SCALE", "1.0")),
+        agent_card=agent_card,
+    )
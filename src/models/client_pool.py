@@ -0,0 +1,151 @@
+"""
+File: client_pool.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from threading import RLock
+import time
+from typing import Any, ClassVar
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+PoolKey = tuple[str, str, tuple[tuple[str, str], ...]]
+
+
+@dataclass
+class _ClientStats:
+    """Usage counters of a pooled client."""
+
+    created_at: float
+    leases: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    requests: int = 0
+
+
+class LLMClientPool:
+    """Process-wide pool of provider clients keyed by configuration.
+
+    Every ChatModel with the same provider, model and parameters shares a
+    single client (and therefore its HTTP/gRPC channels). Prompts and tool
+    bindings stay on each ChatModel since binding returns a new runnable
+    wrapping the shared client.
+    """
+
+    _clients: ClassVar[dict[PoolKey, Any]] = {}
+    _stats: ClassVar[dict[PoolKey, _ClientStats]] = {}
+    _hits: ClassVar[int] = 0
+    _misses: ClassVar[int] = 0
+    _lock: ClassVar[RLock] = RLock()
+
+    @staticmethod
+    def make_key(provider: str, model: str, **params: Any) -> PoolKey:
+        """Build a hashable pool key from a client configuration."""
+        return (
+            provider,
+            model,
+            tuple(sorted((k, repr(v)) for k, v in params.items())),
+        )
+
+    @classmethod
+    def acquire(
+        cls,
+        factory: Callable[[], Any],
+        provider: str,
+        model: str,
+        **params: Any,
+    ) -> tuple[PoolKey, Any]:
+        """
+        Return the shared client for a configuration, creating it once.
+
+        Args:
+            factory: Builds the client on a pool miss.
+            provider: Provider name (e.g. "gemini").
+            model: The model name.
+            **params: Remaining client parameters (temperature, ...).
+
+        Returns:
+            tuple[PoolKey, Any]: The pool key and the shared client.
+        """
+        key = cls.make_key(provider, model, **params)
+        with cls._lock:
+            client = cls._clients.get(key)
+            if client is None:
+                client = factory()
+                cls._clients[key] = client
+                cls._stats[key] = _ClientStats(created_at=time.time())
+                cls._misses += 1
+                logger.debug("🏊 LLMClientPool: new client %s", key)
+            else:
+                cls._hits += 1
+            cls._stats[key].leases += 1
+            return key, client
+
+    @classmethod
+    def release(cls, key: PoolKey) -> None:
+        """Drop a lease; the client is closed with the pool, not here."""
+        with cls._lock:
+            stats = cls._stats.get(key)
+            if stats and stats.leases > 0:
+                stats.leases -= 1
+
+    @classmethod
+    @contextmanager
+    def track(cls, key: PoolKey | None) -> Generator[None, None, None]:
+        """Count a call against a pooled client while it is in flight."""
+        stats = cls._stats.get(key) if key else None
+        if stats is None:
+            yield
+            return
+        with cls._lock:
+            stats.in_flight += 1
+            stats.requests += 1
+            stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        try:
+            yield
+        finally:
+            with cls._lock:
+                stats.in_flight -= 1
+
+    @classmethod
+    def metrics(cls) -> dict[str, Any]:
+        """Return pool utilisation metrics."""
+        with cls._lock:
+            return {
+                "clients": len(cls._clients),
+                "hits": cls._hits,
+                "misses": cls._misses,
+                "pools": [
+                    {
+                        "provider": key[0],
+                        "model": key[1],
+                        "params": dict(key[2]),
+                        "leases": stats.leases,
+                        "in_flight": stats.in_flight,
+                        "peak_in_flight": stats.peak_in_flight,
+                        "requests": stats.requests,
+                        "age_s": round(time.time() - stats.created_at, 1),
+                    }
+                    for key, stats in cls._stats.items()
+                ],
+            }
+
+    @classmethod
+    def clear(cls) -> None:
+        """Forget every pooled client (tests, worker re-initialization)."""
+        with cls._lock:
+            cls._clients.clear()
+            cls._stats.clear()
+            cls._hits = 0
+            cls._misses = 0
@@ -7,22 +7,40 @@ Author: Klaus
 MIT License
 """
 
-from collections.abc import Iterator
-from contextlib import suppress
+from collections.abc import Generator, Iterator
+from contextlib import contextmanager, suppress
 from typing import Any
 
-from langchain_core.messages import BaseMessage, SystemMessage
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    SystemMessage,
+    message_chunk_to_message,
+)
 from langchain_core.tools import BaseTool
-from langchain_google_genai import ChatGoogleGenerativeAI
 from pydantic import BaseModel
 
 from src.data_models.agent_card import AgentCard
 from src.models.base._chat_model import ChatModel
+from src.models.client_pool import LLMClientPool
+from src.models.resilience import Resilience
+from src.models.scheduler import CallSlot, LLMScheduler, estimate_tokens
+from src.utils.cancellation import raise_if_cancelled
+from src.utils.deadline import (
+    DeadlineExceededError,
+    call_timeout,
+    remaining,
+)
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+def _timeout_kwargs(timeout: float | None) -> dict[str, float]:
+    """Per-call ``timeout`` argument of the client (none without one)."""
+    return {} if timeout is None else {"timeout": timeout}
+
+
 class Gemini(ChatModel):
     """
     Gemini chat model.
@@ -35,21 +53,48 @@ class Gemini(ChatModel):
         temperature: float = 0.0,
         agent_card: AgentCard | None = None,
         tools: list[BaseTool] | None = None,
+        name: str | None = None,
+        hedge: bool | None = None,
+        **client_kwargs: Any,
     ):
         """
         Start the gemini chat model.
 
         Args:
             model (str): The model to use.
+            name (str, optional): Node or agent name used for metrics.
+            hedge (bool, optional): Hedge slow calls. Defaults to
+                LLM_HEDGE_ENABLED.
+            **client_kwargs: Extra ChatGoogleGenerativeAI parameters. Models
+                with the same model, temperature and parameters share one
+                pooled client.
         """
-        # Initialize the actual ChatGoogleGenerativeAI model first
-        gemini_model = ChatGoogleGenerativeAI(
-            model=model, temperature=temperature
+
+        def create_client():
+            # Deferred: the Google SDK is the heaviest import of the app
+            from langchain_google_genai import ChatGoogleGenerativeAI
+
+            return ChatGoogleGenerativeAI(
+                model=model, temperature=temperature, **client_kwargs
+            )
+
+        # Shared client per configuration (reuses warm HTTP/gRPC channels)
+        self.pool_key, gemini_model = LLMClientPool.acquire(
+            create_client,
+            provider="gemini",
+            model=model,
+            temperature=temperature,
+            **client_kwargs,
         )
+        self.model_name = model
         self.model = gemini_model
+        # Unbound shared client; tools are bound on a per-model wrapper
+        self.base_model = gemini_model
 
         # Call super().__init__ with the actual model instance
-        super().__init__(prompt, agent_card=agent_card, tools=tools)
+        super().__init__(
+            prompt, agent_card=agent_card, tools=tools, name=name, hedge=hedge
+        )
         # Ensure tools are bound on the backend if provided
         if tools:
             try:
@@ -87,7 +132,21 @@ class Gemini(ChatModel):
                 full_messages = [prompt_message, *messages]
             else:
                 full_messages = messages
-            response = self.model.invoke(full_messages)
+
+            hedged = Resilience.hedging(self.hedge)
+
+            def call() -> BaseMessage:
+                if hedged:
+                    # Streamed, so a losing attempt stops at its next chunk
+                    return self._collected(full_messages)
+                with self._provider_call(full_messages) as slot:
+                    result = self.model.invoke(
+                        full_messages, **_timeout_kwargs(call_timeout())
+                    )
+                slot.settle(getattr(result, "usage_metadata", None))
+                return result
+
+            response = Resilience.call(self.name, call, hedge=self.hedge)
 
             # Log token usage based on response type
             try:
@@ -99,7 +158,7 @@ class Gemini(ChatModel):
                         and raw_response.usage_metadata
                     ):
                         logger.debug(
-                            f"🪙 Token usage: {raw_response.usage_metadata}"
+                            "🪙 Token usage: %s", raw_response.usage_metadata
                         )
                 elif isinstance(response, BaseMessage):
                     # Direct AIMessage response
@@ -108,10 +167,10 @@ class Gemini(ChatModel):
                         and response.usage_metadata
                     ):
                         logger.debug(
-                            f"🪙 Token usage: {response.usage_metadata}"
+                            "🪙 Token usage: %s", response.usage_metadata
                         )
             except Exception as e:
-                logger.debug(f"Could not log token usage: {e}")
+                logger.debug("Could not log token usage: %s", e)
 
             return response
         raise ValueError("Messages are required")
@@ -139,18 +198,112 @@ class Gemini(ChatModel):
                 full_messages = [prompt_message, *messages]
             else:
                 full_messages = messages
-            return self.model.stream(full_messages)
+            return self._resilient_stream(full_messages)
         raise ValueError("Messages are required")
 
+    def _resilient_stream(self, messages: list[BaseMessage]) -> Iterator[Any]:
+        """Stream a response, retrying the call until its first chunk.
+
+        Chunks already handed to the caller cannot be taken back, so a
+        failure after the first chunk is raised as is. Streams are not
+        hedged: the open response belongs to the thread that started it.
+        """
+
+        def start() -> tuple[Any, Iterator[Any]]:
+            stream = self._tracked_stream(messages)
+            return next(stream, None), stream
+
+        # Own counters: time to first chunk, not full call latency
+        first, stream = Resilience.call(
+            f"{self.name}:stream", start, hedge=False
+        )
+        try:
+            if first is not None:
+                yield first
+            yield from stream
+        finally:
+            stream.close()
+
+    def _tracked_stream(self, messages: list[BaseMessage]) -> Iterator[Any]:
+        usage = None
+        with self._provider_call(messages) as slot:
+            stream = self.model.stream(
+                messages, **_timeout_kwargs(call_timeout())
+            )
+            try:
+                for chunk in stream:
+                    usage = getattr(chunk, "usage_metadata", None) or usage
+                    # Closing the stream aborts the provider response
+                    raise_if_cancelled()
+                    yield chunk
+            finally:
+                stream.close()
+        slot.settle(usage)
+
+    def _collected(self, messages: list[BaseMessage]) -> BaseMessage:
+        """Stream a response and merge its chunks into one message."""
+        merged = None
+        for chunk in self._tracked_stream(messages):
+            merged = chunk if merged is None else merged + chunk
+        if merged is None:
+            return AIMessage(content="")
+        return message_chunk_to_message(merged)
+
+    @contextmanager
+    def _provider_call(
+        self, messages: list[BaseMessage]
+    ) -> Generator[CallSlot, None, None]:
+        """Wait for a scheduler slot and track the call on the pool.
+
+        A call cut short by the request deadline (the client is given the
+        time left as its timeout) raises DeadlineExceededError.
+        """
+        with (
+            LLMScheduler.slot(
+                self.model_name, estimate_tokens(messages)
+            ) as slot,
+            LLMClientPool.track(self.pool_key),
+        ):
+            try:
+                yield slot
+            except DeadlineExceededError:
+                raise
+            except Exception as e:
+                left = remaining()
+                if left is not None and left <= 0:
+                    raise DeadlineExceededError(
+                        f"{self.name}: request deadline exceeded"
+                    ) from e
+                raise
+
+    def warm_up(self) -> bool:
+        """
+        Warm up the connection with a token count request.
+
+        Counting tokens opens the channel (DNS, TLS, auth) without generating
+        any output, so the first real request does not pay for it.
+        """
+        try:
+            self.base_model.get_num_tokens("ping")
+            return True
+        except Exception as e:
+            logger.warning("Gemini: warm-up failed: %s", e)
+            return False
+
     def set_tools(self, tools: list[BaseTool] | None):
         """
         Bind tools to the underlying model, mirroring structured output binding.
         """
         self.tools = tools or []
 
-        if hasattr(self.model, "bind_tools") and self.tools:
+        # Always bind on the shared client so re-binding never stacks and
+        # the pooled client itself is left untouched
+        base_model = getattr(self, "base_model", self.model)
+        if not self.tools:
+            self.model = base_model
+        elif hasattr(base_model, "bind_tools"):
             with suppress(Exception):
-                self.model = self.model.bind_tools(self.tools)
+                self.model = base_model.bind_tools(self.tools)
 
     def invoke_with_structured_output(
         self, schema: BaseModel, messages: list[BaseMessage] | None = None
@@ -158,8 +311,24 @@ class Gemini(ChatModel):
         """
         Invoke the chat model with structured output.
         """
-        structured_model = self.model.with_structured_output(
-            schema, include_raw=True
-        )
         messages_for_api = [SystemMessage(content=self.prompt), *messages]
-        return structured_model.invoke(messages_for_api)
+
+        def call() -> Any:
+            model = self.model
+            timeout = call_timeout()
+            if timeout is not None:
+                # Structured output chains drop call kwargs: copy the
+                # (shared) client with the timeout instead
+                model = self.base_model.model_copy(update={"timeout": timeout})
+            structured_model = model.with_structured_output(
+                schema, include_raw=True
+            )
+            with self._provider_call(messages_for_api) as slot:
+                response = structured_model.invoke(messages_for_api)
+            raw = response.get("raw") if isinstance(response, dict) else None
+            slot.settle(getattr(raw, "usage_metadata", None))
+            return response
+
+        # Not hedged: a losing structured call cannot be stopped early, so
+        # a hedge would only duplicate every slow guard-rail call
+        return Resilience.call(self.name, call, hedge=False)
@@ -0,0 +1,248 @@
+"""
+File: micro_batcher.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+import os
+from threading import Condition, Lock
+import time
+from typing import Any, ClassVar, Generic, TypeVar
+
+from src.utils.cancellation import (
+    CancelToken,
+    cancellation_scope,
+    get_cancel_token,
+)
+from src.utils.deadline import (
+    DeadlineExceededError,
+    deadline_scope,
+    get_deadline,
+)
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# How often a waiting caller checks its cancel token
+CANCEL_POLL_S = 0.05
+
+
+def _wait_slice(
+    token: CancelToken | None, deadline: float | None
+) -> float | None:
+    """Longest wait before a caller must check its request again."""
+    timeout = None
+    if deadline is not None:
+        timeout = max(0.0, deadline - time.time())
+    if token is not None:
+        timeout = (
+            CANCEL_POLL_S if timeout is None else min(timeout, CANCEL_POLL_S)
+        )
+    return timeout
+
+
+@dataclass(eq=False)
+class _Pending(Generic[T, R]):
+    item: T
+    future: Future[R] = field(default_factory=Future)
+
+
+@dataclass
+class _BatchStats:
+    batches: int = 0
+    items: int = 0
+    max_size: int = 0
+    failures: int = 0
+    abandoned: int = 0
+    wait_total_s: float = 0.0
+
+
+class MicroBatcher(Generic[T, R]):
+    """Coalesce concurrent calls into one batched call.
+
+    The first caller becomes the leader: it waits at most ``max_wait_s``
+    (or until ``max_batch`` items are queued), takes the batch and runs
+    ``process`` in its own thread. The others block until their result is
+    set. No background thread is needed, and the extra latency of any
+    caller is bounded by ``max_wait_s`` plus the batched call itself.
+
+    ``process`` receives the items and must return one result per item,
+    in order. The batched call belongs to no single request, so it runs
+    without the leader's deadline or cancellation token. A waiting caller
+    stops waiting at its own deadline or cancellation.
+    """
+
+    _instances: ClassVar[dict[str, MicroBatcher]] = {}
+    _registry_lock: ClassVar[Lock] = Lock()
+
+    def __init__(
+        self,
+        name: str,
+        process: Callable[[list[T]], list[R]],
+        max_batch: int,
+        max_wait_s: float,
+    ):
+        """Initialize the batcher and register it for metrics."""
+        self.name = name
+        self.max_batch = max(1, max_batch)
+        self.max_wait_s = max(0.0, max_wait_s)
+        self._process = process
+        self._condition = Condition()
+        self._queue: list[_Pending[T, R]] = []
+        self._leader_active = False
+        self._stats = _BatchStats()
+        with self._registry_lock:
+            self._instances[name] = self
+
+    @classmethod
+    def from_env(
+        cls,
+        name: str,
+        process: Callable[[list[T]], list[R]],
+        prefix: str,
+    ) -> MicroBatcher[T, R] | None:
+        """
+        Build a batcher from ``<prefix>_MAX`` and ``<prefix>_WAIT_MS``.
+
+        Returns:
+            MicroBatcher | None: None when batching is disabled (max <= 1).
+        """
+        max_batch = int(os.getenv(f"{prefix}_MAX", "1"))
+        if max_batch <= 1:
+            return None
+        max_wait_ms = float(os.getenv(f"{prefix}_WAIT_MS", "5"))
+        return cls(name, process, max_batch, max_wait_ms / 1000)
+
+    def submit(self, item: T) -> R:
+        """
+        Add an item to the next batch and wait for its result.
+
+        The wait is bounded by the deadline and cancel token of the current
+        request scope; an abandoned item leaves the queue (or, when a batch
+        already took it, its result is discarded).
+
+        Raises:
+            RequestCancelledError: The request was cancelled while waiting.
+            DeadlineExceededError: The request deadline passed while
+                waiting.
+            Exception: Whatever ``process`` raised for the batch.
+        """
+        token = get_cancel_token()
+        deadline = get_deadline(None)
+        pending: _Pending[T, R] = _Pending(item)
+        with self._condition:
+            self._queue.append(pending)
+            self._condition.notify_all()
+            while not pending.future.done():
+                # Items already taken by a leader are not in the queue
+                if (
+                    not self._leader_active
+                    and self._queue
+                    and self._queue[0] is pending
+                ):
+                    self._leader_active = True
+                    break
+                self._condition.wait(_wait_slice(token, deadline))
+                if pending.future.done():
+                    break
+                try:
+                    if token is not None:
+                        token.raise_if_cancelled()
+                    if deadline is not None and time.time() >= deadline:
+                        raise DeadlineExceededError(
+                            f"{self.name}: request deadline exceeded"
+                        )
+                except BaseException:
+                    self._abandon(pending)
+                    raise
+        if not pending.future.done():
+            self._lead()
+        return pending.future.result()
+
+    def _abandon(self, pending: _Pending[T, R]) -> None:
+        """Drop the item of a caller that stopped waiting (lock held)."""
+        self._stats.abandoned += 1
+        if pending in self._queue:
+            self._queue.remove(pending)
+            # The head of the queue may now have to lead
+            self._condition.notify_all()
+
+    def _lead(self) -> None:
+        """Collect a batch, run it and hand the results out."""
+        start = time.monotonic()
+        with self._condition:
+            while len(self._queue) < self.max_batch:
+                left = self.max_wait_s - (time.monotonic() - start)
+                if left <= 0:
+                    break
+                self._condition.wait(left)
+            batch = self._queue[: self.max_batch]
+            del self._queue[: self.max_batch]
+            # The next queued caller (if any) leads the following batch
+            self._leader_active = False
+            self._condition.notify_all()
+        waited = time.monotonic() - start
+
+        try:
+            with cancellation_scope(None), deadline_scope(None):
+                results = self._process([p.item for p in batch])
+            if len(results) != len(batch):
+                raise ValueError(
+                    f"{self.name}: {len(results)} results for "
+                    f"{len(batch)} items"
+                )
+            for pending, result in zip(batch, results, strict=True):
+                pending.future.set_result(result)
+        except BaseException as e:
+            with self._condition:
+                self._stats.failures += 1
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            with self._condition:
+                self._stats.batches += 1
+                self._stats.items += len(batch)
+                self._stats.max_size = max(self._stats.max_size, len(batch))
+                self._stats.wait_total_s += waited
+                self._condition.notify_all()
+        logger.debug("📦 %s: batch of %d items", self.name, len(batch))
+
+    def stats(self) -> dict[str, Any]:
+        """Return the counters of this batcher."""
+        with self._condition:
+            stats = self._stats
+            return {
+                "max_batch": self.max_batch,
+                "max_wait_ms": round(self.max_wait_s * 1000, 1),
+                "batches": stats.batches,
+                "items": stats.items,
+                "avg_size": round(stats.items / max(stats.batches, 1), 2),
+                "max_size": stats.max_size,
+                "failures": stats.failures,
+                "abandoned": stats.abandoned,
+                "avg_leader_wait_ms": round(
+                    stats.wait_total_s * 1000 / max(stats.batches, 1), 2
+                ),
+                "queued": len(self._queue),
+            }
+
+    @classmethod
+    def metrics(cls) -> dict[str, Any]:
+        """Return the counters of every batcher by name."""
+        with cls._registry_lock:
+            instances = dict(cls._instances)
+        return {name: b.stats() for name, b in instances.items()}
@@ -0,0 +1,412 @@
+"""
+File: resilience.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+from dataclasses import asdict, dataclass, field
+import os
+import random
+from threading import BoundedSemaphore, Event, Lock, Timer
+import time
+from typing import Any, ClassVar, TypeVar
+
+from src.models.scheduler import SchedulerQueueFullError, SchedulerTimeoutError
+from src.utils.cancellation import (
+    CancelToken,
+    RequestCancelledError,
+    cancellation_scope,
+    get_cancel_token,
+)
+from src.utils.deadline import DeadlineExceededError, remaining
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Errors that a second attempt cannot fix (or that would amplify overload)
+NON_RETRYABLE_ERRORS: tuple[type[BaseException], ...] = (
+    ValueError,
+    TypeError,
+    KeyError,
+    SchedulerQueueFullError,
+    SchedulerTimeoutError,
+    DeadlineExceededError,
+)
+
+
+def _env_bool(name: str, default: str = "false") -> bool:
+    return os.getenv(name, default).lower() == "true"
+
+
+@dataclass
+class ResiliencePolicy:
+    """Hedging and retry settings (read from the environment)."""
+
+    hedge_enabled: bool = False
+    hedge_percentile: float = 0.95
+    hedge_min_delay: float = 0.5
+    hedge_min_samples: int = 20
+    max_retries: int = 2
+    retry_base_delay: float = 0.5
+    retry_max_delay: float = 8.0
+    budget_ratio: float = 0.1
+    budget_min_tokens: float = 10.0
+
+    @classmethod
+    def from_env(cls) -> ResiliencePolicy:
+        """Build the policy from LLM_HEDGE_* and LLM_RETRY_* variables."""
+        return cls(
+            hedge_enabled=_env_bool("LLM_HEDGE_ENABLED"),
+            hedge_percentile=float(os.getenv("LLM_HEDGE_PERCENTILE", "0.95")),
+            hedge_min_delay=float(os.getenv("LLM_HEDGE_MIN_DELAY", "0.5")),
+            max_retries=int(os.getenv("LLM_RETRY_MAX", "2")),
+            retry_base_delay=float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5")),
+            budget_ratio=float(os.getenv("LLM_RETRY_BUDGET_RATIO", "0.1")),
+            budget_min_tokens=float(
+                os.getenv("LLM_RETRY_BUDGET_MIN_TOKENS", "10")
+            ),
+        )
+
+
+class RetryBudget:
+    """Global budget limiting retries and hedges to a share of traffic.
+
+    Every first attempt deposits ``ratio`` tokens and every retry or hedge
+    withdraws one, so extra attempts stay around ``ratio`` of the calls
+    (plus a small reserve) even when the provider is failing everywhere.
+    """
+
+    def __init__(self, ratio: float, min_tokens: float):
+        """Initialize a budget holding its reserve."""
+        self.ratio = ratio
+        self.max_tokens = max(min_tokens, 1.0) * 10
+        self.tokens = min_tokens
+        self._lock = Lock()
+
+    def deposit(self) -> None:
+        """Credit a first attempt."""
+        with self._lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        """Take one token for an extra attempt; False if exhausted."""
+        with self._lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+class _Race:
+    """Outcome of a hedged call: the first successful attempt wins."""
+
+    def __init__(self, parent: CancelToken | None):
+        self.lock = Lock()
+        self.primary_token = CancelToken(parent)
+        self.hedge_token: CancelToken | None = None
+        self.settled = False
+        self.winner: str | None = None
+        self.result: Any = None
+        self.hedge_done = Event()
+        self.hedge_error: BaseException | None = None
+
+    def win(self, attempt: str, result: Any) -> bool:
+        """Record ``result`` if no attempt won yet; True if it did win."""
+        with self.lock:
+            self.settled = True
+            if self.winner is not None:
+                return False
+            self.winner, self.result = attempt, result
+        # Stop the other attempt at its next cancellation check
+        loser = self.hedge_token if attempt == "primary" else self.primary_token
+        if loser is not None:
+            loser.cancel(f"hedged call won by the {attempt}")
+        return True
+
+
+@dataclass
+class _NodeStats:
+    calls: int = 0
+    failures: int = 0
+    retries: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    hedges_skipped: int = 0
+    budget_exhausted: int = 0
+    latencies: deque[float] = field(
+        default_factory=lambda: deque(maxlen=256), repr=False
+    )
+
+
+class Resilience:
+    """Hedged, retried provider calls with per-node counters."""
+
+    _policy: ClassVar[ResiliencePolicy | None] = None
+    _budget: ClassVar[RetryBudget | None] = None
+    _stats: ClassVar[dict[str, _NodeStats]] = {}
+    _lock: ClassVar[Lock] = Lock()
+    _executor: ClassVar[ThreadPoolExecutor | None] = None
+    _hedge_slots: ClassVar[BoundedSemaphore | None] = None
+
+    @classmethod
+    def policy(cls) -> ResiliencePolicy:
+        """Return the active policy (loaded once from the environment)."""
+        if cls._policy is None:
+            cls.configure(ResiliencePolicy.from_env())
+        return cls._policy
+
+    @classmethod
+    def configure(cls, policy: ResiliencePolicy) -> None:
+        """Replace the policy and reset the retry budget."""
+        with cls._lock:
+            cls._policy = policy
+            cls._budget = RetryBudget(
+                policy.budget_ratio, policy.budget_min_tokens
+            )
+
+    @classmethod
+    def _node(cls, name: str) -> _NodeStats:
+        with cls._lock:
+            return cls._stats.setdefault(name, _NodeStats())
+
+    @classmethod
+    def _pool(cls) -> tuple[ThreadPoolExecutor, BoundedSemaphore]:
+        with cls._lock:
+            if cls._executor is None:
+                workers = int(os.getenv("LLM_HEDGE_WORKERS", "32"))
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="llm-hedge"
+                )
+                cls._hedge_slots = BoundedSemaphore(workers)
+            return cls._executor, cls._hedge_slots
+
+    @classmethod
+    def hedging(cls, hedge: bool | None = None) -> bool:
+        """Whether a call with this ``hedge`` setting is hedged."""
+        return cls.policy().hedge_enabled if hedge is None else hedge
+
+    @classmethod
+    def hedge_delay(cls, name: str) -> float:
+        """Latency percentile after which a hedge is sent for ``name``."""
+        policy = cls.policy()
+        stats = cls._node(name)
+        with cls._lock:
+            samples = sorted(stats.latencies)
+        if len(samples) < policy.hedge_min_samples:
+            return max(policy.hedge_min_delay, 0.0)
+        index = int(policy.hedge_percentile * (len(samples) - 1))
+        return max(samples[index], policy.hedge_min_delay)
+
+    @classmethod
+    def call(
+        cls, name: str, func: Callable[[], T], hedge: bool | None = None
+    ) -> T:
+        """
+        Call ``func`` with jittered retries and optional hedging.
+
+        Args:
+            name: Node or agent name used for latency and counters.
+            func: The provider call (no arguments).
+            hedge: Force hedging on/off (default: LLM_HEDGE_ENABLED).
+
+        Returns:
+            T: The result of the first successful attempt.
+        """
+        policy = cls.policy()
+        budget = cls._budget
+        stats = cls._node(name)
+        hedge = cls.hedging(hedge)
+        with cls._lock:
+            stats.calls += 1
+        budget.deposit()
+
+        attempt = 0
+        while True:
+            try:
+                if hedge:
+                    return cls._hedged(name, func, stats, budget)
+                return cls._timed(func, stats)
+            except NON_RETRYABLE_ERRORS:
+                raise
+            except Exception as e:
+                with cls._lock:
+                    stats.failures += 1
+                if attempt >= policy.max_retries:
+                    raise
+                if not budget.try_withdraw():
+                    with cls._lock:
+                        stats.budget_exhausted += 1
+                    logger.warning("🔁 %s: retry budget exhausted", name)
+                    raise
+                attempt += 1
+                with cls._lock:
+                    stats.retries += 1
+                # Full jitter exponential backoff
+                delay = random.uniform(
+                    0,
+                    min(
+                        policy.retry_max_delay,
+                        policy.retry_base_delay * 2 ** (attempt - 1),
+                    ),
+                )
+                left = remaining()
+                if left is not None and left <= delay:
+                    # Not worth retrying past the request deadline
+                    raise
+                logger.warning(
+                    "🔁 %s: attempt %d failed (%s), retrying in %.2fs",
+                    name,
+                    attempt,
+                    e,
+                    delay,
+                )
+                token = get_cancel_token()
+                if token is None:
+                    time.sleep(delay)
+                else:
+                    # Backoff sleep ends early when the client goes away
+                    token.wait(delay)
+                    token.raise_if_cancelled()
+
+    @classmethod
+    def _timed(cls, func: Callable[[], T], stats: _NodeStats) -> T:
+        start = time.perf_counter()
+        result = func()
+        with cls._lock:
+            stats.latencies.append(time.perf_counter() - start)
+        return result
+
+    @classmethod
+    def _hedged(
+        cls,
+        name: str,
+        func: Callable[[], T],
+        stats: _NodeStats,
+        budget: RetryBudget,
+    ) -> T:
+        """Send a duplicate if the primary is slower than the percentile.
+
+        The primary runs on the caller's thread; only the hedge uses the
+        pool, and only when a worker is free (hedges never queue). Each
+        attempt runs under its own cancel token linked to the request's,
+        and the first success cancels the other one, which stops at its
+        next cancellation check (a streamed call closes its response).
+        """
+        delay = cls.hedge_delay(name)
+        left = remaining()
+        if left is not None and left <= delay:
+            # A hedge could not answer before the deadline anyway
+            return cls._timed(func, stats)
+
+        parent = get_cancel_token()
+        race = _Race(parent)
+        # Copy the context so scheduler priority follows the hedge
+        context = contextvars.copy_context()
+        timer = Timer(
+            delay,
+            cls._start_hedge,
+            (name, func, stats, budget, race, parent, context),
+        )
+        timer.daemon = True
+        timer.start()
+        try:
+            with cancellation_scope(race.primary_token):
+                result = cls._timed(func, stats)
+        except RequestCancelledError:
+            timer.cancel()
+            if race.winner != "hedge":
+                # The request itself was cancelled
+                raise
+            return race.result
+        except Exception:
+            with race.lock:
+                race.settled = True
+                started = race.hedge_token is not None
+            timer.cancel()
+            if started:
+                # The hedge may still answer
+                race.hedge_done.wait()
+                if race.winner == "hedge":
+                    return race.result
+            raise
+        timer.cancel()
+        if not race.win("primary", result) and race.winner == "hedge":
+            # Both answered; the hedge was first
+            return race.result
+        return result
+
+    @classmethod
+    def _start_hedge(
+        cls,
+        name: str,
+        func: Callable[[], T],
+        stats: _NodeStats,
+        budget: RetryBudget,
+        race: _Race,
+        parent: CancelToken | None,
+        context: contextvars.Context,
+    ) -> None:
+        """Timer callback: run the hedge on the pool if it is still needed."""
+        if parent is not None and parent.cancelled:
+            # Nobody is waiting for this answer: do not duplicate it
+            return
+        pool, slots = cls._pool()
+        if not slots.acquire(blocking=False):
+            with cls._lock:
+                stats.hedges_skipped += 1
+            return
+        with race.lock:
+            if race.settled:
+                slots.release()
+                return
+            if not budget.try_withdraw():
+                slots.release()
+                with cls._lock:
+                    stats.budget_exhausted += 1
+                return
+            race.hedge_token = CancelToken(parent)
+        with cls._lock:
+            stats.hedges += 1
+        logger.debug("🏁 %s: primary slow, sending hedge", name)
+
+        def run() -> None:
+            try:
+                with cancellation_scope(race.hedge_token):
+                    result = cls._timed(func, stats)
+                if race.win("hedge", result):
+                    with cls._lock:
+                        stats.hedge_wins += 1
+            except BaseException as e:
+                race.hedge_error = e
+            finally:
+                race.hedge_done.set()
+                slots.release()
+
+        pool.submit(context.run, run)
+
+    @classmethod
+    def metrics(cls) -> dict[str, Any]:
+        """Return per-node hedge/retry counters and the budget level."""
+        with cls._lock:
+            nodes = {
+                name: {
+                    k: v for k, v in asdict(stats).items() if k != "latencies"
+                }
+                for name, stats in cls._stats.items()
+            }
+            budget = cls._budget
+        return {
+            "retry_budget_tokens": round(budget.tokens, 2) if budget else None,
+            "nodes": nodes,
+        }
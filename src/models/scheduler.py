@@ -0,0 +1,348 @@
+"""
+File: scheduler.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Generator, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import heapq
+import itertools
+import os
+from threading import Condition
+import time
+from typing import Any, ClassVar
+
+from langchain_core.messages import BaseMessage
+
+from src.utils.cancellation import get_cancel_token
+from src.utils.deadline import remaining
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Lower rank is served first
+PRIORITY_CLASSES: dict[str, int] = {"interactive": 0, "batch": 1}
+
+
+class SchedulerQueueFullError(RuntimeError):
+    """Raised when the wait queue of a model is at its bounded depth."""
+
+
+class SchedulerTimeoutError(TimeoutError):
+    """Raised when a call waited longer than the maximum queue wait."""
+
+
+@dataclass
+class CallContext:
+    """Scheduling context of a request (shared by all its model calls)."""
+
+    priority: str = "interactive"
+    # Set once the first call of the conversation was admitted; follow-up
+    # calls (tool loops, delegated agents) jump ahead of new conversations
+    started: bool = False
+
+
+_call_context: ContextVar[CallContext | None] = ContextVar(
+    "llm_call_context", default=None
+)
+
+
+def run_with_priority(
+    priority: str, func: Callable[..., Any], *args: Any, **kwargs: Any
+) -> Any:
+    """
+    Run a function with a fresh scheduling context.
+
+    Use it around a graph execution so every model call it makes (including
+    the ones in worker threads that copy the context) shares the priority.
+    """
+    token = _call_context.set(CallContext(priority=priority))
+    try:
+        return func(*args, **kwargs)
+    finally:
+        _call_context.reset(token)
+
+
+def estimate_tokens(messages: list[BaseMessage]) -> int:
+    """Cheap token estimate (~4 characters per token)."""
+    chars = sum(len(str(m.content)) for m in messages)
+    return max(1, chars // 4)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``per_minute`` tokens/min.
+
+    A non-positive limit disables the bucket. The level may go negative
+    when actual usage exceeds the estimate; later calls then wait longer.
+    """
+
+    def __init__(self, per_minute: float):
+        """Initialize a full bucket."""
+        self.capacity = float(per_minute)
+        self.level = self.capacity
+        self._rate = self.capacity / 60.0
+        self._updated = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the bucket limits anything."""
+        return self.capacity > 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(
+            self.capacity, self.level + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` can be consumed (0 if now)."""
+        if not self.enabled:
+            return 0.0
+        self._refill()
+        # Requests larger than the bucket only need a full bucket
+        needed = min(amount, self.capacity) - self.level
+        return max(0.0, needed / self._rate)
+
+    def consume(self, amount: float) -> None:
+        """Take ``amount`` tokens (may go negative)."""
+        if self.enabled:
+            self._refill()
+            self.level -= amount
+
+
+@dataclass(order=True)
+class _Waiter:
+    sort_key: tuple[int, int, int]
+    tokens: int = field(compare=False)
+
+
+@dataclass
+class _ModelQueue:
+    requests: TokenBucket
+    tokens: TokenBucket
+    waiters: list[_Waiter] = field(default_factory=list)
+    admitted: int = 0
+    rejected: int = 0
+    timed_out: int = 0
+    cancelled: int = 0
+    wait_total_s: float = 0.0
+    wait_max_s: float = 0.0
+    recent_waits: deque[float] = field(
+        default_factory=lambda: deque(maxlen=512)
+    )
+
+
+class CallSlot:
+    """An admitted model call; reports actual token usage back."""
+
+    def __init__(self, queue: _ModelQueue | None, estimated_tokens: int):
+        """Initialize the slot."""
+        self._queue = queue
+        self._estimated = estimated_tokens
+
+    def settle(self, usage: dict[str, Any] | None) -> None:
+        """Correct the token bucket with the provider usage metadata."""
+        if self._queue is None or not usage:
+            return
+        actual = usage.get("total_tokens")
+        if not actual:
+            return
+        with LLMScheduler._condition:
+            self._queue.tokens.consume(actual - self._estimated)
+
+
+def _parse_limits(spec: str | None) -> dict[str, tuple[float, float]]:
+    """Parse ``model=rpm:tpm,model=rpm:tpm``."""
+    limits: dict[str, tuple[float, float]] = {}
+    for item in (spec or "").split(","):
+        model, _, values = item.partition("=")
+        if not model.strip() or not values:
+            continue
+        rpm, _, tpm = values.partition(":")
+        try:
+            limits[model.strip()] = (float(rpm or 0), float(tpm or 0))
+        except ValueError:
+            logger.warning("Invalid LLM_RATE_LIMITS entry: %s", item)
+    return limits
+
+
+class LLMScheduler:
+    """Process-wide scheduler in front of every provider call.
+
+    Each model has request and token buckets and a priority queue of
+    waiting calls: interactive before batch, and calls of a conversation
+    already in progress before the first call of a new one (FIFO within a
+    class). The queue depth is bounded; a full queue rejects immediately.
+    """
+
+    _queues: ClassVar[dict[str, _ModelQueue]] = {}
+    _condition: ClassVar[Condition] = Condition()
+    _sequence: ClassVar[Iterator[int]] = itertools.count()
+    _limits: ClassVar[dict[str, tuple[float, float]] | None] = None
+
+    @classmethod
+    def _limits_for(cls, model: str) -> tuple[float, float]:
+        if cls._limits is None:
+            cls._limits = _parse_limits(os.getenv("LLM_RATE_LIMITS"))
+        default = (
+            float(os.getenv("LLM_RPM", "0")),
+            float(os.getenv("LLM_TPM", "0")),
+        )
+        return cls._limits.get(model, default)
+
+    @classmethod
+    def _queue(cls, model: str) -> _ModelQueue:
+        queue = cls._queues.get(model)
+        if queue is None:
+            rpm, tpm = cls._limits_for(model)
+            queue = _ModelQueue(TokenBucket(rpm), TokenBucket(tpm))
+            cls._queues[model] = queue
+        return queue
+
+    @classmethod
+    @contextmanager
+    def slot(
+        cls, model: str, estimated_tokens: int = 1
+    ) -> Generator[CallSlot, None, None]:
+        """
+        Wait for a slot to call ``model`` and hold it during the call.
+
+        Args:
+            model: The provider model name (limits are per model).
+            estimated_tokens: Token estimate debited before the call.
+
+        Raises:
+            SchedulerQueueFullError: The wait queue is full.
+            SchedulerTimeoutError: The call waited more than the maximum.
+            RequestCancelledError: The request was cancelled while waiting.
+        """
+        context = _call_context.get() or CallContext()
+        rank = PRIORITY_CLASSES.get(context.priority, 0)
+        max_depth = int(os.getenv("LLM_QUEUE_DEPTH", "100"))
+        max_wait = float(os.getenv("LLM_MAX_QUEUE_WAIT", "30"))
+        # Never queue past the request deadline
+        left = remaining()
+        if left is not None:
+            if left <= 0:
+                raise SchedulerTimeoutError("Request deadline exceeded")
+            max_wait = min(max_wait, left)
+
+        with cls._condition:
+            queue = cls._queue(model)
+            if not (queue.requests.enabled or queue.tokens.enabled):
+                # Unlimited model: no queueing, only counters
+                queue.admitted += 1
+                queue.recent_waits.append(0.0)
+                context.started = True
+                admitted: _ModelQueue | None = None
+            else:
+                admitted = cls._wait_for_turn(
+                    queue, context, rank, estimated_tokens, max_depth, max_wait
+                )
+        yield CallSlot(admitted, estimated_tokens)
+
+    @classmethod
+    def _wait_for_turn(
+        cls,
+        queue: _ModelQueue,
+        context: CallContext,
+        rank: int,
+        tokens: int,
+        max_depth: int,
+        max_wait: float,
+    ) -> _ModelQueue:
+        """Block (holding the condition) until the waiter is admitted."""
+        if len(queue.waiters) >= max_depth:
+            queue.rejected += 1
+            raise SchedulerQueueFullError(
+                f"LLM queue full ({len(queue.waiters)} waiting)"
+            )
+        waiter = _Waiter(
+            (rank, 0 if context.started else 1, next(cls._sequence)), tokens
+        )
+        heapq.heappush(queue.waiters, waiter)
+        start = time.monotonic()
+        token = get_cancel_token()
+        try:
+            while True:
+                if token is not None and token.cancelled:
+                    # The client left: give the turn to someone else
+                    queue.cancelled += 1
+                    token.raise_if_cancelled()
+                if queue.waiters[0] is waiter:
+                    delay = max(
+                        queue.requests.wait_time(1),
+                        queue.tokens.wait_time(tokens),
+                    )
+                    if delay == 0:
+                        break
+                else:
+                    delay = 0.05
+                remaining = max_wait - (time.monotonic() - start)
+                if remaining <= 0:
+                    queue.timed_out += 1
+                    raise SchedulerTimeoutError(
+                        f"LLM call waited more than {max_wait}s"
+                    )
+                if token is not None:
+                    # Wake up regularly to notice a cancellation
+                    delay = min(delay, 0.25)
+                cls._condition.wait(timeout=min(delay, remaining))
+        except BaseException:
+            queue.waiters.remove(waiter)
+            heapq.heapify(queue.waiters)
+            cls._condition.notify_all()
+            raise
+
+        heapq.heappop(queue.waiters)
+        queue.requests.consume(1)
+        queue.tokens.consume(tokens)
+        waited = time.monotonic() - start
+        queue.admitted += 1
+        queue.wait_total_s += waited
+        queue.wait_max_s = max(queue.wait_max_s, waited)
+        queue.recent_waits.append(waited)
+        context.started = True
+        cls._condition.notify_all()
+        return queue
+
+    @classmethod
+    def metrics(cls) -> dict[str, Any]:
+        """Return queue depth and wait time metrics per model."""
+        with cls._condition:
+            result = {}
+            for model, queue in cls._queues.items():
+                waits = sorted(queue.recent_waits)
+                p95 = waits[int(0.95 * (len(waits) - 1))] if waits else 0.0
+                result[model] = {
+                    "depth": len(queue.waiters),
+                    "admitted": queue.admitted,
+                    "rejected": queue.rejected,
+                    "timed_out": queue.timed_out,
+                    "cancelled": queue.cancelled,
+                    "wait_avg_s": round(
+                        queue.wait_total_s / max(queue.admitted, 1), 4
+                    ),
+                    "wait_p95_s": round(p95, 4),
+                    "wait_max_s": round(queue.wait_max_s, 4),
+                    "rpm_limit": queue.requests.capacity,
+                    "tpm_limit": queue.tokens.capacity,
+                }
+            return result
+
+    @classmethod
+    def reset(cls) -> None:
+        """Drop all queues and re-read limits from the environment."""
+        with cls._condition:
+            cls._queues.clear()
+            cls._limits = None
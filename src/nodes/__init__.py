@@ -9,9 +9,13 @@ MIT License
 from .reasoning_node import ReasoningNode
 from .output_guard_rail import OutputGuardRail
 from .input_guard_rail import InputGuardRail
+from .agent_branch import AgentBranch
+from .planner_node import PlannerNode
 
 __all__ = [
     "ReasoningNode",
     "OutputGuardRail",
     "InputGuardRail",
+    "AgentBranch",
+    "PlannerNode",
 ]
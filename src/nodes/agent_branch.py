@@ -0,0 +1,195 @@
+"""
+File: agent_branch.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import os
+import random
+from threading import Lock
+import time
+from typing import Any, ClassVar, TypedDict
+
+from langchain_core.runnables import RunnableConfig
+
+from src.nodes.base._node import Node
+from src.services.agent_registry import AgentRegistry
+from src.services.remote_agent import RemoteAgentError
+from src.utils.cancellation import get_cancel_token
+from src.utils.deadline import remaining
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AgentCall(TypedDict):
+    """Payload sent to an agent branch (one deferred ``invoke_agent``)."""
+
+    agent_name: str
+    query: str
+    tool_call_id: str
+
+
+@dataclass
+class _BranchStats:
+    calls: int = 0
+    failures: int = 0
+    retries: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+
+class AgentBranch(Node):
+    """Graph node running one delegated agent call of a fan-out round.
+
+    ReasoningNode sends each ``invoke_agent`` call of a model turn to the
+    node of its agent; the branches of a round run concurrently in the
+    same graph step and their answers are merged into ``agent_results``
+    before reasoning resumes. Failed remote calls are retried with jittered
+    backoff (GRAPH_AGENT_RETRIES) while the request deadline allows; any
+    other error answers the call as unavailable instead of failing the run.
+    """
+
+    _stats: ClassVar[dict[str, _BranchStats]] = {}
+    _rounds: ClassVar[int] = 0
+    _in_flight: ClassVar[int] = 0
+    _peak_in_flight: ClassVar[int] = 0
+    _lock: ClassVar[Lock] = Lock()
+
+    def __init__(self, name: str = "agent_branch"):
+        """
+        Initialize an agent branch node.
+
+        Args:
+            name: The graph node name.
+        """
+        super().__init__(
+            name=name,
+            description="Runs a delegated agent call of a fan-out round.",
+            routing_options={},
+        )
+
+    @classmethod
+    def record_round(cls) -> None:
+        """Count a fan-out round dispatched by the reasoning node."""
+        with cls._lock:
+            cls._rounds += 1
+
+    def execute(
+        self, state: AgentCall, config: RunnableConfig, *args, **kwargs
+    ) -> dict:
+        """
+        Invoke the agent of the call and record its answer.
+
+        Args:
+            state: The call sent by the reasoning node.
+            config: Runnable configuration
+
+        Returns:
+            dict: Update appending the answer to ``agent_results``.
+        """
+        agent_name = state["agent_name"]
+        retries = int(os.getenv("GRAPH_AGENT_RETRIES", "1"))
+        base_delay = float(os.getenv("GRAPH_AGENT_RETRY_DELAY", "0.5"))
+        with AgentBranch._lock:
+            stats = AgentBranch._stats.setdefault(agent_name, _BranchStats())
+            AgentBranch._in_flight += 1
+            AgentBranch._peak_in_flight = max(
+                AgentBranch._peak_in_flight, AgentBranch._in_flight
+            )
+        start = time.perf_counter()
+        attempt = 0
+        try:
+            while True:
+                attempt += 1
+                try:
+                    content = AgentRegistry.invoke(
+                        agent_name, state["query"], config, raise_errors=True
+                    )
+                    ok = True
+                    break
+                except RemoteAgentError as e:
+                    # Full jitter exponential backoff
+                    delay = random.uniform(0, base_delay * 2 ** (attempt - 1))
+                    left = remaining(config)
+                    out_of_time = left is not None and left <= delay
+                    if attempt > retries or out_of_time:
+                        content = f"Agente '{agent_name}' indisponível: {e}"
+                        ok = False
+                        break
+                    with AgentBranch._lock:
+                        stats.retries += 1
+                    logger.warning(
+                        "🔀 %s: attempt %d failed (%s), retrying in %.2fs",
+                        agent_name,
+                        attempt,
+                        e,
+                        delay,
+                    )
+                    token = get_cancel_token(config)
+                    if token is None:
+                        time.sleep(delay)
+                    else:
+                        token.wait(delay)
+                        token.raise_if_cancelled()
+                except Exception as e:
+                    # Local model or factory errors are not retried
+                    logger.warning("🔀 %s: agent failed (%s)", agent_name, e)
+                    content = f"Agente '{agent_name}' indisponível: {e}"
+                    ok = False
+                    break
+        finally:
+            with AgentBranch._lock:
+                AgentBranch._in_flight -= 1
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with AgentBranch._lock:
+            stats.calls += 1
+            stats.failures += int(not ok)
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+        logger.info(
+            "🔀 AgentBranch %s: %.0f ms, %d attempt(s)",
+            agent_name,
+            elapsed_ms,
+            attempt,
+        )
+        return {
+            "agent_results": [
+                {
+                    "tool_call_id": state["tool_call_id"],
+                    "agent_name": agent_name,
+                    "content": content,
+                    "ok": ok,
+                    "attempts": attempt,
+                    "elapsed_ms": round(elapsed_ms, 1),
+                }
+            ]
+        }
+
+    @classmethod
+    def metrics(cls) -> dict[str, Any]:
+        """Return fan-out rounds and per-agent branch counters."""
+        with cls._lock:
+            return {
+                "rounds": cls._rounds,
+                "in_flight": cls._in_flight,
+                "peak_in_flight": cls._peak_in_flight,
+                "agents": {
+                    name: {
+                        "calls": s.calls,
+                        "failures": s.failures,
+                        "retries": s.retries,
+                        "avg_ms": round(s.total_ms / s.calls, 1)
+                        if s.calls
+                        else 0.0,
+                        "max_ms": round(s.max_ms, 1),
+                    }
+                    for name, s in cls._stats.items()
+                },
+            }
@@ -12,6 +12,13 @@ from abc import abstractmethod
 from langchain_core.runnables import RunnableConfig
 from langgraph.types import Command
 
+from src.utils.cancellation import (
+    cancellation_scope,
+    get_cancel_token,
+    raise_if_cancelled,
+)
+from src.utils.deadline import deadline_scope, get_deadline
+
 
 class Node:
     """
@@ -52,4 +59,12 @@ class Node:
             state: The current state dictionary
             config: Runnable configuration
         """
-        return self.execute(state, config, *args, **kwargs)
+        # Do not start a node for a client that is gone
+        raise_if_cancelled(config)
+        # Model calls made by the node (and its tools) see the deadline
+        # and the cancellation token of the request
+        with (
+            deadline_scope(get_deadline(config)),
+            cancellation_scope(get_cancel_token(config)),
+        ):
+            return self.execute(state, config, *args, **kwargs)
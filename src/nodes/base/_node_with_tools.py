@@ -7,12 +7,14 @@ Author: Klaus
 MIT License
 """
 
+from collections.abc import Collection
+
 from langchain_core.messages import BaseMessage, HumanMessage
 from langchain_core.runnables import RunnableConfig
 
 from src.models.base._chat_model import ChatModel
 from src.utils.logger import get_logger
-from src.utils.stream import stream_if_available
+from src.utils.stream import get_stream_callback, stream_if_available
 
 from ._node import Node
 
@@ -57,29 +59,52 @@ class NodeWithTools(Node):
         return None
 
     def run_model_with_optional_tools(
-        self, messages: list, config: RunnableConfig | None = None
-    ) -> tuple[list, str | None]:
-        """Delegate to model.invoke_with_tools with unified behavior."""
+        self,
+        messages: list,
+        config: RunnableConfig | None = None,
+        stream_tokens: bool = False,
+        defer: Collection[str] = (),
+        max_tool_iters: int | None = None,
+    ) -> tuple[list, str | None, bool]:
+        """Delegate to model.invoke_with_tools with unified behavior.
+
+        Request state (stream callback, deadline, cancellation) comes from
+        the config, so a single compiled graph can serve concurrent
+        requests. Tools and delegated agents receive the same config. With
+        ``stream_tokens``, the model turns are streamed and tool calls sent
+        as ``tool_call`` events as soon as the model names them. The answer
+        text is not streamed: it reaches the client only once the output
+        guard rail has validated it. Calls to the tools in
+        ``defer`` are left unanswered for the node to dispatch. Returns
+        the messages, an optional error and whether the tool loop stopped
+        with a partial answer (request deadline).
+        """
         try:
-            # Get stream_callback from state
-            stream_callback = None
-            if hasattr(self, "_current_state"):
-                stream_callback = self._current_state.get("stream_callback")
+            stream_callback = get_stream_callback(config)
             stream_if_available(
                 stream_callback,
                 "Executando análise com ferramentas...",
                 type="reasoning",
             )
 
+            on_tool_call = None
+            if stream_tokens and stream_callback is not None:
+
+                def on_tool_call(name: str) -> None:
+                    stream_if_available(stream_callback, name, type="tool_call")
+
             typed_messages: list[BaseMessage] = messages
-            messages, _final_text, error = self.model.invoke_with_tools(
-                typed_messages, config=config
+            messages, _, error, partial = self.model.invoke_with_tools(
+                typed_messages,
+                max_tool_iters=max_tool_iters,
+                config=config,
+                on_tool_call=on_tool_call,
+                defer=defer,
             )
-            # Keep signature compatibility: propagate error only
-            return messages, error
+            return messages, error, partial
         except Exception as e:
             logger.error(f"Error running model with tools: {e}")
-            return messages, f"Error during model execution: {e!s}"
+            return messages, f"Error during model execution: {e!s}", False
 
     # Make execute abstract again; concrete nodes must implement it
     def execute(self, state: dict, config: RunnableConfig, *args, **kwargs):
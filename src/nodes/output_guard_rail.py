@@ -15,7 +15,7 @@ from src.data_models.graph_state import CarSystemState
 from src.models.base._chat_model import ChatModel
 from src.nodes.base._node import Node
 from src.utils.logger import get_logger
-from src.utils.stream import stream_if_available
+from src.utils.stream import get_stream_callback, stream_if_available
 
 logger = get_logger(__name__)
 
@@ -56,8 +56,7 @@ class OutputGuardRail(Node):
         """
         logger.info("OutputGuardRail: Starting execution")
 
-        # Get stream_callback from state
-        stream_callback = state.get("stream_callback")
+        stream_callback = get_stream_callback(config)
         stream_if_available(
             stream_callback,
             "Processando recomendações...",
@@ -102,7 +101,7 @@ class OutputGuardRail(Node):
             )
 
         return self._process_recommendations(
-            analysis_result, recommendations, state
+            analysis_result, recommendations, stream_callback
         )
 
     def _process_error(
@@ -150,7 +149,6 @@ class OutputGuardRail(Node):
                     "messages": [AIMessage(content=user_message)],
                     "error_message": None,
                     "processing_status": "error_processed",
-                    "stream_callback": None,  # Clear stream_callback
                 },
                 goto=self.routing_options.get("end", "END"),
             )
@@ -170,7 +168,6 @@ class OutputGuardRail(Node):
                     ],
                     "error_message": None,
                     "processing_status": "error_processing_failed",
-                    "stream_callback": None,  # Clear stream_callback
                 },
                 goto=self.routing_options.get("end", "END"),
             )
@@ -179,7 +176,7 @@ class OutputGuardRail(Node):
         self,
         analysis_result: dict,
         recommendations: list,
-        state: CarSystemState,
+        stream_callback=None,
     ) -> Command:
         """Process and validate recommendations for safety."""
         logger.info("Validating recommendations for safety")
@@ -188,9 +185,6 @@ class OutputGuardRail(Node):
             # Get the original user message
             recommendation_text = recommendations[0] if recommendations else ""
 
-            # Get stream_callback from state
-            stream_callback = state.get("stream_callback")
-
             # Create messages for the model
             messages_for_model = [HumanMessage(content=recommendation_text)]
 
@@ -207,7 +201,7 @@ class OutputGuardRail(Node):
                 )
 
             logger.info("Recommendations processed and validated")
-            logger.info(f"Final message length: {len(final_message)} chars")
+            logger.info("Final message length: %d chars", len(final_message))
 
             return Command(
                 update={
@@ -215,7 +209,6 @@ class OutputGuardRail(Node):
                         AIMessage(content=final_message),
                     ],
                     "processing_status": "completed_successfully",
-                    "stream_callback": None,  # Clear stream_callback
                 },
                 goto=self.routing_options.get("end", "END"),
             )
@@ -234,7 +227,6 @@ class OutputGuardRail(Node):
                         ),
                     ],
                     "processing_status": "completed_with_fallback",
-                    "stream_callback": None,  # Clear stream_callback
                 },
                 goto=self.routing_options.get("end", "END"),
             )
@@ -0,0 +1,83 @@
+"""
+File: planner_node.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.types import Command
+
+from src.nodes.base._node import Node
+from src.services.intent_planner import IntentPlanner
+from src.utils.logger import get_logger
+from src.utils.stream import get_stream_callback, stream_if_available
+from src.utils.vehicle import get_vehicle_id
+
+logger = get_logger(__name__)
+
+
+class PlannerNode(Node):
+    """Answer common intents with a deterministic plan before reasoning.
+
+    Queries recognised by IntentPlanner go straight to the output guard
+    rail with the planned answer; the others continue to the reasoning
+    node unchanged.
+    """
+
+    def __init__(self, routing_options: dict[str, str]):
+        """
+        Initialize the planner node.
+
+        Args:
+            routing_options: ``next_node`` receives the planned answers and
+                ``fallback`` the queries the planner does not handle.
+        """
+        super().__init__(
+            name="PlannerNode",
+            description="Answers common intents without the reasoning model.",
+            routing_options=routing_options,
+        )
+        logger.info("PlannerNode: Initialized")
+
+    def execute(
+        self, state: dict, config: RunnableConfig, *args, **kwargs
+    ) -> Command:
+        """Run the plan of the query's intent, or fall back to reasoning."""
+        messages = state.get("messages", [])
+        query = next(
+            (m for m in reversed(messages) if isinstance(m, HumanMessage)),
+            None,
+        )
+        planned = (
+            IntentPlanner.plan(str(query.content), get_vehicle_id(config))
+            if query
+            else None
+        )
+        if planned is None:
+            return Command(goto=self.routing_options["fallback"])
+
+        intent, answer = planned
+        stream_if_available(
+            get_stream_callback(config),
+            f"Plano direto: {intent.name}",
+            type="reasoning",
+        )
+        return Command(
+            update={
+                "messages": [*messages, AIMessage(content=answer)],
+                "analysis_result": {
+                    "input": query.content,
+                    "analysis": answer,
+                    "node": self.name,
+                    "intent": intent.name,
+                },
+                "recommendations": [answer],
+                "processing_status": "analysis_completed",
+                "error_message": None,
+            },
+            goto=self.routing_options["next_node"],
+        )
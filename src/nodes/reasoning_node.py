@@ -7,20 +7,53 @@ Author: Klaus
 MIT License
 """
 
-from langchain_core.messages import AIMessage
+import os
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
 from langchain_core.runnables import RunnableConfig
-from langgraph.types import Command
+from langgraph.types import Command, Send
 
+from src.models.base._chat_model import ChatModel
 from src.utils.logger import get_logger
-from src.utils.stream import stream_if_available
+from src.utils.stream import get_stream_callback, stream_if_available
+from src.utils.tool_result_store import READ_TOOL_NAME, ToolResultStore
 
+from .agent_branch import AgentBranch, AgentCall
 from .base._node_with_tools import NodeWithTools
 
 logger = get_logger(__name__)
 
+# Tool whose calls become graph branches in the fan-out topology
+DELEGATION_TOOL_NAME = "invoke_agent"
+
 
 class ReasoningNode(NodeWithTools):
-    """Concrete node that performs reasoning with optional tools."""
+    """Concrete node that performs reasoning with optional tools.
+
+    With ``agent_nodes`` (fan-out topology), ``invoke_agent`` calls are
+    not run inside the tool loop: the calls of a model turn are sent in
+    parallel to the agent branch nodes, and reasoning resumes once their
+    answers are merged into ``agent_results``.
+    """
+
+    def __init__(
+        self,
+        routing_options: dict[str, str],
+        model: ChatModel,
+        agent_nodes: dict[str, str] | None = None,
+    ):
+        """
+        Initialize the reasoning node.
+
+        Args:
+            routing_options: Routing configuration for the node. In the
+                fan-out topology, ``agent_branch`` names the branch node of
+                agents without a node of their own.
+            model: The chat model to use.
+            agent_nodes: Branch node of each agent; enables the fan-out.
+        """
+        super().__init__(routing_options, model)
+        self.agent_nodes = agent_nodes
 
     def execute(
         self, state: dict, config: RunnableConfig, *args, **kwargs
@@ -28,12 +61,14 @@ class ReasoningNode(NodeWithTools):
         """Run reasoning, invoking tools only if requested by the model."""
         logger.info("ReasoningNode: Starting execution")
 
-        stream_callback = state.get("stream_callback")
-        stream_if_available(
-            stream_callback,
-            "Realizando análise...",
-            type="reasoning",
-        )
+        stream_callback = get_stream_callback(config)
+        agent_results = state.get("agent_results") or []
+        if not agent_results:
+            stream_if_available(
+                stream_callback,
+                "Realizando análise...",
+                type="reasoning",
+            )
 
         messages = state.get("messages", [])
         if not messages:
@@ -53,26 +88,46 @@ class ReasoningNode(NodeWithTools):
                 goto=self.routing_options.get("end", "END"),
             )
 
-        logger.info(
-            f"Processing message: {last_human_message.content[:100]}..."
-        )
+        logger.info("Processing message: %.100s...", last_human_message.content)
 
-        stream_if_available(
-            config.get("stream_callback"),
-            "Listando agentes disponíveis...",
-            type="reasoning",
-        )
+        if agent_results:
+            # Joining a fan-out round: answer the deferred calls
+            messages = messages + self._agent_messages(agent_results)
+        else:
+            stream_if_available(
+                stream_callback,
+                "Listando agentes disponíveis...",
+                type="reasoning",
+            )
 
-        # Store stream_callback in the node for use in
-        # run_model_with_optional_tools
-        self._current_state = state
-        messages, error = self.run_model_with_optional_tools(messages, config)
+        # Tool calls reach the client before OutputGuardRail runs
+        stream_tokens = (
+            os.getenv("REASONING_STREAM_TOKENS", "true").lower() == "true"
+        )
+        if self.agent_nodes is None:
+            messages, error, partial = self.run_model_with_optional_tools(
+                messages, config, stream_tokens=stream_tokens
+            )
+        else:
+            messages, error, partial = self.run_model_with_optional_tools(
+                messages,
+                config,
+                stream_tokens=stream_tokens,
+                defer=(DELEGATION_TOOL_NAME,),
+                max_tool_iters=self._remaining_tool_iters(messages),
+            )
         if error:
             return Command(
-                update={"messages": messages, "error_message": error},
+                update=self._with_reset(
+                    {"messages": messages, "error_message": error}
+                ),
                 goto=self.routing_options.get("end", "END"),
             )
 
+        calls = self._pending_agent_calls(messages)
+        if calls:
+            return self._fan_out(messages, calls)
+
         # Final message expected to be the last AIMessage
         final_ai = None
         for msg in reversed(messages):
@@ -81,20 +136,93 @@ class ReasoningNode(NodeWithTools):
                 break
 
         final_text = final_ai.content if isinstance(final_ai, AIMessage) else ""
+        # The tool loop stops early when the request deadline is near
+        status = "analysis_partial" if partial else "analysis_completed"
 
         next_node = self.routing_options.get("next_node")
-        logger.info(f"Routing to next_node: {next_node}")
+        logger.info("Routing to next_node: %s", next_node)
         return Command(
-            update={
-                "messages": messages,
-                "analysis_result": {
-                    "input": last_human_message.content,
-                    "analysis": final_text,
-                    "node": self.name,
-                },
-                "recommendations": [final_text] if final_text else None,
-                "processing_status": "analysis_completed",
-                "error_message": None,
-            },
+            update=self._with_reset(
+                {
+                    "messages": messages,
+                    "analysis_result": {
+                        "input": last_human_message.content,
+                        "analysis": final_text,
+                        "node": self.name,
+                    },
+                    "recommendations": [final_text] if final_text else None,
+                    "processing_status": status,
+                    "error_message": None,
+                }
+            ),
             goto=next_node or "END",
         )
+
+    def _with_reset(self, update: dict) -> dict:
+        """Clear the answers of the last fan-out round (fan-out only)."""
+        if self.agent_nodes is not None:
+            update["agent_results"] = None
+        return update
+
+    @staticmethod
+    def _remaining_tool_iters(messages: list) -> int:
+        """Tool turns left for this question across fan-out rounds."""
+        used = 0
+        for msg in reversed(messages):
+            if isinstance(msg, HumanMessage):
+                break
+            if isinstance(msg, AIMessage) and msg.tool_calls:
+                used += 1
+        return max(0, int(os.getenv("MAX_TOOL_ITERS", "10")) - used)
+
+    @staticmethod
+    def _pending_agent_calls(messages: list) -> list[AgentCall]:
+        """Deferred ``invoke_agent`` calls of the last model turn."""
+        last = next(
+            (m for m in reversed(messages) if isinstance(m, AIMessage)), None
+        )
+        if last is None:
+            return []
+        answered = {
+            m.tool_call_id for m in messages if isinstance(m, ToolMessage)
+        }
+        return [
+            AgentCall(
+                agent_name=str(call["args"].get("agent_name", "")),
+                query=str(call["args"].get("query", "")),
+                tool_call_id=call["id"] or "",
+            )
+            for call in last.tool_calls
+            if call["name"] == DELEGATION_TOOL_NAME
+            and call["id"] not in answered
+        ]
+
+    def _fan_out(self, messages: list, calls: list[AgentCall]) -> Command:
+        """Send each agent call to its branch node (run in parallel)."""
+        fallback = self.routing_options["agent_branch"]
+        sends = [
+            Send(self.agent_nodes.get(call["agent_name"], fallback), call)
+            for call in calls
+        ]
+        AgentBranch.record_round()
+        logger.info(
+            "ReasoningNode: fan-out to %s",
+            [call["agent_name"] for call in calls],
+        )
+        return Command(
+            update=self._with_reset({"messages": messages}), goto=sends
+        )
+
+    def _agent_messages(self, agent_results: list[dict]) -> list[ToolMessage]:
+        """ToolMessages answering the deferred calls, as in the tool loop."""
+        readable = READ_TOOL_NAME in {t.name for t in self.model.get_tools()}
+        return [
+            ToolMessage(
+                name=DELEGATION_TOOL_NAME,
+                tool_call_id=result["tool_call_id"],
+                content=ToolResultStore.compact(
+                    str(result["content"]), readable=readable
+                ),
+            )
+            for result in agent_results
+        ]
@@ -8,24 +8,61 @@ MIT License
 
 from __future__ import annotations
 
-from threading import RLock
-from typing import ClassVar
+from collections.abc import Callable
+from dataclasses import dataclass, field
+import os
+from threading import Lock, RLock
+import time
+from typing import Any, ClassVar
 import unicodedata
 
 from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
 
 from src.data_models.agent_card import AgentCard
 from src.models.base._chat_model import ChatModel
+from src.models.client_pool import LLMClientPool
+from src.services.remote_agent import RemoteAgentClient, RemoteAgentError
+from src.utils.deadline import remaining
 from src.utils.logger import get_logger
+from src.utils.stream import (
+    DelegatedStream,
+    get_stream_callback,
+    with_stream_callback,
+)
 
 logger = get_logger(__name__)
 
 
+ModelFactory = Callable[[AgentCard], "ChatModel | None"]
+
+
+@dataclass
+class _Usage:
+    last_used: float = field(default_factory=time.monotonic)
+    in_flight: int = 0
+
+
 class AgentRegistry:
-    """In-memory registry of AgentCards (no pre-population)."""
+    """In-memory registry of AgentCards (no pre-population).
+
+    Cards with a ``url`` are served remotely and invoked over A2A (see
+    RemoteAgentClient); the others run in-process on a ChatModel.
+
+    Cards are held eagerly. A card may be registered without a model; the
+    model is then built by the model factory on first use (single-flight:
+    concurrent first calls wait for one build). Loaded models idle for
+    longer than AGENT_IDLE_TTL, or beyond AGENT_MAX_LOADED (least recently
+    used first), are evicted and rebuilt on their next use.
+    """
 
     _name_to_card: ClassVar[dict[str, AgentCard]] = {}
     _name_to_model: ClassVar[dict[str, ChatModel]] = {}
+    _usage: ClassVar[dict[str, _Usage]] = {}
+    _build_locks: ClassVar[dict[str, Lock]] = {}
+    _factory: ClassVar[ModelFactory | None] = None
+    _loads: ClassVar[int] = 0
+    _evictions: ClassVar[int] = 0
     _lock: ClassVar[RLock] = RLock()
 
     @staticmethod
@@ -40,29 +77,123 @@ class AgentRegistry:
         ).strip()
 
     @classmethod
-    def register(cls, card: AgentCard, model: ChatModel) -> None:
-        """Register or replace an AgentCard and its associated model."""
+    def _resolve(cls, name: str) -> str | None:
+        """Return the registered name matching ``name`` (or None)."""
+        if name in cls._name_to_card:
+            return name
+        normalized = cls._normalize(name)
+        for registered in cls._name_to_card:
+            if cls._normalize(registered) == normalized:
+                return registered
+        return None
+
+    @staticmethod
+    def _release(model: ChatModel) -> None:
+        """Drop the client pool lease of a model leaving the registry."""
+        inner = getattr(model, "wrapped", model)
+        pool_key = getattr(inner, "pool_key", None)
+        if pool_key:
+            LLMClientPool.release(pool_key)
+
+    @classmethod
+    def set_model_factory(cls, factory: ModelFactory | None) -> None:
+        """Set the builder used for cards registered without a model."""
         with cls._lock:
-            cls._name_to_card[card.name] = card
-            cls._name_to_model[card.name] = model
+            cls._factory = factory
+
+    @classmethod
+    def register(cls, card: AgentCard, model: ChatModel | None = None) -> None:
+        """Register or replace an AgentCard and its associated model.
+
+        Without a model, it is built by the model factory on first use.
+        """
+        cls.apply_changes([(card, model)])
 
     @classmethod
     def get_card(cls, name: str) -> AgentCard | None:
         """Get an AgentCard by name, or None if not found."""
         with cls._lock:
-            card = cls._name_to_card.get(name)
-            if card:
-                return card
-            return cls._name_to_card.get(cls._normalize(name))
+            resolved = cls._resolve(name)
+            return cls._name_to_card.get(resolved) if resolved else None
 
     @classmethod
     def get_model(cls, name: str) -> ChatModel | None:
-        """Get a model by agent name, or None if not found."""
+        """Get a model by agent name, building it on first use.
+
+        Returns None if the agent is unknown or cannot be built.
+        """
+        return cls._get_model(name)[0]
+
+    @classmethod
+    def _get_model(
+        cls, name: str, lease: bool = False
+    ) -> tuple[ChatModel | None, _Usage | None]:
+        """Get a model and, with ``lease``, count it in flight.
+
+        The in-flight count is taken under the lock that returns the
+        model, so evict_idle cannot drop it in between. The usage record
+        returned is the one to pass to ``_end_lease``.
+        """
         with cls._lock:
-            model = cls._name_to_model.get(name)
-            if model:
-                return model
-            return cls._name_to_model.get(cls._normalize(name))
+            resolved = cls._resolve(name)
+            if resolved is None:
+                return None, None
+            model = cls._name_to_model.get(resolved)
+            if model is not None:
+                return model, cls._touch(resolved, lease)
+            build_lock = cls._build_locks.setdefault(resolved, Lock())
+
+        # Single-flight: one build per agent, the others wait for it
+        with build_lock:
+            with cls._lock:
+                model = cls._name_to_model.get(resolved)
+                card = cls._name_to_card.get(resolved)
+                factory = cls._factory
+            if model is not None or card is None or factory is None:
+                with cls._lock:
+                    # Reload under the lock: it may have been evicted
+                    model = cls._name_to_model.get(resolved)
+                    return model, (
+                        cls._touch(resolved, lease) if model else None
+                    )
+            start = time.perf_counter()
+            model = factory(card)
+            if model is None:
+                return None, None
+            with cls._lock:
+                if cls._name_to_card.get(resolved) is not card:
+                    # The card was replaced while building: do not cache
+                    cls._release(model)
+                    return model, None
+                cls._name_to_model[resolved] = model
+                cls._usage[resolved] = _Usage()
+                usage = cls._touch(resolved, lease)
+                cls._loads += 1
+            logger.info(
+                "🧩 AgentRegistry: built %s on first use in %.2fs",
+                resolved,
+                time.perf_counter() - start,
+            )
+        cls.evict_idle()
+        return model, usage
+
+    @classmethod
+    def _touch(cls, name: str, lease: bool) -> _Usage:
+        """Mark a loaded model used (caller holds the lock)."""
+        usage = cls._usage.setdefault(name, _Usage())
+        usage.last_used = time.monotonic()
+        if lease:
+            usage.in_flight += 1
+        return usage
+
+    @classmethod
+    def _end_lease(cls, usage: _Usage | None) -> None:
+        """Release the in-flight count taken by ``_get_model``."""
+        if usage is None:
+            return
+        with cls._lock:
+            usage.in_flight -= 1
+            usage.last_used = time.monotonic()
 
     @classmethod
     def list_cards(cls) -> list[AgentCard]:
@@ -75,20 +206,175 @@ class AgentRegistry:
                     unique[card.name] = card
             return list(unique.values())
 
+    @classmethod
+    def list_models(cls) -> dict[str, ChatModel]:
+        """Return a snapshot of the loaded models keyed by agent name."""
+        with cls._lock:
+            return dict(cls._name_to_model)
+
+    @classmethod
+    def apply_changes(
+        cls,
+        register: list[tuple[AgentCard, ChatModel | None]],
+        remove: list[str] | None = None,
+    ) -> None:
+        """Register, replace and remove agents in one atomic step.
+
+        A None model unloads the agent (rebuilt on next use). Invocations
+        already running keep the model they looked up, so they finish on
+        the previous version.
+        """
+        displaced: list[ChatModel] = []
+        with cls._lock:
+            for name in remove or []:
+                cls._name_to_card.pop(name, None)
+                cls._usage.pop(name, None)
+                model = cls._name_to_model.pop(name, None)
+                if model is not None:
+                    displaced.append(model)
+            for card, model in register:
+                previous = cls._name_to_model.pop(card.name, None)
+                if previous is not None and previous is not model:
+                    displaced.append(previous)
+                cls._name_to_card[card.name] = card
+                if model is not None:
+                    cls._name_to_model[card.name] = model
+                    cls._usage[card.name] = _Usage()
+        for model in displaced:
+            cls._release(model)
+
+    @classmethod
+    def evict_idle(
+        cls, ttl: float | None = None, max_loaded: int | None = None
+    ) -> list[str]:
+        """
+        Unload models idle for more than ``ttl`` or beyond ``max_loaded``.
+
+        Models in use are never evicted; cards stay registered.
+
+        Args:
+            ttl: Idle seconds (default: AGENT_IDLE_TTL, 0 disables).
+            max_loaded: Loaded model cap (default: AGENT_MAX_LOADED, 0
+                disables).
+
+        Returns:
+            list[str]: The evicted agents.
+        """
+        if ttl is None:
+            ttl = float(os.getenv("AGENT_IDLE_TTL", "0"))
+        if max_loaded is None:
+            max_loaded = int(os.getenv("AGENT_MAX_LOADED", "0"))
+        if ttl <= 0 and max_loaded <= 0:
+            return []
+        if cls._factory is None:
+            # Models could not be rebuilt
+            return []
+
+        now = time.monotonic()
+        evicted: list[ChatModel] = []
+        names: list[str] = []
+        with cls._lock:
+            idle = sorted(
+                (
+                    (cls._usage.get(name) or _Usage(), name)
+                    for name in cls._name_to_model
+                ),
+                key=lambda item: item[0].last_used,
+            )
+            loaded = len(idle)
+            for usage, name in idle:
+                if usage.in_flight:
+                    continue
+                expired = ttl > 0 and now - usage.last_used > ttl
+                over_cap = 0 < max_loaded < loaded
+                if expired or over_cap:
+                    evicted.append(cls._name_to_model.pop(name))
+                    cls._usage.pop(name, None)
+                    names.append(name)
+                    loaded -= 1
+            cls._evictions += len(names)
+        for model in evicted:
+            cls._release(model)
+        if names:
+            logger.info("🧩 AgentRegistry: evicted idle agents %s", names)
+        return names
+
+    @classmethod
+    def metrics(cls) -> dict[str, Any]:
+        """Return registered/loaded agent counts and load counters."""
+        with cls._lock:
+            return {
+                "registered": len(cls._name_to_card),
+                "loaded": sorted(cls._name_to_model),
+                "loads": cls._loads,
+                "evictions": cls._evictions,
+            }
+
     @classmethod
     def clear(cls) -> None:
         """Remove all registered AgentCards."""
         with cls._lock:
             cls._name_to_card.clear()
             cls._name_to_model.clear()
+            cls._usage.clear()
+            cls._build_locks.clear()
+
+    @staticmethod
+    def _delegated_stream(
+        card: AgentCard | None, config: RunnableConfig | None
+    ) -> DelegatedStream | None:
+        """Stream forwarding a streaming agent's output, if requested."""
+        parent = get_stream_callback(config)
+        if parent is None or card is None or card.capabilities is None:
+            return None
+        if not card.capabilities.streaming:
+            return None
+        return DelegatedStream(parent, card.name)
+
+    @classmethod
+    def _invoke_remote(
+        cls,
+        card: AgentCard,
+        query: str,
+        config: RunnableConfig | None,
+        delegated: DelegatedStream | None = None,
+        raise_errors: bool = False,
+    ) -> str:
+        """Delegate to an agent served at ``card.url`` (A2A JSON-RPC)."""
+        try:
+            return RemoteAgentClient.invoke(
+                card,
+                query,
+                config=config,
+                on_chunk=delegated.token if delegated else None,
+            )
+        except RemoteAgentError as e:
+            logger.warning("🛰️ AgentRegistry: %s failed: %s", card.name, e)
+            if raise_errors:
+                raise
+            return f"Agente '{card.name}' indisponível: {e}"
 
     @classmethod
-    def invoke(cls, agent_name: str, query: str) -> str:
+    def invoke(
+        cls,
+        agent_name: str,
+        query: str,
+        config: RunnableConfig | None = None,
+        raise_errors: bool = False,
+    ) -> str:
         """Invoke the model associated with the agent by name.
 
         Executes a minimal tool-calling loop so delegated agents can
         call their own tools and return a final answer instead of an
-        empty content with only tool calls.
+        empty content with only tool calls. The config carries the
+        request deadline into the delegated loop.
+
+        Agents whose card sets ``capabilities.streaming`` forward their
+        tokens and tool events to the request stream callback (if any)
+        as ``agent_chunk``/``agent_reasoning`` events.
+
+        A failed remote call returns an "unavailable" answer, or raises
+        RemoteAgentError with ``raise_errors`` (for callers that retry).
         """
         logger = get_logger(__name__)
         logger.debug(
@@ -96,18 +382,42 @@ class AgentRegistry:
             agent_name,
             query[:120],
         )
-        with cls._lock:
-            model = cls._name_to_model.get(agent_name)
-            if model is None:
-                model = cls._name_to_model.get(cls._normalize(agent_name))
-        if model is None:
-            msg = f"Agente '{agent_name}' não encontrado."
+        left = remaining(config)
+        if left is not None and left <= 0:
+            msg = f"Agente '{agent_name}' não consultado: tempo esgotado."
             logger.warning("🧩 AgentRegistry.invoke: %s", msg)
             return msg
 
-        # Use centralized tool loop on the delegated model
-        messages = [HumanMessage(content=query)]
-        messages, final_text, error = model.invoke_with_tools(messages)
+        card = cls.get_card(agent_name)
+        delegated = cls._delegated_stream(card, config)
+        try:
+            if card is not None and card.url is not None:
+                return cls._invoke_remote(
+                    card, query, config, delegated, raise_errors
+                )
+
+            # Leased: protected from eviction until the call returns
+            model, usage = cls._get_model(agent_name, lease=True)
+            if model is None:
+                msg = f"Agente '{agent_name}' não encontrado."
+                logger.warning("🧩 AgentRegistry.invoke: %s", msg)
+                return msg
+
+            # Use centralized tool loop on the delegated model
+            messages = [HumanMessage(content=query)]
+            if delegated is not None:
+                config = with_stream_callback(config, delegated)
+            try:
+                messages, final_text, error, _ = model.invoke_with_tools(
+                    messages,
+                    config=config,
+                    on_chunk=delegated.token if delegated else None,
+                )
+            finally:
+                cls._end_lease(usage)
+        finally:
+            if delegated is not None:
+                delegated.close()
         if error:
             logger.warning("🧩 AgentRegistry.invoke: %s", error)
         # If no final_text provided, fallback to scan
@@ -116,6 +426,11 @@ class AgentRegistry:
                 if isinstance(msg, AIMessage):
                     final_text = getattr(msg, "content", "")
                     break
+        # No answer at all (e.g. the first model call hit the deadline)
+        if not final_text:
+            final_text = (
+                f"Agente '{agent_name}' indisponível: {error}" if error else ""
+            )
         logger.debug(
             "🧩 AgentRegistry.invoke: resposta len=%d", len(final_text)
         )
@@ -5,3 +5,7 @@ Author: Klaus
 
 MIT License
 """
+
+from .telemetry import TelemetryService
+
+__all__ = ["TelemetryService"]
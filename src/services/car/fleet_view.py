@@ -0,0 +1,208 @@
+"""
+File: fleet_view.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+from threading import Lock
+from typing import Any, ClassVar
+from urllib.parse import quote
+
+import httpx
+import numpy as np
+
+from src.services.car.history import ConsumptionEstimate, TelemetryHistory
+from src.services.car.telemetry import FIELDS, TelemetryService
+from src.utils.deadline import call_timeout
+from src.utils.logger import get_logger
+from src.utils.sharding import owns, shard_for, worker_sockets
+
+logger = get_logger(__name__)
+
+Snapshots = tuple[list[str], dict[str, np.ndarray]]
+
+
+class TelemetryUnavailableError(RuntimeError):
+    """The worker holding the telemetry of a vehicle did not answer."""
+
+
+def encode_snapshots(ids: list[str], cols: dict[str, np.ndarray]) -> dict:
+    """JSON form of a snapshot table (NaN values become null)."""
+    return {
+        "vehicle_ids": ids,
+        "columns": {
+            name: np.where(np.isnan(col), None, col).tolist()
+            for name, col in cols.items()
+        },
+    }
+
+
+def _decode_snapshots(payload: dict) -> Snapshots:
+    ids = [str(i) for i in payload["vehicle_ids"]]
+    cols = {
+        name: np.array(payload["columns"][name], dtype=float).reshape(-1)
+        for name in FIELDS
+    }
+    return ids, cols
+
+
+class FleetView:
+    """Telemetry reads covering the vehicles of every launcher worker.
+
+    Telemetry is sharded by vehicle_id (see the launcher), while a chat
+    runs on the worker of its thread_id. Reads of one vehicle are sent to
+    the worker owning it, over its Unix socket; fleet reads combine the
+    snapshot table of every worker. In a single process all reads are
+    local.
+    """
+
+    _clients: ClassVar[dict[str, httpx.Client]] = {}
+    _requests: ClassVar[int] = 0
+    _failures: ClassVar[int] = 0
+    _lock: ClassVar[Lock] = Lock()
+
+    @staticmethod
+    def _timeout() -> float:
+        """TELEMETRY_PEER_TIMEOUT_MS, cut to what is left of the deadline."""
+        timeout = float(os.getenv("TELEMETRY_PEER_TIMEOUT_MS", "2000")) / 1000
+        left = call_timeout()
+        return timeout if left is None else min(timeout, left)
+
+    @classmethod
+    def _get(
+        cls,
+        index: int,
+        path: str,
+        timeout: float,
+        params: dict[str, Any] | None = None,
+    ) -> Any | None:
+        """
+        GET the JSON answer of a worker (None for a 404).
+
+        Raises:
+            TelemetryUnavailableError: The worker did not answer.
+        """
+        socket_path = worker_sockets()[index]
+        with cls._lock:
+            cls._requests += 1
+            client = cls._clients.get(socket_path)
+            if client is None:
+                client = httpx.Client(
+                    transport=httpx.HTTPTransport(uds=socket_path),
+                    base_url="http://worker",
+                )
+                cls._clients[socket_path] = client
+        try:
+            response = client.get(path, params=params, timeout=timeout)
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPError as e:
+            with cls._lock:
+                cls._failures += 1
+            logger.warning("🚚 Worker %d telemetry unavailable: %s", index, e)
+            raise TelemetryUnavailableError(
+                f"Telemetry of worker {index} unavailable"
+            ) from e
+
+    @staticmethod
+    def _owner(vehicle_id: str) -> int | None:
+        """Worker owning a vehicle, None when this process does."""
+        sockets = worker_sockets()
+        if not sockets or owns(vehicle_id):
+            return None
+        return shard_for(vehicle_id, len(sockets))
+
+    @classmethod
+    def latest(cls, vehicle_id: str) -> dict[str, Any] | None:
+        """Latest snapshot of a vehicle (None if it has no telemetry)."""
+        owner = cls._owner(vehicle_id)
+        if owner is None:
+            return TelemetryService.latest(vehicle_id)
+        return cls._get(
+            owner,
+            f"/telemetry/vehicles/{quote(vehicle_id, safe='')}",
+            cls._timeout(),
+        )
+
+    @classmethod
+    def consumption(cls, vehicle_id: str) -> ConsumptionEstimate | None:
+        """Consumption estimated from a vehicle's history (see history)."""
+        owner = cls._owner(vehicle_id)
+        if owner is None:
+            return TelemetryHistory.consumption(vehicle_id)
+        payload = cls._get(
+            owner,
+            f"/telemetry/vehicles/{quote(vehicle_id, safe='')}/consumption",
+            cls._timeout(),
+        )
+        if payload is None:
+            return None
+        payload.pop("vehicle_id", None)
+        return ConsumptionEstimate(**payload)
+
+    @classmethod
+    def snapshots(cls) -> tuple[list[str], dict[str, np.ndarray], int]:
+        """
+        Latest snapshot of every vehicle of the fleet, as columns.
+
+        The tables of the other workers are fetched concurrently. A worker
+        that does not answer is left out and counted.
+
+        Returns:
+            tuple: The vehicle ids, per field an array aligned with them
+                (as TelemetryService.snapshots) and the number of workers
+                whose vehicles are missing.
+        """
+        sockets = worker_sockets()
+        local = TelemetryService.snapshots()
+        index = int(os.getenv("WORKER_INDEX", "0"))
+        peers = [i for i in range(len(sockets)) if i != index]
+        if not peers:
+            return (*local, 0)
+        timeout = cls._timeout()
+
+        def fetch(peer: int) -> Snapshots | None:
+            try:
+                payload = cls._get(
+                    peer, "/telemetry/snapshots", timeout, {"local": True}
+                )
+            except TelemetryUnavailableError:
+                return None
+            return _decode_snapshots(payload)
+
+        with ThreadPoolExecutor(
+            max_workers=len(peers), thread_name_prefix="fleet-view"
+        ) as executor:
+            fetched = dict(zip(peers, executor.map(fetch, peers)))
+        fetched[index] = local
+        tables = [fetched[i] for i in sorted(fetched) if fetched[i] is not None]
+        ids = [vehicle for table_ids, _ in tables for vehicle in table_ids]
+        cols = {
+            name: np.concatenate([table[name] for _, table in tables])
+            for name in FIELDS
+        }
+        return ids, cols, sum(table is None for table in fetched.values())
+
+    @classmethod
+    def metrics(cls) -> dict[str, Any]:
+        """Return the counters of the requests to other workers."""
+        with cls._lock:
+            return {"requests": cls._requests, "failures": cls._failures}
+
+    @classmethod
+    def close(cls) -> None:
+        """Close the clients of the other workers."""
+        with cls._lock:
+            clients = list(cls._clients.values())
+            cls._clients.clear()
+        for client in clients:
+            client.close()
@@ -0,0 +1,462 @@
+"""
+File: history.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import hashlib
+import os
+from pathlib import Path
+import re
+from threading import Lock
+import time
+from typing import Any, ClassVar
+
+import numpy as np
+
+from src.utils.logger import get_logger
+from src.utils.sharding import owns
+
+logger = get_logger(__name__)
+
+# Stored columns and their dtypes (one file per column); float64 keeps
+# the readings exact, so ring buffers restored from disk match the input
+COLUMNS: dict[str, np.dtype] = {
+    "timestamp": np.dtype("f8"),
+    "fuel_liters": np.dtype("f8"),
+    "autonomy_km_l": np.dtype("f8"),
+    "odometer_km": np.dtype("f8"),
+    "latitude": np.dtype("f8"),
+    "longitude": np.dtype("f8"),
+    "speed_kmh": np.dtype("f8"),
+}
+INITIAL_CAPACITY = 4096
+# z of a two-sided 95% interval
+Z_95 = 1.96
+
+
+def _history_dir() -> Path | None:
+    """Directory of the memory-mapped files (None keeps history in RAM)."""
+    root = os.getenv("TELEMETRY_HISTORY_DIR", "data/telemetry")
+    if not root:
+        return None
+    # Shared by the launcher workers: each vehicle has one owner (the
+    # proxy shards telemetry by vehicle_id), which alone maps its files
+    return Path(root)
+
+
+def _vehicle_dir(root: Path, vehicle_id: str) -> Path:
+    safe = re.sub(r"[^A-Za-z0-9_.-]", "_", vehicle_id)[:40]
+    digest = hashlib.blake2b(vehicle_id.encode(), digest_size=6).hexdigest()
+    return root / f"{safe}-{digest}"
+
+
+class _Columns:
+    """Append-only columns of one vehicle.
+
+    With a directory, every column is a memory-mapped file grown by
+    doubling and the row count lives in its own file, written after the
+    rows, so reopening after a restart only maps the files.
+    """
+
+    def __init__(self, vehicle_id: str, path: Path | None):
+        self.vehicle_id = vehicle_id
+        self.path = path
+        self.lock = Lock()
+        self.columns: dict[str, np.ndarray] = {}
+        if path is None:
+            self._count = np.zeros(1, dtype="i8")
+            self._allocate(INITIAL_CAPACITY)
+            return
+        path.mkdir(parents=True, exist_ok=True)
+        (path / "vehicle_id").write_text(vehicle_id)
+        count_file = path / "count.i8"
+        if not count_file.exists():
+            count_file.write_bytes(bytes(8))
+        self._count = np.memmap(count_file, dtype="i8", mode="r+", shape=(1,))
+        stored = path / "timestamp.f8"
+        rows = stored.stat().st_size // 8 if stored.exists() else 0
+        self._allocate(max(INITIAL_CAPACITY, rows))
+
+    @property
+    def count(self) -> int:
+        return int(self._count[0])
+
+    @property
+    def capacity(self) -> int:
+        return len(self.columns["timestamp"])
+
+    def _allocate(self, capacity: int) -> None:
+        count = self.count
+        for name, dtype in COLUMNS.items():
+            if self.path is None:
+                column = np.full(capacity, np.nan, dtype=dtype)
+                if name in self.columns:
+                    column[:count] = self.columns[name][:count]
+            else:
+                file = self.path / f"{name}.{dtype.str[1:]}"
+                with open(file, "ab") as f:
+                    if f.tell() < capacity * dtype.itemsize:
+                        f.truncate(capacity * dtype.itemsize)
+                column = np.memmap(
+                    file, dtype=dtype, mode="r+", shape=(capacity,)
+                )
+            self.columns[name] = column
+
+    def append(self, rows: dict[str, np.ndarray]) -> None:
+        n = len(rows["timestamp"])
+        with self.lock:
+            count = self.count
+            if count + n > self.capacity:
+                capacity = self.capacity
+                while count + n > capacity:
+                    capacity *= 2
+                self._allocate(capacity)
+            for name, column in self.columns.items():
+                column[count : count + n] = rows[name]
+            # Rows first, then the count that exposes them
+            self._count[0] = count + n
+
+    def view(self) -> dict[str, np.ndarray]:
+        """Views of the stored rows (no copy)."""
+        with self.lock:
+            count = self.count
+            return {
+                name: column[:count] for name, column in self.columns.items()
+            }
+
+    def flush(self) -> None:
+        with self.lock:
+            for column in [*self.columns.values(), self._count]:
+                if isinstance(column, np.memmap):
+                    column.flush()
+
+
+@dataclass
+class ConsumptionEstimate:
+    """Fuel consumption estimated from a vehicle's history."""
+
+    km_per_liter: float
+    # 95% interval (None with fewer than two buckets)
+    ci_low: float | None
+    ci_high: float | None
+    km: float
+    liters: float
+    buckets: int
+    by_speed_band: dict[str, float | None]
+    trend_km_per_liter: float | None
+    window_days: float
+
+
+def _segments(
+    cols: dict[str, np.ndarray], refuel_liters: float
+) -> dict[str, np.ndarray]:
+    """Driving segments between consecutive samples.
+
+    Segments where fuel rose by ``refuel_liters`` or more (refuelling),
+    the odometer went back or data is missing are dropped. Segments with
+    no measurable fuel drop are kept, so the quantization of the fuel
+    sensor averages out over the sums.
+    """
+    ts = cols["timestamp"]
+    odo = cols["odometer_km"]
+    fuel = cols["fuel_liters"]
+    speed = cols["speed_kmh"]
+    dt = np.diff(ts)
+    km = np.diff(odo)
+    liters = -np.diff(fuel)
+    valid = (
+        np.isfinite(km)
+        & np.isfinite(liters)
+        & (dt > 0)
+        & (km >= 0)
+        & (liters > -refuel_liters)
+    )
+    seg_speed = (speed[1:] + speed[:-1]) / 2
+    # Without speed readings, use the average speed of the segment
+    seg_speed = np.where(
+        np.isfinite(seg_speed), seg_speed, km / np.maximum(dt, 1e-9) * 3600
+    )
+    return {
+        "t": ts[1:][valid],
+        "km": km[valid],
+        "liters": liters[valid],
+        "speed": seg_speed[valid],
+    }
+
+
+def _ratio(km: np.ndarray, liters: np.ndarray) -> float | None:
+    total = float(liters.sum())
+    return float(km.sum()) / total if total > 0 else None
+
+
+def estimate_consumption(
+    cols: dict[str, np.ndarray],
+    now: float | None = None,
+    window_days: float = 30.0,
+    trend_days: float = 7.0,
+    bucket_seconds: float = 3600.0,
+    speed_bands: tuple[float, ...] = (40.0, 80.0, 110.0),
+    refuel_liters: float = 1.0,
+    min_bucket_liters: float = 0.5,
+) -> ConsumptionEstimate | None:
+    """
+    Estimate real consumption (km/l) from a vehicle's columns.
+
+    The estimate is total km over total liters of the window. Its 95%
+    interval comes from the spread of the per-bucket ratios (buckets
+    burning at least ``min_bucket_liters``). The trend compares the last
+    ``trend_days`` with the preceding ones. All steps are vectorized.
+
+    Returns:
+        ConsumptionEstimate | None: None without enough fuel burnt.
+    """
+    seg = _segments(cols, refuel_liters)
+    if not len(seg["t"]):
+        return None
+    now = float(seg["t"][-1]) if now is None else now
+    start = np.searchsorted(seg["t"], now - window_days * 86400)
+    t, km, liters, speed = (
+        seg[k][start:] for k in ("t", "km", "liters", "speed")
+    )
+    overall = _ratio(km, liters)
+    if overall is None:
+        return None
+
+    # Per-bucket ratios give the spread of the estimate
+    index = ((t - t[0]) // bucket_seconds).astype(np.int64)
+    bucket_km = np.bincount(index, weights=km)
+    bucket_liters = np.bincount(index, weights=liters)
+    burning = bucket_liters >= min_bucket_liters
+    ratios = bucket_km[burning] / bucket_liters[burning]
+    n = len(ratios)
+    half = float(Z_95 * ratios.std(ddof=1) / np.sqrt(n)) if n > 1 else None
+
+    edges = np.asarray(speed_bands, dtype="f8")
+    band = np.digitize(speed, edges)
+    band_km = np.bincount(band, weights=km, minlength=len(edges) + 1)
+    band_liters = np.bincount(band, weights=liters, minlength=len(edges) + 1)
+    bounds = [0.0, *speed_bands, None]
+    by_band = {
+        f"{bounds[i]:g}-{bounds[i + 1]:g}"
+        if bounds[i + 1] is not None
+        else f"{bounds[i]:g}+": (
+            round(float(band_km[i] / band_liters[i]), 2)
+            if band_liters[i] > 0
+            else None
+        )
+        for i in range(len(bounds) - 1)
+    }
+
+    recent = t >= now - trend_days * 86400
+    previous = (t >= now - 2 * trend_days * 86400) & ~recent
+    recent_ratio = _ratio(km[recent], liters[recent])
+    previous_ratio = _ratio(km[previous], liters[previous])
+    trend = (
+        round(recent_ratio - previous_ratio, 2)
+        if recent_ratio is not None and previous_ratio is not None
+        else None
+    )
+    return ConsumptionEstimate(
+        km_per_liter=round(overall, 2),
+        ci_low=None if half is None else round(max(overall - half, 0.0), 2),
+        ci_high=None if half is None else round(overall + half, 2),
+        km=round(float(km.sum()), 1),
+        liters=round(float(liters.sum()), 2),
+        buckets=n,
+        by_speed_band=by_band,
+        trend_km_per_liter=trend,
+        window_days=window_days,
+    )
+
+
+def downsample(
+    cols: dict[str, np.ndarray], start: float, end: float, points: int
+) -> list[dict[str, Any]]:
+    """Mean of every column over ``points`` equal time bins (empty skipped)."""
+    ts = cols["timestamp"]
+    lo = np.searchsorted(ts, start, side="left")
+    hi = np.searchsorted(ts, end, side="right")
+    if hi <= lo or points <= 0:
+        return []
+    t = ts[lo:hi]
+    width = max((end - start) / points, 1e-9)
+    index = np.minimum(((t - start) // width).astype(np.int64), points - 1)
+    counts = np.bincount(index, minlength=points)
+    out: dict[str, np.ndarray] = {}
+    for name in COLUMNS:
+        if name == "timestamp":
+            continue
+        values = cols[name][lo:hi]
+        finite = np.isfinite(values)
+        sums = np.bincount(
+            index, weights=np.where(finite, values, 0.0), minlength=points
+        )
+        seen = np.bincount(index, weights=finite, minlength=points)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out[name] = sums / seen
+    rows = []
+    for i in np.flatnonzero(counts):
+        row: dict[str, Any] = {
+            "timestamp": start + (float(i) + 0.5) * width,
+            "samples": int(counts[i]),
+        }
+        for name, means in out.items():
+            mean = float(means[i])
+            row[name] = None if np.isnan(mean) else round(mean, 3)
+        rows.append(row)
+    return rows
+
+
+class TelemetryHistory:
+    """Long-term columnar telemetry history of the vehicles.
+
+    Complements the ring buffers of TelemetryService: every accepted
+    sample is appended to per-vehicle NumPy columns, memory-mapped under
+    TELEMETRY_HISTORY_DIR so a restarted worker maps its history back
+    instantly instead of reloading it. Estimates and downsampled views
+    run vectorized over the mapped columns without copying them.
+    """
+
+    _vehicles: ClassVar[dict[str, _Columns]] = {}
+    _loaded: ClassVar[bool] = False
+    _lock: ClassVar[Lock] = Lock()
+
+    @classmethod
+    def _load(cls) -> None:
+        """Map the vehicles already on disk (once)."""
+        if cls._loaded:
+            return
+        with cls._lock:
+            if cls._loaded:
+                return
+            root = _history_dir()
+            if root is not None and root.is_dir():
+                start = time.perf_counter()
+                for entry in root.iterdir():
+                    id_file = entry / "vehicle_id"
+                    if id_file.is_file():
+                        vehicle_id = id_file.read_text()
+                        if not owns(vehicle_id):
+                            continue
+                        cls._vehicles[vehicle_id] = _Columns(vehicle_id, entry)
+                logger.info(
+                    "📈 Mapped history of %d vehicles in %.1f ms",
+                    len(cls._vehicles),
+                    (time.perf_counter() - start) * 1000,
+                )
+            cls._loaded = True
+
+    @classmethod
+    def _columns(cls, vehicle_id: str, create: bool) -> _Columns | None:
+        cls._load()
+        columns = cls._vehicles.get(vehicle_id)
+        if columns is not None or not create:
+            return columns
+        with cls._lock:
+            columns = cls._vehicles.get(vehicle_id)
+            if columns is None:
+                root = _history_dir()
+                path = None if root is None else _vehicle_dir(root, vehicle_id)
+                columns = cls._vehicles[vehicle_id] = _Columns(vehicle_id, path)
+            return columns
+
+    @classmethod
+    def append(cls, vehicle_id: str, rows: dict[str, np.ndarray]) -> None:
+        """Append rows (one array per column, in time order)."""
+        if len(rows["timestamp"]):
+            cls._columns(vehicle_id, create=True).append(rows)
+
+    @classmethod
+    def vehicles(cls) -> list[str]:
+        """Ids of the vehicles with history."""
+        cls._load()
+        with cls._lock:
+            return list(cls._vehicles)
+
+    @classmethod
+    def view(cls, vehicle_id: str) -> dict[str, np.ndarray] | None:
+        """Columns of a vehicle (None without history)."""
+        columns = cls._columns(vehicle_id, create=False)
+        return None if columns is None else columns.view()
+
+    @classmethod
+    def consumption(
+        cls, vehicle_id: str, now: float | None = None
+    ) -> ConsumptionEstimate | None:
+        """
+        Estimate a vehicle's consumption from its history.
+
+        Uses TELEMETRY_ESTIMATE_DAYS, TELEMETRY_TREND_DAYS and
+        TELEMETRY_SPEED_BANDS.
+
+        Returns:
+            ConsumptionEstimate | None: None without enough history.
+        """
+        cols = cls.view(vehicle_id)
+        if cols is None or len(cols["timestamp"]) < 2:
+            return None
+        bands = tuple(
+            float(b)
+            for b in os.getenv("TELEMETRY_SPEED_BANDS", "40,80,110").split(",")
+            if b.strip()
+        )
+        return estimate_consumption(
+            cols,
+            now=now,
+            window_days=float(os.getenv("TELEMETRY_ESTIMATE_DAYS", "30")),
+            trend_days=float(os.getenv("TELEMETRY_TREND_DAYS", "7")),
+            speed_bands=bands,
+        )
+
+    @classmethod
+    def downsampled(
+        cls,
+        vehicle_id: str,
+        start: float | None = None,
+        end: float | None = None,
+        points: int = 500,
+    ) -> list[dict[str, Any]] | None:
+        """Downsampled view of a time range (default: the whole history)."""
+        cols = cls.view(vehicle_id)
+        if cols is None:
+            return None
+        ts = cols["timestamp"]
+        if not len(ts):
+            return []
+        start = float(ts[0]) if start is None else start
+        end = float(ts[-1]) if end is None else end
+        return downsample(cols, start, end, points)
+
+    @classmethod
+    def metrics(cls) -> dict[str, Any]:
+        """Return the vehicles and rows in the history."""
+        cls._load()
+        with cls._lock:
+            vehicles = list(cls._vehicles.values())
+        return {
+            "persistent": _history_dir() is not None,
+            "vehicles": len(vehicles),
+            "rows": sum(v.count for v in vehicles),
+        }
+
+    @classmethod
+    def flush(cls) -> None:
+        """Write the mapped pages to disk."""
+        with cls._lock:
+            vehicles = list(cls._vehicles.values())
+        for columns in vehicles:
+            columns.flush()
+
+    @classmethod
+    def clear(cls) -> None:
+        """Forget the mapped vehicles (files are kept)."""
+        with cls._lock:
+            cls._vehicles.clear()
+            cls._loaded = False
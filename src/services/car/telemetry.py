@@ -0,0 +1,278 @@
+"""
+File: telemetry.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable
+import math
+import os
+from threading import Lock
+import time
+from typing import Any, ClassVar
+
+import numpy as np
+
+from src.data_models.telemetry import TelemetrySample
+from src.services.car.history import COLUMNS, TelemetryHistory
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Columns of a ring buffer (missing optional values are stored as NaN)
+FIELDS = (
+    "timestamp",
+    "fuel_liters",
+    "autonomy_km_l",
+    "odometer_km",
+    "latitude",
+    "longitude",
+    "speed_kmh",
+)
+
+
+def default_vehicle_id() -> str:
+    """Vehicle used when a request names none."""
+    return os.getenv("DEFAULT_VEHICLE_ID", "default")
+
+
+def _value(value: float | None) -> float:
+    return math.nan if value is None else float(value)
+
+
+def _history_enabled() -> bool:
+    return os.getenv("TELEMETRY_HISTORY_ENABLED", "true").lower() == "true"
+
+
+class _Ring:
+    """Fixed-size ring buffer of samples, one ``array('d')`` per field."""
+
+    __slots__ = ("capacity", "columns", "count", "head", "lock", "slot")
+
+    def __init__(self, capacity: int, slot: int):
+        self.capacity = capacity
+        # Row of the vehicle in the fleet snapshot table
+        self.slot = slot
+        self.columns = [array("d", [math.nan]) * capacity for _ in FIELDS]
+        # Next write position
+        self.head = 0
+        self.count = 0
+        self.lock = Lock()
+
+    def append(self, row: tuple[float, ...]) -> None:
+        i = self.head
+        for column, value in zip(self.columns, row):
+            column[i] = value
+        self.head = (i + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def row(self, age: int) -> dict[str, float | None]:
+        """Sample ``age`` positions before the latest (0 is the latest)."""
+        i = (self.head - 1 - age) % self.capacity
+        return {
+            name: None if math.isnan(column[i]) else column[i]
+            for name, column in zip(FIELDS, self.columns)
+        }
+
+    def last_timestamp(self) -> float:
+        if not self.count:
+            return -math.inf
+        return self.columns[0][(self.head - 1) % self.capacity]
+
+
+class TelemetryService:
+    """In-memory telemetry of the vehicles served by this worker.
+
+    Each vehicle keeps its last TELEMETRY_BUFFER_SIZE samples in a
+    preallocated ring buffer, so ingestion never allocates per sample and
+    the latest snapshot is read in O(1). Batches are grouped by vehicle
+    and each ring is locked once per batch; samples older than the latest
+    stored one are dropped as stale. At most TELEMETRY_MAX_VEHICLES
+    vehicles are tracked; samples of further vehicles are rejected.
+    The latest sample of every vehicle is also kept in one fleet table,
+    so fleet queries read all snapshots as NumPy columns in one pass.
+    Accepted samples are also appended to the TelemetryHistory columns,
+    and a ring created after a restart starts from the end of them.
+    """
+
+    _rings: ClassVar[dict[str, _Ring]] = {}
+    # Latest sample per vehicle, one row per ring slot
+    _latest: ClassVar[np.ndarray] = np.empty((0, len(FIELDS)))
+    _restored: ClassVar[bool] = False
+    _lock: ClassVar[Lock] = Lock()
+    _batches: ClassVar[int] = 0
+    _samples: ClassVar[int] = 0
+    _stale: ClassVar[int] = 0
+    _rejected: ClassVar[int] = 0
+
+    @classmethod
+    def _ring(cls, vehicle_id: str, create: bool = False) -> _Ring | None:
+        ring = cls._rings.get(vehicle_id)
+        if ring is not None:
+            return ring
+        history = (
+            TelemetryHistory.view(vehicle_id) if _history_enabled() else None
+        )
+        if not create and (history is None or not len(history["timestamp"])):
+            return None
+        with cls._lock:
+            ring = cls._rings.get(vehicle_id)
+            if ring is None:
+                limit = int(os.getenv("TELEMETRY_MAX_VEHICLES", "5000"))
+                if len(cls._rings) >= limit:
+                    return None
+                size = int(os.getenv("TELEMETRY_BUFFER_SIZE", "512"))
+                ring = _Ring(max(1, size), len(cls._rings))
+                if ring.slot >= len(cls._latest):
+                    grown = np.full(
+                        (max(64, 2 * len(cls._latest)), len(FIELDS)), np.nan
+                    )
+                    grown[: len(cls._latest)] = cls._latest
+                    cls._latest = grown
+                if history is not None:
+                    tail = [history[name][-ring.capacity :] for name in FIELDS]
+                    for row in zip(*tail):
+                        ring.append(tuple(float(v) for v in row))
+                    if ring.count:
+                        cls._latest[ring.slot] = [c[-1] for c in tail]
+                cls._rings[vehicle_id] = ring
+            return ring
+
+    @classmethod
+    def ingest(cls, samples: Iterable[TelemetrySample]) -> dict[str, int]:
+        """
+        Store a batch of samples.
+
+        Args:
+            samples: Samples of any number of vehicles, in any order.
+
+        Returns:
+            dict[str, int]: ``accepted``, ``stale`` and ``rejected`` counts.
+        """
+        now = time.time()
+        by_vehicle: dict[str, list[tuple[float, ...]]] = {}
+        for s in samples:
+            by_vehicle.setdefault(s.vehicle_id, []).append(
+                (
+                    now if s.timestamp is None else s.timestamp,
+                    s.fuel_liters,
+                    s.autonomy_km_l,
+                    _value(s.odometer_km),
+                    _value(s.latitude),
+                    _value(s.longitude),
+                    _value(s.speed_kmh),
+                )
+            )
+        accepted = stale = rejected = 0
+        for vehicle_id, rows in by_vehicle.items():
+            ring = cls._ring(vehicle_id, create=True)
+            if ring is None:
+                rejected += len(rows)
+                continue
+            rows.sort(key=lambda row: row[0])
+            kept = []
+            with ring.lock:
+                last = ring.last_timestamp()
+                for row in rows:
+                    if row[0] < last:
+                        stale += 1
+                        continue
+                    ring.append(row)
+                    kept.append(row)
+                    last = row[0]
+                if kept:
+                    with cls._lock:
+                        cls._latest[ring.slot] = kept[-1]
+                # Same order as the ring, so the history stays sorted
+                if kept and _history_enabled():
+                    table = np.asarray(kept, dtype="f8")
+                    TelemetryHistory.append(
+                        vehicle_id,
+                        {
+                            name: table[:, FIELDS.index(name)]
+                            for name in COLUMNS
+                        },
+                    )
+            accepted += len(kept)
+        with cls._lock:
+            cls._batches += 1
+            cls._samples += accepted
+            cls._stale += stale
+            cls._rejected += rejected
+        if rejected:
+            logger.warning("📡 Telemetry: %d samples rejected", rejected)
+        return {"accepted": accepted, "stale": stale, "rejected": rejected}
+
+    @classmethod
+    def latest(cls, vehicle_id: str) -> dict[str, Any] | None:
+        """Latest snapshot of a vehicle (None if it has no telemetry)."""
+        ring = cls._ring(vehicle_id)
+        if ring is None:
+            return None
+        with ring.lock:
+            if not ring.count:
+                return None
+            return {"vehicle_id": vehicle_id, **ring.row(0)}
+
+    @classmethod
+    def recent(cls, vehicle_id: str, limit: int = 100) -> list[dict[str, Any]]:
+        """Up to ``limit`` most recent samples of a vehicle, oldest first."""
+        ring = cls._ring(vehicle_id)
+        if ring is None:
+            return []
+        with ring.lock:
+            n = min(max(limit, 0), ring.count)
+            return [ring.row(age) for age in range(n - 1, -1, -1)]
+
+    @classmethod
+    def vehicles(cls) -> list[str]:
+        """Ids of the vehicles with telemetry."""
+        with cls._lock:
+            return list(cls._rings)
+
+    @classmethod
+    def snapshots(cls) -> tuple[list[str], dict[str, np.ndarray]]:
+        """
+        Latest snapshot of every vehicle, as columns.
+
+        Vehicles only in the history (after a restart) are loaded first.
+
+        Returns:
+            tuple: The vehicle ids and, per field, an array aligned with
+                them (missing optional values are NaN).
+        """
+        if not cls._restored and _history_enabled():
+            for vehicle_id in TelemetryHistory.vehicles():
+                cls._ring(vehicle_id)
+            cls._restored = True
+        with cls._lock:
+            # Slots follow the insertion order of the rings
+            ids = list(cls._rings)
+            table = cls._latest[: len(ids)].copy()
+        return ids, {name: table[:, i] for i, name in enumerate(FIELDS)}
+
+    @classmethod
+    def metrics(cls) -> dict[str, Any]:
+        """Return vehicle and sample counters."""
+        with cls._lock:
+            return {
+                "vehicles": len(cls._rings),
+                "batches": cls._batches,
+                "samples": cls._samples,
+                "stale": cls._stale,
+                "rejected": cls._rejected,
+            }
+
+    @classmethod
+    def clear(cls) -> None:
+        """Drop the telemetry of every vehicle."""
+        with cls._lock:
+            cls._rings.clear()
+            cls._latest = np.empty((0, len(FIELDS)))
+            cls._restored = False
@@ -0,0 +1,318 @@
+"""
+File: intent_planner.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+import os
+import re
+from threading import Lock
+from typing import Any, ClassVar
+import unicodedata
+
+from src.services.agent_registry import AgentRegistry
+from src.tools.calculations import is_trip_possible
+from src.tools.car import read_car_status
+from src.tools.travel import recommend_locations
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Patterns matched on the lowercased query without accents. Each intent
+# needs its verb and its object, so a query that merely mentions fuel or
+# a distance is not taken for a planned intent.
+CAR_STATUS_RES = (
+    # "status do carro", "estado do meu veiculo"
+    re.compile(r"\b(status|estado|situacao) d[oa] (meu )?(carro|veiculo)\b"),
+    # "combustivel do carro", "autonomia do meu carro"
+    re.compile(
+        r"\b(combustivel|gasolina|autonomia) d[oa] (meu )?"
+        r"(carro|veiculo|tanque)\b"
+    ),
+    # "quanto combustivel eu tenho", "quantos litros restam no tanque"
+    re.compile(
+        r"\b(quanto|quantos|qual)\b.{0,25}\b(combustivel|gasolina|litros|"
+        r"autonomia)\b.{0,25}\b(tenho|tem|resta|restam|sobra|sobrou|"
+        r"no tanque)\b"
+    ),
+)
+# "consigo", "da para", "e possivel"... asking whether a trip can be made
+FEASIBILITY_RE = re.compile(
+    r"\b(consigo|consegue|conseguiria|da para|daria para|posso|possivel|"
+    r"chego|chega)\b"
+)
+# A trip verb followed closely by the distance: "ir ate santos, 80 km"
+TRIP_DISTANCE_RE = re.compile(
+    r"\b(ir|chegar|viajar|percorrer|rodar|andar|viagem)\b[^.?!]{0,25}?"
+    r"\b(\d+(?:[.,]\d+)?)\s*(?:km|kms|quilometros?)\b"
+)
+RECOMMEND_RES = (
+    re.compile(r"\b(recomend|suger|sugest|sugir)\w*"),
+    re.compile(r"\b(para )?onde\b.{0,20}\b(ir|viajar|passear)\b"),
+)
+TRAVEL_RE = re.compile(
+    r"\b(destinos?|viagem|viajar|ir|passeio|passear|lugar(es)?|praias?|"
+    r"serra|montanhas?|cidades?)\b"
+)
+# Topics next to the planned ones (costs, durations, maintenance...)
+NEGATIVE_RE = re.compile(
+    r"\b(custa\w*|preco|valor|quanto tempo|demora\w*|leva|horas?|oleo|"
+    r"troca\w*|pneus?|revis\w*|manutencao|a cada|multas?|seguro|barulho|"
+    r"motor|pedagio)\b"
+)
+# Questions about several vehicles are left to the fleet tools
+FLEET_TERMS = ("frota", "veiculos", "carros")
+DESTINATION_TYPES = {
+    "praia": ("praia", "mar", "litoral"),
+    "montanha": ("montanha", "serra", "frio"),
+    "histórica": ("historic", "cultur"),
+}
+DISTANCE_RE = re.compile(r"(\d+(?:[.,]\d+)?)\s*(?:km|kms|quilometros?)\b")
+
+
+def _fold(text: str) -> str:
+    """Lowercase ``text`` and strip its accents."""
+    s = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in s if not unicodedata.combining(c))
+
+
+def _has_any(text: str, terms: tuple[str, ...]) -> bool:
+    return any(term in text for term in terms)
+
+
+def _number(value: float) -> str:
+    """Format a number the pt-BR way (no trailing zeros)."""
+    return f"{value:.1f}".rstrip("0").rstrip(".").replace(".", ",")
+
+
+@dataclass(frozen=True)
+class Intent:
+    """A recognised intent and its extracted slots."""
+
+    name: str
+    slots: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class Plan:
+    """Fixed sequence of skill calls answering an intent.
+
+    ``skills`` are the agent skills the plan calls; the plan only runs
+    when every one is served by a local registered agent.
+    """
+
+    skills: tuple[str, ...]
+    run: Callable[[dict[str, Any]], str]
+
+
+def _read_status(slots: dict[str, Any]) -> tuple[float, float]:
+    """Fuel (liters) and autonomy (km/l) of the car of the request."""
+    status = read_car_status(slots.get("vehicle_id"))
+    if status is None:
+        raise LookupError("no telemetry")
+    return status["gas_liters"], status["autonomy"]
+
+
+def _car_status(slots: dict[str, Any]) -> str:
+    gas, autonomy = _read_status(slots)
+    return (
+        f"O carro está com {_number(gas)} litros de combustível e "
+        f"autonomia de {_number(autonomy)} km/l, o que permite rodar cerca "
+        f"de {_number(gas * autonomy)} km."
+    )
+
+
+def _trip_possible(slots: dict[str, Any]) -> str:
+    distance = slots["distance_km"]
+    gas, autonomy = _read_status(slots)
+    possible = is_trip_possible.invoke(
+        {"distance": distance, "autonomy": autonomy, "gas": gas}
+    )
+    reach = f"{_number(gas * autonomy)} km"
+    if possible:
+        return (
+            f"Sim, a viagem de {_number(distance)} km é possível: com "
+            f"{_number(gas)} litros e autonomia de {_number(autonomy)} km/l, "
+            f"o carro roda cerca de {reach}."
+        )
+    missing = distance / autonomy - gas
+    return (
+        f"Não, a viagem de {_number(distance)} km não é possível sem "
+        f"reabastecer: com {_number(gas)} litros e autonomia de "
+        f"{_number(autonomy)} km/l, o carro roda cerca de {reach}. Faltam "
+        f"cerca de {_number(missing)} litros."
+    )
+
+
+def _recommend_destination(slots: dict[str, Any]) -> str:
+    gas, autonomy = _read_status(slots)
+    destinations = recommend_locations.invoke(
+        {"query": slots.get("destination_type") or ""}
+    )
+    lines = []
+    for place in destinations:
+        possible = is_trip_possible.invoke(
+            {
+                "distance": place["distance_km"],
+                "autonomy": autonomy,
+                "gas": gas,
+            }
+        )
+        verdict = "viável" if possible else "requer reabastecimento"
+        lines.append(
+            f"- {place['name']} ({place['distance_km']} km, "
+            f"{place['travel_time']}, {place['weather']}): "
+            f"{place['description']}. Viagem {verdict}."
+        )
+    return (
+        f"Com {_number(gas)} litros e autonomia de {_number(autonomy)} "
+        f"km/l (cerca de {_number(gas * autonomy)} km), estes são os destinos "
+        "recomendados:\n" + "\n".join(lines)
+    )
+
+
+PLANS: dict[str, Plan] = {
+    "car_status": Plan(("get_car_status",), _car_status),
+    "trip_possible": Plan(("get_car_status",), _trip_possible),
+    "recommend_destination": Plan(
+        ("get_car_status", "recommend_locations"), _recommend_destination
+    ),
+}
+
+
+class IntentPlanner:
+    """Rule- and slot-based planner for the most common questions.
+
+    Recognises the car status, trip feasibility and destination
+    recommendation intents and answers them with a precompiled plan of
+    skill calls and a response template, without a reasoning model turn.
+    Each intent needs a verb/object pattern, and off-topic terms (costs,
+    durations, maintenance) veto every intent. Queries that match no
+    intent, more than one, or are about several vehicles return None so
+    the caller falls back to the reasoning model. Off unless
+    INTENT_PLANNER_ENABLED is true.
+    """
+
+    _stats: ClassVar[dict[str, int]] = {}
+    _lock: ClassVar[Lock] = Lock()
+
+    @staticmethod
+    def enabled() -> bool:
+        """Whether the planner runs ahead of the reasoning node."""
+        return os.getenv("INTENT_PLANNER_ENABLED", "false").lower() == "true"
+
+    @classmethod
+    def _count(cls, key: str) -> None:
+        with cls._lock:
+            cls._stats[key] = cls._stats.get(key, 0) + 1
+
+    @staticmethod
+    def match(text: str) -> Intent | None:
+        """
+        Recognise the intent of a query.
+
+        Args:
+            text: The user query.
+
+        Returns:
+            Intent | None: The intent and its slots, or None when the
+                query is not confidently one of the planned intents.
+        """
+        folded = _fold(text)
+        max_words = int(os.getenv("INTENT_PLANNER_MAX_WORDS", "30"))
+        if (
+            len(folded.split()) > max_words
+            or _has_any(folded, FLEET_TERMS)
+            or NEGATIVE_RE.search(folded)
+        ):
+            return None
+        distance = DISTANCE_RE.search(folded)
+        trip = TRIP_DISTANCE_RE.search(folded)
+
+        intents = []
+        if any(r.search(folded) for r in RECOMMEND_RES) and (
+            TRAVEL_RE.search(folded) and distance is None
+        ):
+            destination_type = next(
+                (
+                    name
+                    for name, terms in DESTINATION_TYPES.items()
+                    if _has_any(folded, terms)
+                ),
+                None,
+            )
+            intents.append(
+                Intent(
+                    "recommend_destination",
+                    {"destination_type": destination_type},
+                )
+            )
+        if trip is not None and FEASIBILITY_RE.search(folded):
+            intents.append(
+                Intent(
+                    "trip_possible",
+                    {"distance_km": float(trip.group(2).replace(",", "."))},
+                )
+            )
+        if distance is None and any(r.search(folded) for r in CAR_STATUS_RES):
+            intents.append(Intent("car_status"))
+        # Ambiguous queries go to the reasoning model
+        return intents[0] if len(intents) == 1 else None
+
+    @staticmethod
+    def _available(skills: tuple[str, ...]) -> bool:
+        """Whether every skill is served by a local registered agent."""
+        served = {
+            skill.id
+            for card in AgentRegistry.list_cards()
+            if card.url is None
+            for skill in card.skills or []
+        }
+        return all(skill in served for skill in skills)
+
+    @classmethod
+    def plan(
+        cls, text: str, vehicle_id: str | None = None
+    ) -> tuple[Intent, str] | None:
+        """
+        Answer a query with the plan of its intent.
+
+        Args:
+            text: The user query.
+            vehicle_id: The vehicle of the request (default vehicle if None).
+
+        Returns:
+            tuple[Intent, str] | None: The intent and the answer, or None
+                to fall back to the reasoning model.
+        """
+        intent = cls.match(text)
+        if intent is None:
+            cls._count("fallback_no_match")
+            return None
+        plan = PLANS[intent.name]
+        if not cls._available(plan.skills):
+            logger.info("🧭 Planner: %s skills not served", intent.name)
+            cls._count("fallback_unavailable")
+            return None
+        try:
+            answer = plan.run({**intent.slots, "vehicle_id": vehicle_id})
+        except Exception as e:
+            logger.warning("🧭 Planner: %s plan failed: %s", intent.name, e)
+            cls._count("fallback_failed")
+            return None
+        logger.info("🧭 Planner: answered %s %s", intent.name, intent.slots)
+        cls._count(intent.name)
+        return intent, answer
+
+    @classmethod
+    def metrics(cls) -> dict[str, int]:
+        """Return planned answers per intent and fallbacks per reason."""
+        with cls._lock:
+            return dict(cls._stats)
@@ -0,0 +1,345 @@
+"""
+File: remote_agent.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import Future, wait
+from dataclasses import asdict, dataclass
+import importlib.util
+import json
+import os
+from threading import Lock, Thread
+from typing import Any, ClassVar
+from urllib.parse import urlsplit
+import uuid
+
+import httpx
+
+from src.data_models.agent_card import AgentCard
+from src.utils.cancellation import RequestCancelledError, get_cancel_token
+from src.utils.deadline import ConfigLike, remaining
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Called with each text chunk of a streamed remote answer
+ChunkCallback = Callable[[str], None]
+
+
+class RemoteAgentError(Exception):
+    """A remote agent could not be reached or returned an error."""
+
+
+@dataclass
+class _HostStats:
+    requests: int = 0
+    streamed: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+
+
+def build_message_request(
+    query: str, stream: bool = False, request_id: str | None = None
+) -> dict[str, Any]:
+    """Build an A2A JSON-RPC ``message/send`` (or ``message/stream``)."""
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id or uuid.uuid4().hex,
+        "method": "message/stream" if stream else "message/send",
+        "params": {
+            "message": {
+                "kind": "message",
+                "role": "user",
+                "messageId": uuid.uuid4().hex,
+                "parts": [{"kind": "text", "text": query}],
+            }
+        },
+    }
+
+
+def _parts_text(parts: list[dict[str, Any]] | None) -> str:
+    return "".join(
+        str(p.get("text", "")) for p in parts or [] if p.get("kind") == "text"
+    )
+
+
+def result_text(result: dict[str, Any]) -> str:
+    """
+    Extract the answer text of an A2A result or stream event.
+
+    Handles a Message, a Task (its artifacts) and the ``artifact-update``
+    events of a stream. Status updates carry no answer text.
+    """
+    if "artifact" in result:
+        return _parts_text(result["artifact"].get("parts"))
+    if "artifacts" in result:
+        return "".join(
+            _parts_text(a.get("parts")) for a in result["artifacts"] or []
+        )
+    return _parts_text(result.get("parts"))
+
+
+def _decode(text: str) -> dict[str, Any]:
+    """Parse a JSON-RPC response, raising RemoteAgentError if malformed."""
+    try:
+        payload = json.loads(text)
+    except ValueError as e:
+        raise RemoteAgentError(f"malformed response: {text[:80]!r}") from e
+    if not isinstance(payload, dict):
+        raise RemoteAgentError(f"malformed response: {text[:80]!r}")
+    return payload
+
+
+def _raise_for_failed_status(result: dict[str, Any]) -> None:
+    status = result.get("status") or {}
+    if status.get("state") in ("failed", "rejected"):
+        message = _parts_text((status.get("message") or {}).get("parts"))
+        raise RemoteAgentError(message or f"task {status['state']}")
+
+
+class RemoteAgentClient:
+    """Process-wide A2A client for agents whose card has a ``url``.
+
+    All remote calls share one ``httpx.AsyncClient`` (keep-alive, and
+    HTTP/2 when the ``h2`` package is installed) running on a dedicated
+    event loop thread, so blocking callers such as tools and the agent
+    registry reuse the same connections. A per-host semaphore bounds the
+    concurrent calls to each agent node, and every call is limited by the
+    request deadline and stopped when the request is cancelled.
+    """
+
+    _loop: ClassVar[asyncio.AbstractEventLoop | None] = None
+    _client: ClassVar[httpx.AsyncClient | None] = None
+    _http2: ClassVar[bool] = False
+    _host_limits: ClassVar[dict[str, asyncio.Semaphore]] = {}
+    _stats: ClassVar[dict[str, _HostStats]] = {}
+    _lock: ClassVar[Lock] = Lock()
+
+    @classmethod
+    def _ensure_loop(cls) -> asyncio.AbstractEventLoop:
+        with cls._lock:
+            if cls._loop is None:
+                loop = asyncio.new_event_loop()
+                Thread(
+                    target=loop.run_forever, name="remote-agents", daemon=True
+                ).start()
+                cls._loop = loop
+            return cls._loop
+
+    @classmethod
+    def _http(cls) -> httpx.AsyncClient:
+        """Return the shared client (created on the loop thread)."""
+        if cls._client is None:
+            http2 = os.getenv("REMOTE_AGENT_HTTP2", "true").lower() == "true"
+            if http2 and importlib.util.find_spec("h2") is None:
+                logger.info("🛰️ h2 not installed, remote agents use HTTP/1.1")
+                http2 = False
+            cls._http2 = http2
+            cls._client = httpx.AsyncClient(
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=int(
+                        os.getenv("REMOTE_AGENT_MAX_CONNECTIONS", "100")
+                    ),
+                    max_keepalive_connections=int(
+                        os.getenv("REMOTE_AGENT_MAX_KEEPALIVE", "20")
+                    ),
+                    keepalive_expiry=30.0,
+                ),
+                timeout=httpx.Timeout(
+                    float(os.getenv("REMOTE_AGENT_TIMEOUT", "60")),
+                    connect=float(
+                        os.getenv("REMOTE_AGENT_CONNECT_TIMEOUT", "5")
+                    ),
+                ),
+            )
+        return cls._client
+
+    @classmethod
+    def _host(cls, url: str) -> tuple[str, asyncio.Semaphore, _HostStats]:
+        host = urlsplit(url).netloc
+        if host not in cls._host_limits:
+            limit = int(os.getenv("REMOTE_AGENT_MAX_PER_HOST", "8"))
+            cls._host_limits[host] = asyncio.Semaphore(max(1, limit))
+        with cls._lock:
+            stats = cls._stats.setdefault(host, _HostStats())
+        return host, cls._host_limits[host], stats
+
+    @classmethod
+    def invoke(
+        cls,
+        card: AgentCard,
+        query: str,
+        config: ConfigLike = None,
+        on_chunk: ChunkCallback | None = None,
+    ) -> str:
+        """
+        Send a query to a remote agent and wait for its answer.
+
+        Streams the answer (``message/stream``) when the card declares
+        ``capabilities.streaming``, calling ``on_chunk`` from the client
+        thread with each text chunk.
+
+        Args:
+            card: The agent card (``url`` is the JSON-RPC endpoint).
+            query: The user query for the agent.
+            config: Run config carrying the deadline and cancel token.
+            on_chunk: Optional callback receiving streamed text chunks.
+
+        Returns:
+            str: The answer text.
+
+        Raises:
+            RemoteAgentError: On transport, protocol or timeout errors.
+            RequestCancelledError: If the request is cancelled meanwhile.
+        """
+        if card.url is None:
+            raise RemoteAgentError(f"agent {card.name} has no url")
+        stream = bool(card.capabilities and card.capabilities.streaming)
+        future: Future[str] = asyncio.run_coroutine_threadsafe(
+            cls._call(
+                str(card.url), query, stream, remaining(config), on_chunk
+            ),
+            cls._ensure_loop(),
+        )
+        token = get_cancel_token(config)
+        while not future.done():
+            wait([future], timeout=None if token is None else 0.25)
+            if token is not None and token.cancelled and not future.done():
+                # Cancelling the task closes the upstream connection
+                future.cancel()
+                raise RequestCancelledError(token.reason)
+        return future.result()
+
+    @classmethod
+    async def _call(
+        cls,
+        url: str,
+        query: str,
+        stream: bool,
+        budget: float | None,
+        on_chunk: ChunkCallback | None,
+    ) -> str:
+        host, limit, stats = cls._host(url)
+        try:
+            async with asyncio.timeout(budget):
+                async with limit:
+                    with cls._lock:
+                        stats.requests += 1
+                        stats.streamed += int(stream)
+                        stats.in_flight += 1
+                        stats.peak_in_flight = max(
+                            stats.peak_in_flight, stats.in_flight
+                        )
+                    try:
+                        if stream:
+                            return await cls._stream(url, query, on_chunk)
+                        return await cls._send(url, query)
+                    finally:
+                        with cls._lock:
+                            stats.in_flight -= 1
+        except TimeoutError as e:
+            with cls._lock:
+                stats.timeouts += 1
+            raise RemoteAgentError(f"{host}: deadline exceeded") from e
+        except httpx.HTTPError as e:
+            with cls._lock:
+                stats.failures += 1
+            raise RemoteAgentError(f"{host}: {e}") from e
+        except RemoteAgentError:
+            with cls._lock:
+                stats.failures += 1
+            raise
+        except (AttributeError, KeyError, TypeError) as e:
+            # Valid JSON of an unexpected shape
+            with cls._lock:
+                stats.failures += 1
+            raise RemoteAgentError(f"{host}: malformed response: {e}") from e
+
+    @classmethod
+    async def _send(cls, url: str, query: str) -> str:
+        response = await cls._http().post(
+            url, json=build_message_request(query)
+        )
+        response.raise_for_status()
+        payload = _decode(response.text)
+        if payload.get("error"):
+            raise RemoteAgentError(payload["error"].get("message", "error"))
+        result = payload.get("result") or {}
+        _raise_for_failed_status(result)
+        return result_text(result)
+
+    @classmethod
+    async def _stream(
+        cls, url: str, query: str, on_chunk: ChunkCallback | None
+    ) -> str:
+        chunks: list[str] = []
+        async with cls._http().stream(
+            "POST",
+            url,
+            json=build_message_request(query, stream=True),
+            headers={"Accept": "text/event-stream"},
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                event = _decode(line[5:])
+                if event.get("error"):
+                    raise RemoteAgentError(
+                        event["error"].get("message", "error")
+                    )
+                result = event.get("result") or {}
+                _raise_for_failed_status(result)
+                text = result_text(result)
+                if text:
+                    chunks.append(text)
+                    if on_chunk is not None:
+                        on_chunk(text)
+        return "".join(chunks)
+
+    @classmethod
+    def metrics(cls) -> dict[str, Any]:
+        """Return per-host request counters."""
+        with cls._lock:
+            return {
+                "http2": cls._http2,
+                "hosts": {
+                    host: asdict(stats) for host, stats in cls._stats.items()
+                },
+            }
+
+    @classmethod
+    def close(cls) -> None:
+        """Close the shared client and stop the loop thread."""
+        with cls._lock:
+            loop, client = cls._loop, cls._client
+            cls._loop, cls._client = None, None
+            cls._host_limits.clear()
+        if loop is None:
+            return
+        if client is not None:
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(5)
+        loop.call_soon_threadsafe(loop.stop)
+
+    @classmethod
+    def _reset_after_fork(cls) -> None:
+        # The loop thread does not survive a fork: start over in the child
+        cls._loop, cls._client = None, None
+        cls._host_limits.clear()
+        cls._stats.clear()
+        cls._lock = Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=RemoteAgentClient._reset_after_fork)
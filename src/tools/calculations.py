@@ -18,15 +18,20 @@ logger = get_logger(__name__)
 def is_trip_possible(distance: float, autonomy: float, gas: float) -> bool:
     """Check if the trip is possible."""
     logger.info(
-        f"🔧 Checking if trip is possible: distance={distance}, "
-        f"autonomy={autonomy}, gas={gas}"
+        "🔧 Checking if trip is possible: distance=%s, autonomy=%s, gas=%s",
+        distance,
+        autonomy,
+        gas,
     )
     try:
         needed_gas = distance / autonomy
         possible = needed_gas <= gas
         logger.info(
-            f"🔧 Trip feasibility: needed_gas={needed_gas:.4f}, "
-            f"available_gas={gas:.4f}, possible={possible}"
+            "🔧 Trip feasibility: needed_gas=%.4f, available_gas=%.4f, "
+            "possible=%s",
+            needed_gas,
+            gas,
+            possible,
         )
         return possible
     except Exception as e:
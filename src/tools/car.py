@@ -7,25 +7,169 @@ Author: Klaus
 MIT License
 """
 
-from random import randint
+import os
+from random import Random
+import time
+from typing import Any
 
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
 
+from src.services.car.fleet_view import FleetView
+from src.services.car.telemetry import FIELDS, default_vehicle_id
 from src.utils.logger import get_logger
+from src.utils.vehicle import get_vehicle_id
 
 logger = get_logger(__name__)
 
 
-@tool
-def get_car_status() -> str:
-    """Get the status of the car."""
-    gas_liters = randint(25, 55)
-    current_autonomy = randint(7, 12)
+def _simulated(vehicle_id: str) -> dict[str, Any]:
+    """Synthetic snapshot of a vehicle without telemetry (not stored)."""
+    # Seeded by the id, so a vehicle reads the same values on every call
+    rng = Random(vehicle_id)
+    snapshot: dict[str, Any] = dict.fromkeys(FIELDS)
+    snapshot.update(
+        vehicle_id=vehicle_id,
+        timestamp=time.time(),
+        fuel_liters=float(rng.randint(25, 55)),
+        autonomy_km_l=float(rng.randint(7, 12)),
+        simulated=True,
+    )
+    return snapshot
+
+
+def read_car_status(vehicle_id: str | None = None) -> dict[str, Any] | None:
+    """
+    Read the latest telemetry of a vehicle.
+
+    With TELEMETRY_SIMULATE true (demo mode, off by default), vehicles
+    without telemetry get a synthetic reading. It is never stored, so
+    invented vehicle ids do not enter the fleet or the history.
+
+    Args:
+        vehicle_id: The vehicle (default: DEFAULT_VEHICLE_ID).
+
+    Returns:
+        dict | None: ``gas_liters``, ``autonomy`` (km/liter) and the other
+            fields of the latest snapshot, or None without telemetry.
+    """
+    vehicle_id = vehicle_id or default_vehicle_id()
+    snapshot = FleetView.latest(vehicle_id)
+    if snapshot is None and (
+        os.getenv("TELEMETRY_SIMULATE", "false").lower() == "true"
+    ):
+        snapshot = _simulated(vehicle_id)
+    if snapshot is None:
+        logger.warning("🔧 No telemetry for vehicle %s", vehicle_id)
+        return None
     logger.info(
-        f"🔧 Getting car status: gas_liters={gas_liters}, "
-        f"current_autonomy={current_autonomy}"
+        "🔧 Getting car status: vehicle=%s, gas_liters=%s, autonomy=%s",
+        vehicle_id,
+        snapshot["fuel_liters"],
+        snapshot["autonomy_km_l"],
     )
-    return (
-        f"The car has {gas_liters} liters of gas and a current autonomy of "
-        f"{current_autonomy} km/liters."
+    return {
+        **snapshot,
+        "gas_liters": snapshot["fuel_liters"],
+        "autonomy": snapshot["autonomy_km_l"],
+    }
+
+
+def _vehicle(vehicle_id: str | None, config: RunnableConfig | None) -> str:
+    """Vehicle named by the model, else the one of the request."""
+    return vehicle_id or get_vehicle_id(config) or default_vehicle_id()
+
+
+@tool
+def get_car_status(
+    vehicle_id: str | None = None, config: RunnableConfig = None
+) -> str:
+    """Get the status of the car.
+
+    Args:
+        vehicle_id: Only when the user names a vehicle (default: the
+            vehicle of the conversation).
+    """
+    status = read_car_status(_vehicle(vehicle_id, config))
+    if status is None:
+        return "No telemetry available for the car."
+    text = (
+        f"The car has {status['gas_liters']:g} liters of gas and a current "
+        f"autonomy of {status['autonomy']:g} km/liters."
+    )
+    if status["odometer_km"] is not None:
+        text += f" Odometer: {status['odometer_km']:g} km."
+    if status["latitude"] is not None and status["longitude"] is not None:
+        text += (
+            f" Location: {status['latitude']:.5f}, {status['longitude']:.5f}."
+        )
+    if status.get("simulated"):
+        text += " (Simulated reading: the vehicle has no telemetry.)"
+    return text
+
+
+@tool
+def estimate_autonomy(
+    speed_kmh: float | None = None,
+    vehicle_id: str | None = None,
+    config: RunnableConfig = None,
+) -> str:
+    """Estimate the real range of the car from its consumption history.
+
+    Args:
+        speed_kmh: Planned cruising speed, to use the consumption of its
+            speed band (optional).
+        vehicle_id: Only when the user names a vehicle (default: the
+            vehicle of the conversation).
+    """
+    status = read_car_status(_vehicle(vehicle_id, config))
+    if status is None:
+        return "No telemetry available for the car."
+    gas = status["gas_liters"]
+    estimate = FleetView.consumption(status["vehicle_id"])
+    if estimate is None:
+        return (
+            "Not enough history to estimate the real consumption. The car "
+            f"reports {gas:g} liters of gas and {status['autonomy']:g} "
+            f"km/liters, a range of about {gas * status['autonomy']:.0f} km."
+        )
+    text = (
+        f"Real consumption over the last {estimate.window_days:g} days: "
+        f"{estimate.km_per_liter:g} km/liter"
+    )
+    if estimate.ci_low is not None:
+        text += f" (95% interval {estimate.ci_low:g}-{estimate.ci_high:g})"
+    text += (
+        f". With {gas:g} liters of gas the estimated range is "
+        f"{gas * estimate.km_per_liter:.0f} km"
     )
+    if estimate.ci_low is not None:
+        text += (
+            f" ({gas * estimate.ci_low:.0f}-{gas * estimate.ci_high:.0f} km)"
+        )
+    text += "."
+    if speed_kmh is not None:
+        band, km_per_liter = _speed_band(estimate.by_speed_band, speed_kmh)
+        if km_per_liter is not None:
+            text += (
+                f" At {speed_kmh:g} km/h (band {band} km/h) the car does "
+                f"{km_per_liter:g} km/liter: about "
+                f"{gas * km_per_liter:.0f} km."
+            )
+    if estimate.trend_km_per_liter is not None:
+        text += (
+            f" Trend of the last days: {estimate.trend_km_per_liter:+g} "
+            "km/liter."
+        )
+    return text
+
+
+def _speed_band(
+    bands: dict[str, float | None], speed_kmh: float
+) -> tuple[str, float | None]:
+    """Band of ``bands`` (keys like ``"40-80"`` or ``"110+"``) of a speed."""
+    for band, km_per_liter in bands.items():
+        low, _, high = band.rstrip("+").partition("-")
+        if speed_kmh >= float(low) and (not high or speed_kmh < float(high)):
+            return band, km_per_liter
+    return "", None
@@ -0,0 +1,160 @@
+"""
+File: fleet.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+from __future__ import annotations
+
+import os
+import unicodedata
+
+from langchain_core.tools import tool
+import numpy as np
+
+from src.services.car.fleet_view import FleetView
+from src.tools.travel import DESTINATIONS
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Shortest destination prefix accepted ("ouro" for "Ouro Preto")
+MIN_PREFIX = 4
+
+
+def _fold(text: str) -> str:
+    s = unicodedata.normalize("NFKD", text.lower().strip())
+    return "".join(c for c in s if not unicodedata.combining(c))
+
+
+def _destination_km(destination: str) -> tuple[str, float] | None:
+    """
+    Name and distance of a known destination.
+
+    Matches the whole name, accents and case ignored, or a prefix of at
+    least MIN_PREFIX characters that only one destination has.
+    """
+    wanted = " ".join(_fold(destination).split())
+    names = {" ".join(_fold(str(p["name"])).split()): p for p in DESTINATIONS}
+    place = names.get(wanted)
+    if place is None and len(wanted) >= MIN_PREFIX:
+        found = [p for name, p in names.items() if name.startswith(wanted)]
+        place = found[0] if len(found) == 1 else None
+    if place is None:
+        return None
+    return str(place["name"]), float(place["distance_km"])
+
+
+def _listed(
+    ids: list[str],
+    order: np.ndarray,
+    values: np.ndarray,
+    unit: str,
+    digits: int = 0,
+) -> str:
+    """``id (value unit)`` for the first FLEET_MAX_LISTED of ``order``."""
+    limit = int(os.getenv("FLEET_MAX_LISTED", "20"))
+    text = ", ".join(
+        f"{ids[i]} ({values[i]:.{digits}f} {unit})" for i in order[:limit]
+    )
+    if len(order) > limit:
+        text += f" and {len(order) - limit} more"
+    return text
+
+
+def _missing(unavailable: int) -> str:
+    """Warning about vehicles left out (workers that did not answer)."""
+    if not unavailable:
+        return ""
+    return (
+        f" Telemetry of {unavailable} server worker(s) is unavailable: "
+        "their vehicles are not included."
+    )
+
+
+@tool
+def fleet_trip_feasibility(
+    destination: str | None = None, distance_km: float | None = None
+) -> str:
+    """Check which vehicles of the fleet can make a trip without refuelling.
+
+    Evaluates every vehicle at once from its latest telemetry.
+
+    Args:
+        destination: A known destination (e.g. "Ouro Preto").
+        distance_km: The trip distance, when there is no destination.
+    """
+    if destination:
+        found = _destination_km(destination)
+        if found is None:
+            known = ", ".join(str(p["name"]) for p in DESTINATIONS)
+            return (
+                f"Unknown destination '{destination}'. Known destinations: "
+                f"{known}. Pass distance_km instead."
+            )
+        target, distance = found
+        target = f"{target} ({distance:g} km)"
+    elif distance_km is not None and distance_km > 0:
+        distance = float(distance_km)
+        target = f"{distance:g} km"
+    else:
+        return "Provide a destination or a distance_km."
+
+    ids, cols, unavailable = FleetView.snapshots()
+    if not ids:
+        return "No vehicles with telemetry." + _missing(unavailable)
+    fuel, autonomy = cols["fuel_liters"], cols["autonomy_km_l"]
+    reach = fuel * autonomy
+    able = reach >= distance
+    logger.info(
+        "🚚 Fleet trip of %.0f km: %d of %d vehicles can go",
+        distance,
+        able.sum(),
+        len(ids),
+    )
+
+    text = (
+        f"{int(able.sum())} of {len(ids)} vehicles can reach {target} "
+        "without refuelling." + _missing(unavailable)
+    )
+    if able.any():
+        # Largest range first
+        order = np.flatnonzero(able)[np.argsort(-reach[able])]
+        text += f" Can go (range): {_listed(ids, order, reach, 'km')}."
+    if not able.all():
+        # Fewest liters missing first
+        missing = distance / autonomy - fuel
+        order = np.flatnonzero(~able)[np.argsort(missing[~able])]
+        text += (
+            " Need fuel (liters missing): "
+            f"{_listed(ids, order, missing, 'L', digits=1)}."
+        )
+    return text
+
+
+@tool
+def fleet_status() -> str:
+    """Summarize fuel and range of every vehicle of the fleet."""
+    ids, cols, unavailable = FleetView.snapshots()
+    if not ids:
+        return "No vehicles with telemetry." + _missing(unavailable)
+    fuel = cols["fuel_liters"]
+    reach = fuel * cols["autonomy_km_l"]
+    low_km = float(os.getenv("FLEET_LOW_RANGE_KM", "100"))
+    low = np.flatnonzero(reach < low_km)
+    text = (
+        f"{len(ids)} vehicles, {fuel.sum():.0f} liters of gas in total. "
+        f"Range: median {np.median(reach):.0f} km, lowest "
+        f"{reach.min():.0f} km, highest {reach.max():.0f} km."
+        + _missing(unavailable)
+    )
+    if len(low):
+        order = low[np.argsort(reach[low])]
+        text += (
+            f" {len(low)} below {low_km:g} km: "
+            f"{_listed(ids, order, reach, 'km')}."
+        )
+    return text
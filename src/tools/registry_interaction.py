@@ -27,13 +27,14 @@ def list_registered_agents(
     cards = AgentRegistry.list_cards()
     payload = [{"name": c.name, "description": c.description} for c in cards]
     result = json.dumps(payload, ensure_ascii=False)
-    logger.info(f"list_registered_agents: {len(cards)} agentes")
+    logger.info("list_registered_agents: %d agentes", len(cards))
     return result
 
 
 @tool
-def invoke_agent(agent_name: str, query: str) -> str:
+def invoke_agent(agent_name: str, query: str, config: RunnableConfig) -> str:
     """Invoca um agente registrado pelo nome, com a consulta fornecida."""
-    result = AgentRegistry.invoke(agent_name, query)
-    logger.info(f"invoke_agent: {agent_name}")
+    # config is injected by LangChain (carries the request deadline)
+    result = AgentRegistry.invoke(agent_name, query, config=config)
+    logger.info("invoke_agent: %s", agent_name)
     return result
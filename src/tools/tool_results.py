@@ -0,0 +1,34 @@
+"""
+File: tool_results.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+from langchain_core.tools import tool
+
+from src.utils.logger import get_logger
+from src.utils.tool_result_store import ToolResultStore, max_result_chars
+
+logger = get_logger(__name__)
+
+
+@tool
+def read_tool_result(ref: str, offset: int = 0, limit: int = 0) -> str:
+    """Lê um trecho de um resultado de ferramenta truncado, pela referência."""
+    content = ToolResultStore.get(ref)
+    if content is None:
+        return f"Resultado '{ref}' não encontrado (expirado ou inválido)."
+    cap = max_result_chars()
+    limit = min(limit, cap) if limit > 0 else cap
+    offset = max(offset, 0)
+    end = min(offset + limit, len(content))
+    logger.info("read_tool_result: ref=%s [%d:%d]", ref, offset, end)
+    if end >= len(content):
+        return content[offset:end]
+    return (
+        f"{content[offset:end]}\n\n[Trecho {offset}-{end} de {len(content)}"
+        f" caracteres. Continue com offset={end}.]"
+    )
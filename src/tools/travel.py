@@ -15,6 +15,51 @@ from src.utils.logger import get_logger
 logger = get_logger(__name__)
 
 
+# Dados de demonstração com distâncias; em produção, consultar APIs externas
+DESTINATIONS: list[dict[str, object]] = [
+    {
+        "name": "Florianópolis",
+        "distance_km": 300,
+        "weather": "Ensolarado",
+        "description": "Bela ilha com praias e cultura açoriana",
+        "travel_time": "3h30min",
+        "type": "praia",
+    },
+    {
+        "name": "Campos do Jordão",
+        "distance_km": 180,
+        "weather": "Parcialmente nublado",
+        "description": "Cidade serrana com clima europeu e arquitetura",
+        "travel_time": "2h15min",
+        "type": "montanha",
+    },
+    {
+        "name": "Santos",
+        "distance_km": 80,
+        "weather": "Ensolarado",
+        "description": "Cidade litorânea com o maior porto da América",
+        "travel_time": "1h20min",
+        "type": "praia",
+    },
+    {
+        "name": "Ouro Preto",
+        "distance_km": 450,
+        "weather": "Nublado",
+        "description": "Cidade histórica colonial com arquitetura barroca",
+        "travel_time": "5h30min",
+        "type": "histórica",
+    },
+    {
+        "name": "Ubatuba",
+        "distance_km": 250,
+        "weather": "Ensolarado",
+        "description": "Paraíso ecológico com 100+ praias e Mata Atlântica",
+        "travel_time": "3h00min",
+        "type": "praia",
+    },
+]
+
+
 @tool
 def recommend_locations(query: str) -> list[dict[str, object]]:
     """
@@ -30,51 +75,9 @@ def recommend_locations(query: str) -> list[dict[str, object]]:
     {"name": "Florianópolis", "latitude": -27.5949, "longitude": -48.5482,
     "distance_km": 300, "weather": "Ensolarado", "description": "Bela ilha..."}
     """
-    logger.info(f"🌍 recommend_locations: query={query!r}")
-
-    # Dados de demonstração com distâncias; em produção, consultar APIs externas
-    recs = [
-        {
-            "name": "Florianópolis",
-            "distance_km": 300,
-            "weather": "Ensolarado",
-            "description": "Bela ilha com praias e cultura açoriana",
-            "travel_time": "3h30min",
-            "type": "praia",
-        },
-        {
-            "name": "Campos do Jordão",
-            "distance_km": 180,
-            "weather": "Parcialmente nublado",
-            "description": "Cidade serrana com clima europeu e arquitetura",
-            "travel_time": "2h15min",
-            "type": "montanha",
-        },
-        {
-            "name": "Santos",
-            "distance_km": 80,
-            "weather": "Ensolarado",
-            "description": "Cidade litorânea com o maior porto da América",
-            "travel_time": "1h20min",
-            "type": "praia",
-        },
-        {
-            "name": "Ouro Preto",
-            "distance_km": 450,
-            "weather": "Nublado",
-            "description": "Cidade histórica colonial com arquitetura barroca",
-            "travel_time": "5h30min",
-            "type": "histórica",
-        },
-        {
-            "name": "Ubatuba",
-            "distance_km": 250,
-            "weather": "Ensolarado",
-            "description": "Paraíso ecológico com 100+ praias e Mata Atlântica",
-            "travel_time": "3h00min",
-            "type": "praia",
-        },
-    ]
+    logger.info("🌍 recommend_locations: query=%r", query)
+
+    recs = [dict(r) for r in DESTINATIONS]
 
     # Filtrar por tipo se especificado na query
     query_lower = query.lower()
@@ -103,8 +106,8 @@ def recommend_locations(query: str) -> list[dict[str, object]]:
     # Limitar a 3 recomendações
     recs = recs[:3]
 
-    logger.info(f"🌍 recommend_locations: retornando {len(recs)} destinos")
+    logger.info("🌍 recommend_locations: retornando %d destinos", len(recs))
     logger.debug(
-        f"🌍 recommend_locations: preview={recs[0]['name'] if recs else None}"
+        "🌍 recommend_locations: preview=%s", recs[0]["name"] if recs else None
     )
     return recs
@@ -36,6 +36,6 @@ def get_predicted_weather(location: str = "current location") -> str:
     ]
     predicted_weather = choice(weather_options)
 
-    logger.info(f"🌤️ Getting weather for {location}: {predicted_weather}")
+    logger.info("🌤️ Getting weather for %s: %s", location, predicted_weather)
 
     return f"Previsão do tempo para {location}: {predicted_weather}"
@@ -7,9 +7,21 @@ Author: Klaus
 MIT License
 """
 
+from concurrent.futures import ThreadPoolExecutor, wait
+import os
+from threading import Lock
+import time
+from typing import Any
+
+from langchain_core.tools import BaseTool
+
+from src.data_models.agent_card import AgentCard
+from src.models.base._chat_model import ChatModel
+from src.models.cassette import wrap_with_cassette
 from src.models.gemini import Gemini
 from src.services.agent_registry import AgentRegistry
-from src.tools.car import get_car_status
+from src.tools.car import estimate_autonomy, get_car_status
+from src.tools.fleet import fleet_status, fleet_trip_feasibility
 from src.tools.travel import recommend_locations
 from src.tools.weather import get_predicted_weather
 from src.utils.agent_card_loader import load_agent_cards_from_file
@@ -18,16 +30,72 @@ from src.utils.prompt_loader import load_prompt_from_markdown
 
 logger = get_logger(__name__)
 
+DEFAULT_CARDS_PATH = "data/agent_cards.json"
+
+# Serializes reloads (file watcher and admin endpoint)
+_reload_lock = Lock()
+
+# Agent name -> (prompt name, tools) for the specialized agents
+AGENT_DEFINITIONS: dict[str, tuple[str, list[BaseTool]]] = {
+    "AgenteDiagnosticoCarro": (
+        "car_central",
+        [
+            get_car_status,
+            estimate_autonomy,
+            fleet_status,
+            fleet_trip_feasibility,
+        ],
+    ),
+    "AgentePlanejadorViagem": (
+        "trip_planner",
+        [recommend_locations, get_predicted_weather],
+    ),
+}
+
+
+def _build_agent_model(card: AgentCard) -> ChatModel | None:
+    """Build the model for a card, or None if the agent is unknown."""
+    if card.url is not None:
+        # Remote agent: invoked over A2A, no local model
+        return None
+    definition = AGENT_DEFINITIONS.get(card.name)
+    if definition is None:
+        logger.warning("❓ No model definition for agent %s", card.name)
+        return None
+    prompt_name, tools = definition
+    prompt = load_prompt_from_markdown(prompt_name)
+    return wrap_with_cassette(
+        lambda: Gemini(
+            model="gemini-2.5-flash",
+            prompt=prompt,
+            agent_card=card,
+            tools=tools,
+        ),
+        card.name,
+        prompt=prompt,
+        tools=tools,
+        agent_card=card,
+    )
+
+
+def _lazy_init() -> bool:
+    return os.getenv("AGENT_LAZY_INIT", "true").lower() == "true"
+
+
+def _max_workers(jobs: int) -> int:
+    return max(1, min(jobs, int(os.getenv("AGENT_INIT_WORKERS", "8"))))
+
 
 def initialize_external_agents(
-    cards_path: str = "data/agent_cards.json",
+    cards_path: str = DEFAULT_CARDS_PATH,
 ) -> None:
     """Initialize external agents with their respective models.
 
     This function:
     1. Loads agent cards from the specified JSON file
-    2. Loads prompts for each agent type
-    3. Creates and registers models for each agent
+    2. Builds the model of each agent concurrently (prompt + tools),
+       or defers each build to the first use when AGENT_LAZY_INIT is true
+    3. Registers every card (and model, when built) in the registry
 
     Args:
         cards_path: Path to the JSON file containing agent cards.
@@ -46,32 +114,29 @@ def initialize_external_agents(
         agent_cards = load_agent_cards_from_file(cards_path)
         logger.debug(f"📥 Loaded {len(agent_cards)} agent cards")
 
-        # Load prompts for specialized agents
-        car_central_prompt = load_prompt_from_markdown("car_central")
-        trip_planner_prompt = load_prompt_from_markdown("trip_planner")
-        logger.debug("📝 Loaded agent prompts")
-
-        # Initialize models and register with cards
-        for card in agent_cards:
-            if card.name == "AgenteDiagnosticoCarro":
-                model = Gemini(
-                    model="gemini-2.5-flash",
-                    prompt=car_central_prompt,
-                    agent_card=card,
-                    tools=[get_car_status],
-                )
-                AgentRegistry.register(card, model)
-                logger.debug("🚗 Registered car diagnostic agent")
-
-            elif card.name == "AgentePlanejadorViagem":
-                model = Gemini(
-                    model="gemini-2.5-flash",
-                    prompt=trip_planner_prompt,
-                    agent_card=card,
-                    tools=[recommend_locations, get_predicted_weather],
-                )
-                AgentRegistry.register(card, model)
-                logger.debug("✈️ Registered trip planner agent")
+        AgentRegistry.set_model_factory(_build_agent_model)
+        if _lazy_init():
+            # Models are built on first use; only check they can be
+            for card in agent_cards:
+                if card.url is not None or card.name in AGENT_DEFINITIONS:
+                    AgentRegistry.register(card)
+                    logger.debug("🤖 Registered agent %s (lazy)", card.name)
+                else:
+                    logger.warning(
+                        "❓ No model definition for agent %s", card.name
+                    )
+        else:
+            # Build models concurrently; client construction dominates
+            with ThreadPoolExecutor(
+                max_workers=_max_workers(len(agent_cards)),
+                thread_name_prefix="agent-init",
+            ) as executor:
+                models = list(executor.map(_build_agent_model, agent_cards))
+
+            for card, model in zip(agent_cards, models):
+                if model is not None or card.url is not None:
+                    AgentRegistry.register(card, model)
+                    logger.debug("🤖 Registered agent %s", card.name)
 
         # Verify initialization
         registered_agents = AgentRegistry.list_cards()
@@ -96,3 +161,118 @@ def initialize_external_agents(
     except Exception as e:
         logger.error(f"❌ Failed to initialize agents: {e}")
         raise
+
+
+def reload_external_agents(
+    cards_path: str = DEFAULT_CARDS_PATH,
+) -> dict[str, Any]:
+    """Reload agent cards, rebuilding only the agents that changed.
+
+    The new cards are diffed against the registry: added and changed
+    agents get a new model (warmed up before it is swapped in), removed
+    agents are unregistered and unchanged agents keep their model and
+    connection. Nothing changes if any new model fails to build. With
+    AGENT_LAZY_INIT, only changed agents that are loaded are rebuilt; the
+    others are rebuilt on their next use.
+
+    Args:
+        cards_path: Path to the JSON file containing agent cards.
+
+    Returns:
+        dict[str, Any]: The names added, changed and removed, the number
+            of unchanged agents and the elapsed time.
+
+    Raises:
+        ValueError: If a new or changed agent has no model definition
+        FileNotFoundError: If the cards file or a prompt is not found
+    """
+    with _reload_lock:
+        start = time.perf_counter()
+        agent_cards = load_agent_cards_from_file(cards_path)
+        current = {card.name: card for card in AgentRegistry.list_cards()}
+        new_names = {card.name for card in agent_cards}
+
+        to_build = [
+            card for card in agent_cards if current.get(card.name) != card
+        ]
+        removed = sorted(set(current) - new_names)
+        missing = [
+            c.name
+            for c in to_build
+            if c.url is None and c.name not in AGENT_DEFINITIONS
+        ]
+        if missing:
+            raise ValueError(f"No model definition for agents: {missing}")
+
+        # Lazy agents that are not loaded stay lazy
+        loaded = AgentRegistry.list_models()
+        eager = [
+            card
+            for card in to_build
+            if card.url is None and (not _lazy_init() or card.name in loaded)
+        ]
+        with ThreadPoolExecutor(
+            max_workers=_max_workers(len(eager)),
+            thread_name_prefix="agent-reload",
+        ) as executor:
+            models = list(executor.map(_build_agent_model, eager))
+        built = dict(zip((c.name for c in eager), models))
+        warm_up_models(built)
+
+        AgentRegistry.apply_changes(
+            [(card, built.get(card.name)) for card in to_build],
+            remove=removed,
+        )
+
+        summary = {
+            "added": sorted(c.name for c in to_build if c.name not in current),
+            "changed": sorted(c.name for c in to_build if c.name in current),
+            "removed": removed,
+            "unchanged": len(agent_cards) - len(to_build),
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        }
+        logger.info("🔄 Agent cards reloaded: %s", summary)
+        return summary
+
+
+def warm_up_models(
+    models: dict[str, ChatModel], timeout: float | None = None
+) -> dict[str, bool]:
+    """Warm up the backend connection of each model concurrently.
+
+    Failures are logged and reported as False; they never raise, a cold
+    connection only costs latency on the first request.
+
+    Args:
+        models: Models keyed by a display name.
+        timeout: Maximum seconds to wait for all warm-ups
+            (default: WARMUP_TIMEOUT env var, then 10).
+
+    Returns:
+        dict[str, bool]: Whether each model was warmed in time.
+    """
+    if not models:
+        return {}
+    if timeout is None:
+        timeout = float(os.getenv("WARMUP_TIMEOUT", "10"))
+
+    executor = ThreadPoolExecutor(
+        max_workers=_max_workers(len(models)), thread_name_prefix="warm-up"
+    )
+    futures = {
+        name: executor.submit(model.warm_up) for name, model in models.items()
+    }
+    wait(futures.values(), timeout=timeout)
+    # Do not block on stragglers; they finish in the background
+    executor.shutdown(wait=False)
+
+    results = {
+        name: future.done()
+        and future.exception() is None
+        and bool(future.result())
+        for name, future in futures.items()
+    }
+    logger.info(
+        "🔥 Warm-up: %d/%d models ready", sum(results.values()), len(results)
+    )
+    return results
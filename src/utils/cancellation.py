@@ -0,0 +1,130 @@
+"""
+File: cancellation.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+from __future__ import annotations
+
+from collections.abc import Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Event, Lock
+from weakref import WeakSet
+
+from langchain_core.runnables import RunnableConfig
+
+from src.utils.deadline import ConfigLike
+
+# Key under config["configurable"] holding the request CancelToken
+CANCEL_KEY = "cancel_token"
+
+
+class RequestCancelledError(BaseException):
+    """Raised inside a graph run whose client went away.
+
+    Derives from BaseException (like KeyboardInterrupt) so the broad
+    ``except Exception`` fallbacks of nodes, tools and retries let it
+    through instead of turning it into an answer nobody will read.
+    """
+
+
+class CancelToken:
+    """Thread-safe cancellation flag shared by everything a request runs.
+
+    A token with a ``parent`` is also cancelled with it, so one attempt
+    of a request can be stopped alone (see Resilience hedging).
+    """
+
+    def __init__(self, parent: CancelToken | None = None):
+        """Initialize a token that is not cancelled."""
+        self._event = Event()
+        self._lock = Lock()
+        # Children hold their parent, so a chain lives as long as its leaf;
+        # parents hold children weakly, so ended attempts do not pile up
+        self._parent = parent
+        self._children: WeakSet[CancelToken] = WeakSet()
+        self.reason: str | None = None
+        if parent is not None:
+            parent._adopt(self)
+
+    def _adopt(self, child: CancelToken) -> None:
+        """Cancel ``child`` with this token (now if already cancelled)."""
+        with self._lock:
+            if not self._event.is_set():
+                self._children.add(child)
+                return
+        child.cancel(self.reason or "cancelled")
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the request was cancelled."""
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        """Cancel the request and its child tokens (idempotent)."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            children = list(self._children)
+        for child in children:
+            child.cancel(reason)
+
+    def wait(self, timeout: float) -> bool:
+        """Sleep up to ``timeout`` seconds; True if cancelled meanwhile."""
+        return self._event.wait(timeout)
+
+    def raise_if_cancelled(self) -> None:
+        """Raise RequestCancelledError if the request was cancelled."""
+        if self._event.is_set():
+            raise RequestCancelledError(self.reason)
+
+
+_current_token: ContextVar[CancelToken | None] = ContextVar(
+    "request_cancel_token", default=None
+)
+
+
+def with_cancellation(
+    config: RunnableConfig | None, token: CancelToken
+) -> RunnableConfig:
+    """Return a config carrying ``token`` (the input is not modified)."""
+    config = RunnableConfig(**(config or {}))
+    config["configurable"] = {
+        **config.get("configurable", {}),
+        CANCEL_KEY: token,
+    }
+    return config
+
+
+def get_cancel_token(config: ConfigLike = None) -> CancelToken | None:
+    """Return the token of a config, or the one of the current scope."""
+    if config:
+        token = (config.get("configurable") or {}).get(CANCEL_KEY)
+        if token is not None:
+            return token
+    return _current_token.get()
+
+
+def raise_if_cancelled(config: ConfigLike = None) -> None:
+    """Raise RequestCancelledError if the current request was cancelled."""
+    token = get_cancel_token(config)
+    if token is not None:
+        token.raise_if_cancelled()
+
+
+@contextmanager
+def cancellation_scope(
+    token: CancelToken | None,
+) -> Generator[None, None, None]:
+    """Expose a token to code that does not receive the config."""
+    reset = _current_token.set(token)
+    try:
+        yield
+    finally:
+        _current_token.reset(reset)
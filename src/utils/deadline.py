@@ -0,0 +1,114 @@
+"""
+File: deadline.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+from __future__ import annotations
+
+from collections.abc import Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+import os
+import time
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
+
+# Key under config["configurable"] holding the absolute deadline (epoch s)
+DEADLINE_KEY = "deadline"
+
+ConfigLike = RunnableConfig | dict[str, Any] | None
+
+
+class DeadlineExceededError(TimeoutError):
+    """The request deadline passed before a model call could answer."""
+
+
+_current_deadline: ContextVar[float | None] = ContextVar(
+    "request_deadline", default=None
+)
+
+
+def with_deadline(
+    config: RunnableConfig | None, budget_s: float | None
+) -> RunnableConfig:
+    """
+    Return a config carrying a deadline ``budget_s`` seconds from now.
+
+    Args:
+        config: The config to extend (not modified).
+        budget_s: The latency budget; None or <= 0 means no deadline.
+
+    Returns:
+        RunnableConfig: The config with ``configurable.deadline`` set.
+    """
+    config = RunnableConfig(**(config or {}))
+    if budget_s and budget_s > 0:
+        config["configurable"] = {
+            **config.get("configurable", {}),
+            DEADLINE_KEY: time.time() + budget_s,
+        }
+    return config
+
+
+def get_deadline(config: ConfigLike) -> float | None:
+    """Return the deadline of a config, or the one of the current scope."""
+    if config:
+        deadline = (config.get("configurable") or {}).get(DEADLINE_KEY)
+        if deadline:
+            return float(deadline)
+    return _current_deadline.get()
+
+
+def remaining(config: ConfigLike = None) -> float | None:
+    """Seconds left before the deadline (None if there is no deadline)."""
+    deadline = get_deadline(config)
+    if deadline is None:
+        return None
+    return deadline - time.time()
+
+
+def call_timeout(config: ConfigLike = None) -> float | None:
+    """
+    Timeout for a blocking call: what is left of the request deadline.
+
+    Raises:
+        DeadlineExceededError: The deadline has already passed.
+
+    Returns:
+        float | None: Seconds left, or None if there is no deadline.
+    """
+    left = remaining(config)
+    if left is not None and left <= 0:
+        raise DeadlineExceededError("Request deadline exceeded")
+    return left
+
+
+def reserve_seconds() -> float:
+    """Time kept for the output stage once iterations must stop."""
+    return float(os.getenv("DEADLINE_RESERVE_MS", "1500")) / 1000
+
+
+def nearly_expired(
+    config: ConfigLike = None,
+    reserve: float | None = None,
+) -> bool:
+    """Whether less than ``reserve`` seconds are left (False if no deadline)."""
+    left = remaining(config)
+    if left is None:
+        return False
+    return left < (reserve_seconds() if reserve is None else reserve)
+
+
+@contextmanager
+def deadline_scope(deadline: float | None) -> Generator[None, None, None]:
+    """Expose a deadline to code that does not receive the config."""
+    token = _current_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _current_deadline.reset(token)
@@ -6,12 +6,39 @@ Author: Klaus
 MIT License
 """
 
+import atexit
+from functools import lru_cache
+import json
 import logging
+import logging.handlers
 import os
 from pathlib import Path
+import queue
 import sys
+from threading import Lock
 from typing import ClassVar, Optional
 
+# Resolved once; relative file links are computed against it and cached
+_CWD = Path.cwd()
+
+_PLAIN_FORMAT = "[%(asctime)s] (%(name)s) %(levelname)s | %(message)s"
+_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Argument types that are safe to format later in the listener thread
+_IMMUTABLE_ARGS = (str, int, float, bool, bytes, type(None))
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+@lru_cache(maxsize=1024)
+def _file_ref(pathname: str) -> str:
+    """Return the path relative to the working directory, or the filename."""
+    path = Path(pathname)
+    try:
+        return str(path.relative_to(_CWD))
+    except ValueError:
+        return path.name
+
 
 class ColoredFormatter(logging.Formatter):
     """Custom formatter with colors for log levels and file-specific colors."""
@@ -59,44 +86,11 @@ class ColoredFormatter(logging.Formatter):
 
     def _create_file_link(self, logger_name: str, record) -> str:
         """Create a clickable file link if possible."""
-        try:
-            # Get file path and line number from the log record
-            if hasattr(record, "pathname") and hasattr(record, "lineno"):
-                file_path = record.pathname
-                line_no = record.lineno
-
-                # Convert to relative path if it's in the project
-                try:
-                    from pathlib import Path
-
-                    abs_path = Path(file_path)
-                    current_dir = Path.cwd()
-
-                    # Try to get relative path for better IDE compatibility
-                    try:
-                        rel_path = abs_path.relative_to(current_dir)
-                        # Use relative path format that IDEs recognize
-                        file_ref = f"{rel_path}:{line_no}"
-                    except ValueError:
-                        # If not relative to current dir, use just filename
-                        file_ref = f"{abs_path.name}:{line_no}"
-
-                    return file_ref
-
-                except Exception:
-                    # Fallback to just the logger name
-                    pass
-
-            # Fallback: just return the logger name
-            short_name = (
-                logger_name.split(".")[-1]
-                if "." in logger_name
-                else logger_name
-            )
-            return short_name
-
-        except Exception:
-            return logger_name
+        pathname = getattr(record, "pathname", None)
+        if pathname:
+            return f"{_file_ref(pathname)}:{record.lineno}"
+        # Fallback: just return the logger name
+        return logger_name.rsplit(".", 1)[-1]
 
     def format(self, record) -> str:
         """Format log record with colors and file links."""
@@ -132,8 +126,121 @@ class ColoredFormatter(logging.Formatter):
         return formatted_message
 
 
+class JsonFormatter(logging.Formatter):
+    """Formatter emitting one JSON object per line (production logs)."""
+
+    def format(self, record) -> str:
+        """Format log record as a single JSON line."""
+        payload = {
+            "ts": self.formatTime(record, _DATE_FORMAT),
+            "level": record.levelname,
+            "logger": record.name,
+            "file": f"{_file_ref(record.pathname)}:{record.lineno}",
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep one in N DEBUG/INFO records for high-volume loggers.
+
+    Rates map a logger name prefix to the fraction of records kept
+    (e.g. ``{"src.models": 0.1}``). WARNING and above are never dropped.
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        """Initialize the filter with per-logger sampling rates."""
+        super().__init__()
+        self._every = {
+            name: max(1, round(1 / rate))
+            for name, rate in rates.items()
+            if 0 < rate < 1
+        }
+        self._counters: dict[str, int] = {}
+        self._lock = Lock()
+
+    def _every_for(self, logger_name: str) -> int:
+        best, every = -1, 1
+        for prefix, n in self._every.items():
+            if (
+                logger_name == prefix or logger_name.startswith(prefix + ".")
+            ) and len(prefix) > best:
+                best, every = len(prefix), n
+        return every
+
+    def filter(self, record) -> bool:
+        """Return whether the record should be emitted."""
+        if record.levelno >= logging.WARNING or not self._every:
+            return True
+        every = self._every_for(record.name)
+        if every == 1:
+            return True
+        with self._lock:
+            count = self._counters.get(record.name, 0)
+            self._counters[record.name] = count + 1
+        return count % every == 0
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that leaves formatting to the listener thread.
+
+    The stdlib handler formats every record in the calling thread. Records
+    whose arguments are immutable are enqueued as-is; only records carrying
+    mutable arguments are rendered eagerly so later mutations do not leak.
+    """
+
+    def prepare(self, record):
+        """Prepare the record for enqueuing."""
+        if record.args and not all(
+            isinstance(arg, _IMMUTABLE_ARGS)
+            for arg in (
+                record.args
+                if isinstance(record.args, tuple)
+                else (record.args,)
+            )
+        ):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+def _parse_sampling(spec: str | None) -> dict[str, float]:
+    """Parse ``name=rate,name=rate`` into a rates mapping."""
+    rates: dict[str, float] = {}
+    for item in (spec or "").split(","):
+        name, _, rate = item.partition("=")
+        if name.strip() and rate.strip():
+            try:
+                rates[name.strip()] = float(rate)
+            except ValueError:
+                print(f"Invalid log sampling rate '{item}', ignoring")
+    return rates
+
+
+def _stop_listener() -> None:
+    """Flush and stop the background logging thread, if running."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _restart_listener() -> None:
+    """Restart the logging thread in a forked child (threads do not fork)."""
+    if _listener is not None:
+        _listener._thread = None
+        _listener.start()
+
+
 def _is_notebook_environment() -> bool:
     """Check if we're running in a Jupyter notebook environment."""
+    # Only look for IPython if it is already loaded; importing it just to
+    # detect a notebook costs hundreds of milliseconds at startup
+    if "IPython" not in sys.modules:
+        return False
     try:
         # Check for IPython/Jupyter
         from IPython import get_ipython
@@ -223,6 +330,9 @@ def setup_logging(
     level: str | None = None,
     log_file: Optional[str] = None,
     use_colors: bool = True,
+    log_format: str | None = None,
+    async_mode: bool | None = None,
+    sampling: dict[str, float] | None = None,
 ) -> None:
     """
     Setup centralized logging configuration with colors.
@@ -237,6 +347,12 @@ def setup_logging(
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Optional file path to write logs to
         use_colors: Whether to use colored output (default: True)
+        log_format: Console format, "color", "plain" or "json"
+            (default: LOG_FORMAT env var, then "color")
+        async_mode: Format and write records in a background thread
+            (default: LOG_ASYNC env var, then False)
+        sampling: Fraction of DEBUG/INFO records kept per logger prefix
+            (default: parsed from LOG_SAMPLING, e.g. "src.models=0.1")
     """
     # Determine log level from environment or parameter
     env_level = os.getenv("PYTHONLOG") or os.getenv("LOG_LEVEL")
@@ -247,7 +363,15 @@ def setup_logging(
     if final_level not in valid_levels:
         print(f"Invalid log level '{final_level}', defaulting to INFO")
         final_level = "INFO"
-    # Remove all existing handlers
+
+    log_format = (log_format or os.getenv("LOG_FORMAT") or "color").lower()
+    if async_mode is None:
+        async_mode = os.getenv("LOG_ASYNC", "false").lower() == "true"
+    if sampling is None:
+        sampling = _parse_sampling(os.getenv("LOG_SAMPLING"))
+
+    # Remove all existing handlers (and stop a previous listener)
+    _stop_listener()
     root_logger = logging.getLogger()
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
@@ -255,22 +379,20 @@ def setup_logging(
     # Create console handler
     console_handler = logging.StreamHandler(sys.stdout)
 
-    if _should_use_colors(use_colors):
+    if log_format == "json":
+        console_formatter = JsonFormatter()
+    elif log_format == "color" and _should_use_colors(use_colors):
         # Use colored formatter for environments that support colors
         console_formatter = ColoredFormatter()
     else:
         # Use plain formatter for environments without color support
         console_formatter = logging.Formatter(
-            "[%(asctime)s] (%(name)s) %(levelname)s | %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
+            _PLAIN_FORMAT, datefmt=_DATE_FORMAT
         )
 
     console_handler.setFormatter(console_formatter)
     console_handler.setLevel(getattr(logging, final_level))
-
-    # Configure root logger
-    root_logger.setLevel(getattr(logging, final_level))
-    root_logger.addHandler(console_handler)
+    handlers: list[logging.Handler] = [console_handler]
 
     # Add file handler if specified (always without colors)
     if log_file:
@@ -278,16 +400,41 @@ def setup_logging(
         log_path.parent.mkdir(parents=True, exist_ok=True)
 
         file_handler = logging.FileHandler(log_path)
-        file_formatter = logging.Formatter(
-            "[%(asctime)s] (%(name)s) %(levelname)s | %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
+        file_formatter = (
+            JsonFormatter()
+            if log_format == "json"
+            else logging.Formatter(_PLAIN_FORMAT, datefmt=_DATE_FORMAT)
         )
         file_handler.setFormatter(file_formatter)
         file_handler.setLevel(getattr(logging, final_level))
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    # Configure root logger
+    root_logger.setLevel(getattr(logging, final_level))
+
+    if async_mode:
+        # Request threads only enqueue; formatting and I/O happen in the
+        # listener thread
+        global _listener
+        queue_handler = _DeferredQueueHandler(queue.SimpleQueue())
+        _listener = logging.handlers.QueueListener(
+            queue_handler.queue, *handlers, respect_handler_level=True
+        )
+        _listener.start()
+        handlers = [queue_handler]
+
+    for handler in handlers:
+        if sampling:
+            handler.addFilter(SamplingFilter(sampling))
+        root_logger.addHandler(handler)
 
     # Log the selected level
-    root_logger.debug(f"Logging initialized with level: {final_level}")
+    root_logger.debug(
+        "Logging initialized with level: %s (format=%s, async=%s)",
+        final_level,
+        log_format,
+        async_mode,
+    )
 
     # Set specific loggers to appropriate levels to reduce noise
     for logger_name in [
@@ -335,5 +482,11 @@ def suppress_google_warnings():
     _suppress_grpc_warnings()
 
 
+# Make sure queued records are flushed on interpreter shutdown
+atexit.register(_stop_listener)
+# Pre-forked workers (src.app.launcher) need their own listener thread
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_listener)
+
 # Initialize default logging on import
 setup_logging()
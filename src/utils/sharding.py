@@ -0,0 +1,42 @@
+"""
+File: sharding.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+import hashlib
+import os
+
+
+def shard_for(key: str, workers: int) -> int:
+    """
+    Worker index of a routing key (thread_id or vehicle_id).
+
+    Uses blake2b rather than ``hash()``, which is randomized per process,
+    so every run, every proxy instance and every worker agrees.
+    """
+    digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % workers
+
+
+def owns(key: str) -> bool:
+    """
+    Whether this process serves ``key``.
+
+    Launcher workers (WORKER_INDEX of WORKER_COUNT) own the keys the proxy
+    routes to them; a single process owns every key.
+    """
+    index = os.getenv("WORKER_INDEX")
+    count = os.getenv("WORKER_COUNT")
+    if not index or not count:
+        return True
+    return shard_for(key, int(count)) == int(index)
+
+
+def worker_sockets() -> list[str]:
+    """Unix sockets of the launcher workers, by index (none otherwise)."""
+    paths = os.getenv("WORKER_SOCKETS", "")
+    return [path for path in paths.split(os.pathsep) if path]
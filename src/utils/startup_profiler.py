@@ -0,0 +1,198 @@
+"""
+File: startup_profiler.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+
+Measure cold start in a fresh interpreter: import time per module
+(``python -X importtime``) and time-to-ready (app imported, agents
+initialized and chat graph compiled).
+
+Usage:
+    python -m src.utils.startup_profiler --top 25 --budget 3.0
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass, field
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Script executed in the fresh interpreter. The ready phase mirrors the app
+# lifespan so the report reflects what a worker pays before serving.
+_PROBE = """
+import json, time
+t0 = time.perf_counter()
+import {module}
+t1 = time.perf_counter()
+if {ready}:
+    from src.utils.agent_initializer import initialize_external_agents
+    from src.graphs.factory import create_chat_graph, create_chat_models
+    initialize_external_agents()
+    create_chat_graph(create_chat_models()).compile()
+t2 = time.perf_counter()
+print("__STARTUP__" + json.dumps({{"import_s": t1 - t0, "ready_s": t2 - t0}}))
+"""
+
+
+@dataclass
+class ModuleImport:
+    """Import time of a single module, in seconds."""
+
+    name: str
+    self_s: float
+    cumulative_s: float
+
+
+@dataclass
+class StartupReport:
+    """Result of a startup profiling run."""
+
+    module: str
+    import_s: float
+    ready_s: float | None
+    process_s: float
+    modules: list[ModuleImport] = field(default_factory=list)
+
+    def top(self, n: int = 20) -> list[ModuleImport]:
+        """Return the n modules with the highest cumulative import time."""
+        ranked = sorted(
+            self.modules, key=lambda m: m.cumulative_s, reverse=True
+        )
+        return ranked[:n]
+
+
+def _parse_importtime(stderr: str) -> list[ModuleImport]:
+    """Parse ``-X importtime`` output (microseconds) into records."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        modules.append(
+            ModuleImport(
+                name=parts[2].strip(),
+                self_s=int(parts[0]) / 1e6,
+                cumulative_s=int(parts[1]) / 1e6,
+            )
+        )
+    return modules
+
+
+def profile_startup(
+    module: str = "src.app.main", ready: bool = True
+) -> StartupReport:
+    """
+    Profile the startup of a module in a fresh interpreter.
+
+    Args:
+        module: The module to import (the ASGI app module by default).
+        ready: Also initialize agents and compile the graph.
+
+    Returns:
+        StartupReport: Import and time-to-ready measurements.
+
+    Raises:
+        RuntimeError: If the probe process fails.
+    """
+    probe = _PROBE.format(module=module, ready=ready)
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": os.getcwd()},
+        check=False,
+    )
+    process_s = time.perf_counter() - start
+
+    marker = next(
+        (
+            line
+            for line in proc.stdout.splitlines()
+            if line.startswith("__STARTUP__")
+        ),
+        None,
+    )
+    if proc.returncode != 0 or marker is None:
+        tail = "\n".join(proc.stderr.splitlines()[-20:])
+        raise RuntimeError(f"Startup probe failed:\n{tail}")
+
+    timings = json.loads(marker[len("__STARTUP__") :])
+    return StartupReport(
+        module=module,
+        import_s=timings["import_s"],
+        ready_s=timings["ready_s"] if ready else None,
+        process_s=process_s,
+        modules=_parse_importtime(proc.stderr),
+    )
+
+
+def format_report(report: StartupReport, top: int = 20) -> str:
+    """Render a startup report as a plain text table."""
+    lines = [
+        f"Startup profile for {report.module}",
+        f"  interpreter + probe : {report.process_s:8.3f}s",
+        f"  import              : {report.import_s:8.3f}s",
+    ]
+    if report.ready_s is not None:
+        lines.append(f"  time-to-ready       : {report.ready_s:8.3f}s")
+    lines.append("")
+    lines.append(f"  {'cumulative':>10}  {'self':>8}  module")
+    for m in report.top(top):
+        lines.append(f"  {m.cumulative_s:9.3f}s  {m.self_s:7.3f}s  {m.name}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command line entry point; returns 1 if the budget is exceeded."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--module", default="src.app.main")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=float(os.getenv("STARTUP_BUDGET_SECONDS", "0") or 0),
+        help="Fail if time-to-ready (or import time) exceeds this (seconds)",
+    )
+    parser.add_argument(
+        "--no-ready",
+        action="store_true",
+        help="Only measure imports (no agent init or graph compile)",
+    )
+    parser.add_argument("--json", action="store_true", help="JSON output")
+    args = parser.parse_args(argv)
+
+    report = profile_startup(args.module, ready=not args.no_ready)
+    if args.json:
+        payload = {
+            "module": report.module,
+            "import_s": report.import_s,
+            "ready_s": report.ready_s,
+            "process_s": report.process_s,
+            "top": [m.__dict__ for m in report.top(args.top)],
+        }
+        print(json.dumps(payload, indent=2))
+    else:
+        print(format_report(report, args.top))
+
+    measured = report.ready_s if report.ready_s is not None else report.import_s
+    if args.budget and measured > args.budget:
+        print(
+            f"Startup budget exceeded: {measured:.3f}s > {args.budget:.3f}s",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
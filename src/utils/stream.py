@@ -8,14 +8,32 @@ MIT License
 """
 
 import asyncio
+from collections.abc import Awaitable
 import concurrent.futures
-from typing import Callable
+import os
+from threading import Lock
+import time
+from typing import Any, Callable
 
+from langchain_core.runnables import RunnableConfig
+
+from src.utils.cancellation import CancelToken, RequestCancelledError
+from src.utils.deadline import ConfigLike
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-CONTINUE_STREAM_TYPES = ["chunk", "reasoning", "end"]
+CONTINUE_STREAM_TYPES = [
+    "chunk",
+    "reasoning",
+    "tool_call",
+    "agent_chunk",
+    "agent_reasoning",
+    "end",
+]
+
+# Key under config["configurable"] holding the request stream callback
+STREAM_KEY = "stream_callback"
 
 
 class Streamer:
@@ -23,28 +41,44 @@ class Streamer:
     Streamer class.
     """
 
-    def __init__(self, queue: asyncio.Queue):
+    def __init__(
+        self,
+        queue: asyncio.Queue,
+        cancel_token: CancelToken | None = None,
+        is_disconnected: Callable[[], Awaitable[bool]] | None = None,
+    ):
         """
         Initialize the streamer.
 
         Args:
             queue (Queue): The queue to use for streaming.
+            cancel_token (CancelToken, optional): Cancelled when the client
+                disconnects; pass it to the graph through its config.
+            is_disconnected (Callable, optional): Async disconnect probe
+                (e.g. ``Request.is_disconnected``).
         """
         self._queue = queue
         self._timeout = 5
         self._max_retries = 5
         self._current_retries = 0
         self._task = None
+        self.cancel_token = cancel_token or CancelToken()
+        self._is_disconnected = is_disconnected
 
     async def run_task(self, task: Callable, *args, **kwargs):
         """
         Run the task and stream the result to the queue.
 
+        If the client disconnects (detected by the probe or by the response
+        closing this generator), the cancel token is set so the graph stops
+        at its next node, tool call, model call or streamed chunk.
+
         Args:
             task (Callable): The task to run.
             *args: The arguments to pass to the task.
             **kwargs: The keyword arguments to pass to the task.
         """
+        graph_task = None
         try:
             # Start the graph execution in a separate task
 
@@ -64,7 +98,14 @@ class Streamer:
                         break
                 except asyncio.TimeoutError:
                     # No more data in queue, continue
-                    pass
+                    if await self._client_gone():
+                        self.cancel_token.cancel("client disconnected")
+                        return
+            else:
+                # Flush what the graph queued right before finishing
+                while not self._queue.empty():
+                    stream_json = self._queue.get_nowait()
+                    yield f"data: {stream_json}\n\n"
 
             # Wait for graph to complete
             await graph_task
@@ -77,23 +118,43 @@ class Streamer:
         except Exception as e:
             logger.error(f"Stream error: {e}")
             yield f"data: {{'type': 'error', 'message': '{e!s}'}}\n\n"
+        finally:
+            if graph_task is not None and not graph_task.done():
+                # Generator closed early: the client is gone
+                self.cancel_token.cancel("client disconnected")
+                logger.info("🔌 Client disconnected, cancelling graph run")
+
+    async def _client_gone(self) -> bool:
+        """Whether the disconnect probe reports a closed client."""
+        if self._is_disconnected is None:
+            return False
+        try:
+            return await self._is_disconnected()
+        except Exception:
+            return False
 
     async def _run_graph_task(self, task: Callable, *args, **kwargs):
         """Run the graph task and return the result."""
+        # Run the graph in a thread pool to avoid blocking
+        executor = concurrent.futures.ThreadPoolExecutor()
         try:
-            # Run the graph in a thread pool to avoid blocking
-
             loop = asyncio.get_event_loop()
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                # Pass args and kwargs separately to the executor
-                def run_with_config():
-                    return task(*args, **kwargs)
 
-                result = await loop.run_in_executor(executor, run_with_config)
-            return result
+            # Pass args and kwargs separately to the executor
+            def run_with_config():
+                return task(*args, **kwargs)
+
+            return await loop.run_in_executor(executor, run_with_config)
+        except RequestCancelledError as e:
+            logger.info("🔌 Graph run cancelled: %s", e)
+            return None
         except Exception as e:
             logger.error(f"Graph execution error: {e}")
             raise
+        finally:
+            # Never block the event loop on a thread that is still winding
+            # down after a cancellation
+            executor.shutdown(wait=False)
 
     def should_stop_streaming(self, stream_json: dict):
         """
@@ -106,23 +167,143 @@ class Streamer:
             return False
         return True
 
-    def stream(self, text: str, type: str = "chunk"):
+    def stream(self, text: str, type: str = "chunk", **fields: Any):
         """
         Stream the chunk to the queue.
 
         Args:
             text (str): The text to stream.
+            type (str): The event type.
+            **fields: Extra event fields (e.g. ``agent``).
         """
-        self._queue.put_nowait({"type": type, "data": text})
+        self._queue.put_nowait({"type": type, "data": text, **fields})
+
+    def pending(self) -> int:
+        """Number of events queued and not yet sent to the client."""
+        return self._queue.qsize()
+
+
+class TokenStream:
+    """Coalesce model tokens into a bounded number of stream events.
+
+    Tokens are sent as ``chunk_type`` events once ``flush_chars``
+    characters or ``flush_interval`` seconds have accumulated, and keep
+    coalescing while the client is ``max_pending`` events behind, so a
+    fast model adds a bounded number of events to the request queue
+    however slow the client reads.
+    """
+
+    def __init__(
+        self,
+        parent: Any,
+        chunk_type: str,
+        flush_chars: int | None = None,
+        flush_interval: float = 0.05,
+        max_pending: int | None = None,
+        **fields: Any,
+    ):
+        """Initialize a stream of ``chunk_type`` events to ``parent``."""
+        self._parent = parent
+        self._chunk_type = chunk_type
+        self._fields = fields
+        self._flush_chars = flush_chars or int(
+            os.getenv("AGENT_STREAM_FLUSH_CHARS", "32")
+        )
+        self._flush_interval = flush_interval
+        self._max_pending = max_pending or int(
+            os.getenv("STREAM_MAX_PENDING", "64")
+        )
+        self._buffer: list[str] = []
+        self._buffered = 0
+        self._last_flush = time.monotonic()
+        self._lock = Lock()
+
+    def _backlogged(self) -> bool:
+        pending = getattr(self._parent, "pending", None)
+        return pending is not None and pending() >= self._max_pending
+
+    def _flush(self) -> None:
+        if self._buffer:
+            text = "".join(self._buffer)
+            self._buffer.clear()
+            self._buffered = 0
+            stream_if_available(
+                self._parent, text, self._chunk_type, **self._fields
+            )
+        self._last_flush = time.monotonic()
+
+    def token(self, text: str) -> None:
+        """Add a token."""
+        with self._lock:
+            self._buffer.append(text)
+            self._buffered += len(text)
+            due = (
+                self._buffered >= self._flush_chars
+                or time.monotonic() - self._last_flush >= self._flush_interval
+            )
+            if due and not self._backlogged():
+                self._flush()
+
+    def event(self, text: str, type: str) -> None:
+        """Send another event, after the tokens that preceded it."""
+        with self._lock:
+            self._flush()
+            stream_if_available(self._parent, text, type, **self._fields)
+
+    def close(self) -> None:
+        """Send the tokens still buffered."""
+        with self._lock:
+            self._flush()
+
+
+class DelegatedStream(TokenStream):
+    """Forward a delegated agent's output to the request stream.
+
+    Tokens become ``agent_chunk`` events and status lines (tool calls)
+    ``agent_reasoning`` events, both tagged with the agent name.
+    """
+
+    def __init__(self, parent: Any, agent: str, **kwargs: Any):
+        """Initialize a stream forwarding to ``parent`` for ``agent``."""
+        super().__init__(parent, "agent_chunk", agent=agent, **kwargs)
+        self.agent = agent
+
+    def stream(self, text: str, type: str = "chunk", **fields: Any) -> None:
+        """Forward a stream event of the delegated agent (tagged)."""
+        if type == "chunk":
+            self.token(text)
+        else:
+            self.event(text, f"agent_{type}")
+
+
+def with_stream_callback(
+    config: RunnableConfig | None, callback: Any
+) -> RunnableConfig:
+    """Return a config carrying ``callback`` (the input is not modified)."""
+    config = RunnableConfig(**(config or {}))
+    config["configurable"] = {
+        **config.get("configurable", {}),
+        STREAM_KEY: callback,
+    }
+    return config
+
+
+def get_stream_callback(config: ConfigLike = None) -> Any:
+    """Return the stream callback of a config, or None."""
+    if not config:
+        return None
+    return (config.get("configurable") or {}).get(STREAM_KEY)
 
 
-def stream_if_available(stream_callback, text: str, type: str = "chunk"):
+def stream_if_available(
+    stream_callback, text: str, type: str = "chunk", **fields: Any
+):
     """
     Stream the text if the stream callback is available.
     """
     if stream_callback and hasattr(stream_callback, "stream"):
         try:
-            stream_callback.stream(text, type)
+            stream_callback.stream(text, type, **fields)
         except Exception as e:
             # Log error but don't break the flow
             logger.error(f"Streaming error: {e}")
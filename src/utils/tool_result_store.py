@@ -0,0 +1,136 @@
+"""
+File: tool_result_store.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import os
+from threading import Lock
+from typing import Any, ClassVar
+import uuid
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Name of the tool that reads offloaded results (src.tools.tool_results)
+READ_TOOL_NAME = "read_tool_result"
+
+
+def max_result_chars() -> int:
+    """Characters of a tool result kept in the message history."""
+    return int(os.getenv("TOOL_RESULT_MAX_CHARS", "4000"))
+
+
+class ToolResultStore:
+    """Process-wide LRU store of full tool results kept out of the prompt.
+
+    Every message of the tool loop is re-sent to the model on each
+    iteration, so a large tool result (or a verbose delegated agent) is
+    paid for again and again. ``compact`` keeps at most
+    TOOL_RESULT_MAX_CHARS characters in the message and stores the full
+    payload here under a reference the model can read on demand with
+    ``read_tool_result``. The store is bounded by TOOL_RESULT_STORE_MAX_MB;
+    the least recently used results are dropped first.
+    """
+
+    _results: ClassVar[OrderedDict[str, tuple[str, int]]] = OrderedDict()
+    _size: ClassVar[int] = 0
+    _offloaded: ClassVar[int] = 0
+    _reads: ClassVar[int] = 0
+    _misses: ClassVar[int] = 0
+    _evictions: ClassVar[int] = 0
+    _lock: ClassVar[Lock] = Lock()
+
+    @classmethod
+    def put(cls, content: str) -> str:
+        """Store a result and return its reference."""
+        ref = uuid.uuid4().hex[:12]
+        size = len(content.encode())
+        max_mb = float(os.getenv("TOOL_RESULT_STORE_MAX_MB", "32"))
+        max_size = int(max_mb * 2**20)
+        with cls._lock:
+            cls._results[ref] = (content, size)
+            cls._size += size
+            cls._offloaded += 1
+            while cls._size > max_size and len(cls._results) > 1:
+                _, (_, dropped) = cls._results.popitem(last=False)
+                cls._size -= dropped
+                cls._evictions += 1
+        return ref
+
+    @classmethod
+    def get(cls, ref: str) -> str | None:
+        """Return a stored result (None if unknown or evicted)."""
+        with cls._lock:
+            entry = cls._results.get(ref)
+            if entry is None:
+                cls._misses += 1
+                return None
+            cls._results.move_to_end(ref)
+            cls._reads += 1
+            return entry[0]
+
+    @classmethod
+    def compact(
+        cls, content: str, readable: bool = True, max_chars: int | None = None
+    ) -> str:
+        """
+        Return ``content`` capped for the message history.
+
+        Args:
+            content: The full tool result.
+            readable: Whether the model can call ``read_tool_result``; if
+                not, the result is only truncated (nothing is stored).
+            max_chars: Cap (default: TOOL_RESULT_MAX_CHARS, 0 disables).
+
+        Returns:
+            str: The content itself when short enough, otherwise its head
+                followed by a note with the total size and the reference.
+        """
+        if max_chars is None:
+            max_chars = max_result_chars()
+        if max_chars <= 0 or len(content) <= max_chars:
+            return content
+        head = content[:max_chars]
+        # Prefer cutting at a line break when one is reasonably close
+        cut = head.rfind("\n")
+        if cut > max_chars * 0.8:
+            head = head[:cut]
+        note = f"[Resultado truncado: {len(head)} de {len(content)} caracteres."
+        if readable:
+            ref = cls.put(content)
+            note += (
+                f' Use {READ_TOOL_NAME}(ref="{ref}", offset={len(head)})'
+                " para ler o restante.]"
+            )
+        else:
+            note += "]"
+        logger.debug("📦 Tool result compacted: %d chars", len(content))
+        return f"{head}\n\n{note}"
+
+    @classmethod
+    def metrics(cls) -> dict[str, Any]:
+        """Return store size and counters."""
+        with cls._lock:
+            return {
+                "results": len(cls._results),
+                "size_mb": round(cls._size / 2**20, 2),
+                "offloaded": cls._offloaded,
+                "reads": cls._reads,
+                "misses": cls._misses,
+                "evictions": cls._evictions,
+            }
+
+    @classmethod
+    def clear(cls) -> None:
+        """Drop every stored result."""
+        with cls._lock:
+            cls._results.clear()
+            cls._size = 0
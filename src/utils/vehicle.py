@@ -0,0 +1,46 @@
+"""
+File: vehicle.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+from __future__ import annotations
+
+from langchain_core.runnables import RunnableConfig
+
+from src.utils.deadline import ConfigLike
+
+# Key under config["configurable"] holding the vehicle of the request
+VEHICLE_KEY = "vehicle_id"
+
+
+def with_vehicle(
+    config: RunnableConfig | None, vehicle_id: str | None
+) -> RunnableConfig:
+    """
+    Return a config carrying the vehicle a request is about.
+
+    Args:
+        config: The config to extend (not modified).
+        vehicle_id: The vehicle; None leaves the default vehicle.
+
+    Returns:
+        RunnableConfig: The config with ``configurable.vehicle_id`` set.
+    """
+    config = RunnableConfig(**(config or {}))
+    if vehicle_id:
+        config["configurable"] = {
+            **config.get("configurable", {}),
+            VEHICLE_KEY: vehicle_id,
+        }
+    return config
+
+
+def get_vehicle_id(config: ConfigLike = None) -> str | None:
+    """Return the vehicle of a config, or None."""
+    if not config:
+        return None
+    return (config.get("configurable") or {}).get(VEHICLE_KEY)
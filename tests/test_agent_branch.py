@@ -0,0 +1,157 @@
+"""
+File: test_agent_branch.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.constants import END, START
+from langgraph.graph import StateGraph
+import pytest
+
+from src.data_models.agent_card import AgentCard
+from src.data_models.graph_state import CarSystemState
+from src.models.base._chat_model import ChatModel
+from src.nodes.agent_branch import AgentBranch
+from src.nodes.reasoning_node import DELEGATION_TOOL_NAME, ReasoningNode
+from src.services.agent_registry import AgentRegistry
+from src.tools.registry_interaction import invoke_agent
+
+
+class ScriptedModel(ChatModel):
+    """Chat model answering with a fixed list of replies."""
+
+    def __init__(self, *replies: AIMessage, tools: list | None = None):
+        """Keep the replies and the messages of every call."""
+        self.replies = list(replies)
+        self.calls: list[list] = []
+        super().__init__(prompt="", tools=tools, name="scripted")
+
+    def invoke(self, messages=None):
+        """Return the next reply (or raise it)."""
+        self.calls.append(list(messages or []))
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    def stream(self, messages=None):
+        """Not used: the graph runs without a stream callback."""
+        raise NotImplementedError
+
+    def invoke_with_structured_output(self, schema):
+        """Not used by the reasoning node."""
+        raise NotImplementedError
+
+    def set_tools(self, tools):
+        """Keep the tools, nothing to bind."""
+        self.tools = tools or []
+
+
+def delegation(*agents: str) -> AIMessage:
+    """Model turn calling ``invoke_agent`` once per agent."""
+    return AIMessage(
+        content="",
+        tool_calls=[
+            {
+                "name": DELEGATION_TOOL_NAME,
+                "args": {"agent_name": agent, "query": "Vai chover?"},
+                "id": f"call-{agent}",
+            }
+            for agent in agents
+        ],
+    )
+
+
+@pytest.fixture(autouse=True)
+def registry():
+    """Empty agent registry around each test."""
+    AgentRegistry.clear()
+    yield
+    AgentRegistry.clear()
+    AgentRegistry.set_model_factory(None)
+
+
+def build_graph(model: ChatModel, agents: list[str]):
+    """Reasoning node fanning out to one branch per agent."""
+    agent_nodes = {agent: f"agent_{agent.lower()}" for agent in agents}
+    workflow = StateGraph(state_schema=CarSystemState)
+    workflow.add_node(
+        "reasoning_node",
+        ReasoningNode(
+            routing_options={
+                "next_node": END,
+                "end": END,
+                "agent_branch": "agent_branch",
+            },
+            model=model,
+            agent_nodes=agent_nodes,
+        ),
+    )
+    for node in ["agent_branch", *agent_nodes.values()]:
+        workflow.add_node(node, AgentBranch(node))
+        workflow.add_edge(node, "reasoning_node")
+    workflow.add_edge(START, "reasoning_node")
+    return workflow.compile()
+
+
+def answers(messages: list) -> dict[str, str]:
+    """Content of the delegation ToolMessages keyed by call id."""
+    return {
+        m.tool_call_id: m.content
+        for m in messages
+        if isinstance(m, ToolMessage) and m.name == DELEGATION_TOOL_NAME
+    }
+
+
+def test_fan_out_survives_failing_agents():
+    """Failing agents answer as unavailable; the others still answer."""
+    AgentRegistry.register(
+        AgentCard(name="Clima"), ScriptedModel(AIMessage("Sol em Santos"))
+    )
+    # The first model call fails (as when it runs into the deadline)
+    AgentRegistry.register(
+        AgentCard(name="Quebrado"), ScriptedModel(RuntimeError("boom"))
+    )
+
+    def broken_factory(card: AgentCard):
+        raise RuntimeError("no client")
+
+    AgentRegistry.register(AgentCard(name="Preguicoso"))
+    AgentRegistry.set_model_factory(broken_factory)
+    reasoning = ScriptedModel(
+        delegation("Clima", "Quebrado", "Preguicoso"),
+        AIMessage("Sol em Santos."),
+        tools=[invoke_agent],
+    )
+    graph = build_graph(reasoning, ["Clima", "Quebrado"])
+
+    state = graph.invoke({"messages": [HumanMessage("Vai chover em Santos?")]})
+
+    assert state["processing_status"] == "analysis_completed"
+    assert state["analysis_result"]["analysis"] == "Sol em Santos."
+    assert state["agent_results"] == []
+    # The second reasoning turn saw one answer per call
+    joined = answers(reasoning.calls[1])
+    assert joined["call-Clima"] == "Sol em Santos"
+    assert joined["call-Quebrado"].startswith("Agente 'Quebrado' indisponível")
+    assert "boom" in joined["call-Quebrado"]
+    assert joined["call-Preguicoso"] == (
+        "Agente 'Preguicoso' indisponível: no client"
+    )
+    agents = AgentBranch.metrics()["agents"]
+    assert agents["Preguicoso"]["failures"] >= 1
+
+
+def test_invoke_without_an_answer_reports_the_error():
+    """An agent run with no answer returns its error as text."""
+    AgentRegistry.register(
+        AgentCard(name="Quebrado"), ScriptedModel(RuntimeError("boom"))
+    )
+
+    answer = AgentRegistry.invoke("Quebrado", "Vai chover?")
+
+    assert answer.startswith("Agente 'Quebrado' indisponível")
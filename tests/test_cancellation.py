@@ -0,0 +1,47 @@
+"""
+File: test_cancellation.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.utils.cancellation import CancelToken, RequestCancelledError
+
+
+def test_parent_cancel_wakes_waiting_children():
+    """Cancelling a request wakes the tokens of its attempts."""
+    request = CancelToken()
+    attempt = CancelToken(CancelToken(request))
+    timer = threading.Timer(0.05, request.cancel, ("client gone",))
+    timer.start()
+
+    start = time.perf_counter()
+    assert attempt.wait(5)
+    assert time.perf_counter() - start < 1
+    assert attempt.reason == "client gone"
+    with pytest.raises(RequestCancelledError):
+        attempt.raise_if_cancelled()
+
+
+def test_child_of_a_cancelled_parent_starts_cancelled():
+    """A token created after its parent was cancelled is cancelled."""
+    request = CancelToken()
+    request.cancel("client gone")
+
+    assert CancelToken(request).cancelled
+
+
+def test_child_cancel_leaves_the_parent_running():
+    """Stopping one attempt does not cancel the request."""
+    request = CancelToken()
+    CancelToken(request).cancel("hedge won")
+
+    assert not request.cancelled
+    assert not request.wait(0)
@@ -0,0 +1,78 @@
+"""
+File: test_cassette.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+from langchain_core.messages import AIMessage, HumanMessage
+import pytest
+
+from src.models.base._chat_model import ChatModel
+from src.models.cassette import CassetteModel, wrap_with_cassette
+from src.tools.calculations import is_trip_possible
+
+
+class EchoModel(ChatModel):
+    """Chat model answering with the last message."""
+
+    def invoke(self, messages=None):
+        """Echo the content of the last message."""
+        return AIMessage(f"eco: {messages[-1].content}")
+
+    def stream(self, messages=None):
+        """Not used by these tests."""
+        raise NotImplementedError
+
+    def invoke_with_structured_output(self, schema):
+        """Not used by these tests."""
+        raise NotImplementedError
+
+    def set_tools(self, tools):
+        """Keep the tools, nothing to bind."""
+        self.tools = tools or []
+
+
+@pytest.fixture(autouse=True)
+def cassettes(monkeypatch, tmp_path):
+    """Cassette files in a temporary directory, replayed instantly."""
+    monkeypatch.setenv("LLM_CASSETTE_DIR", str(tmp_path))
+    monkeypatch.setenv("LLM_CASSETTE_LATENCY_SCALE", "0")
+
+
+def wrap(build, mode: str, monkeypatch) -> ChatModel:
+    """Wrap the model of a reasoning-like node in the given mode."""
+    monkeypatch.setenv("LLM_CASSETTE_MODE", mode)
+    return wrap_with_cassette(
+        build, "reasoning_node", prompt="Planeje.", tools=[is_trip_possible]
+    )
+
+
+def test_replay_does_not_build_the_model(monkeypatch):
+    """Replay serves the recording without building the provider model."""
+    question = [HumanMessage("Dá para ir a Santos?")]
+    recorder = wrap(
+        lambda: EchoModel(prompt="Planeje.", tools=[is_trip_possible]),
+        "record",
+        monkeypatch,
+    )
+    recorded = recorder.invoke(question)
+
+    def no_client():
+        raise AssertionError("the model must not be built in replay")
+
+    player = wrap(no_client, "replay", monkeypatch)
+
+    assert isinstance(player, CassetteModel)
+    assert player.wrapped is None
+    assert player.warm_up()
+    assert player.invoke(question).content == recorded.content
+
+
+def test_disabled_cassette_returns_the_built_model(monkeypatch):
+    """Without LLM_CASSETTE_MODE the built model is used as is."""
+    model = EchoModel(prompt="Planeje.")
+
+    assert wrap(lambda: model, "", monkeypatch) is model
@@ -0,0 +1,91 @@
+"""
+File: test_fleet_view.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+from src.data_models.telemetry import TelemetrySample
+from src.services.car.fleet_view import (
+    FleetView,
+    TelemetryUnavailableError,
+    _decode_snapshots,
+    encode_snapshots,
+)
+from src.services.car.history import TelemetryHistory
+from src.services.car.telemetry import TelemetryService
+from src.utils.sharding import owns
+
+
+@pytest.fixture(autouse=True)
+def telemetry(monkeypatch, tmp_path):
+    """Empty telemetry, its history in a temporary directory."""
+    monkeypatch.setenv("TELEMETRY_HISTORY_DIR", str(tmp_path))
+    monkeypatch.delenv("WORKER_SOCKETS", raising=False)
+    TelemetryService.clear()
+    TelemetryHistory.clear()
+    yield
+    TelemetryService.clear()
+    TelemetryHistory.clear()
+    FleetView.close()
+
+
+def ingest(*vehicle_ids: str) -> None:
+    """Store one sample per vehicle."""
+    TelemetryService.ingest(
+        TelemetrySample(vehicle_id=v, fuel_liters=40.0, autonomy_km_l=10.0)
+        for v in vehicle_ids
+    )
+
+
+def test_snapshots_survive_the_json_round_trip():
+    """Missing values travel as null and come back as NaN."""
+    ingest("a", "b")
+    ids, cols = TelemetryService.snapshots()
+
+    payload = json.loads(json.dumps(encode_snapshots(ids, cols)))
+    decoded_ids, decoded = _decode_snapshots(payload)
+
+    assert decoded_ids == ids
+    assert payload["columns"]["speed_kmh"] == [None, None]
+    for name, col in cols.items():
+        np.testing.assert_array_equal(decoded[name], col)
+
+
+def test_single_process_reads_are_local():
+    """Without launcher workers the local table is the fleet."""
+    ingest("a", "b")
+
+    ids, _, unavailable = FleetView.snapshots()
+
+    assert sorted(ids) == ["a", "b"]
+    assert unavailable == 0
+    assert FleetView.latest("a")["fuel_liters"] == pytest.approx(40.0)
+    assert FleetView.metrics()["requests"] == 0
+
+
+def test_unreachable_worker_is_reported(monkeypatch, tmp_path):
+    """A worker that does not answer is counted, not silently dropped."""
+    sockets = [str(tmp_path / f"worker-{i}.sock") for i in range(2)]
+    monkeypatch.setenv("WORKER_SOCKETS", os.pathsep.join(sockets))
+    monkeypatch.setenv("WORKER_INDEX", "0")
+    monkeypatch.setenv("WORKER_COUNT", "2")
+    vehicles = [f"V{i:03d}" for i in range(20)]
+    local = [v for v in vehicles if owns(v)]
+    remote = next(v for v in vehicles if not owns(v))
+    ingest(*local)
+
+    ids, _, unavailable = FleetView.snapshots()
+
+    assert sorted(ids) == sorted(local)
+    assert unavailable == 1
+    with pytest.raises(TelemetryUnavailableError):
+        FleetView.latest(remote)
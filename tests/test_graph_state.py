@@ -0,0 +1,56 @@
+"""
+File: test_graph_state.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+from typing import Annotated, TypedDict
+
+from langgraph.graph import END, START, StateGraph
+
+from src.data_models.graph_state import merge_agent_results
+
+
+def test_merge_appends_branch_results():
+    """Updates are appended to the current results."""
+    first = [{"agent": "a", "answer": "1"}]
+    second = [{"agent": "b", "answer": "2"}]
+
+    assert merge_agent_results(None, first) == first
+    assert merge_agent_results(first, second) == first + second
+    # The inputs are not modified
+    assert first == [{"agent": "a", "answer": "1"}]
+
+
+def test_merge_none_clears_the_results():
+    """A None update clears the results."""
+    assert merge_agent_results([{"agent": "a"}], None) == []
+    assert merge_agent_results(None, None) == []
+
+
+class _State(TypedDict):
+    agent_results: Annotated[list[dict], merge_agent_results]
+
+
+def test_parallel_branches_are_merged():
+    """Results of parallel branches are all kept."""
+
+    def branch(name: str):
+        return lambda state: {"agent_results": [{"agent": name}]}
+
+    graph = StateGraph(_State)
+    graph.add_node("a", branch("a"))
+    graph.add_node("b", branch("b"))
+    graph.add_node("join", lambda state: {})
+    graph.add_edge(START, "a")
+    graph.add_edge(START, "b")
+    graph.add_edge(["a", "b"], "join")
+    graph.add_edge("join", END)
+    app = graph.compile()
+
+    results = app.invoke({"agent_results": None})["agent_results"]
+
+    assert sorted(r["agent"] for r in results) == ["a", "b"]
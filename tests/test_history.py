@@ -0,0 +1,142 @@
+"""
+File: test_history.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+import numpy as np
+import pytest
+
+from src.services.car.history import (
+    COLUMNS,
+    downsample,
+    estimate_consumption,
+)
+
+MINUTE = 60.0
+DAY = 86400.0
+
+
+def drive(
+    minutes: int,
+    km_per_liter: float,
+    speed_kmh: float = 60.0,
+    start: float = 0.0,
+    fuel: float = 50.0,
+    odometer: float = 0.0,
+) -> dict[str, np.ndarray]:
+    """Columns of a drive at constant speed and consumption."""
+    t = start + np.arange(minutes + 1) * MINUTE
+    km = np.arange(minutes + 1) * speed_kmh / 60
+    cols = {name: np.full(len(t), np.nan) for name in COLUMNS}
+    cols.update(
+        timestamp=t,
+        odometer_km=odometer + km,
+        fuel_liters=fuel - km / km_per_liter,
+        autonomy_km_l=np.full(len(t), km_per_liter),
+        speed_kmh=np.full(len(t), speed_kmh),
+    )
+    return cols
+
+
+def concat(*parts: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """Concatenate drives column by column."""
+    return {name: np.concatenate([p[name] for p in parts]) for name in COLUMNS}
+
+
+def test_estimate_constant_consumption():
+    """A steady drive gives its km/l and a tight interval."""
+    estimate = estimate_consumption(drive(600, km_per_liter=10.0))
+
+    assert estimate.km_per_liter == pytest.approx(10.0)
+    assert estimate.km == pytest.approx(600.0)
+    assert estimate.liters == pytest.approx(60.0)
+    assert estimate.buckets == 10
+    assert estimate.ci_low == pytest.approx(10.0)
+    assert estimate.ci_high == pytest.approx(10.0)
+    assert estimate.by_speed_band["40-80"] == pytest.approx(10.0)
+    assert estimate.by_speed_band["0-40"] is None
+    assert estimate.by_speed_band["110+"] is None
+
+
+def test_estimate_drops_refuelling_and_odometer_resets():
+    """Refuelling and odometer resets do not count as driving."""
+    first = drive(300, km_per_liter=10.0, fuel=40.0)
+    # Refuelled to 50 liters, then the odometer was reset
+    second = drive(300, km_per_liter=10.0, start=400 * MINUTE, fuel=50.0)
+
+    estimate = estimate_consumption(concat(first, second))
+
+    assert estimate.km_per_liter == pytest.approx(10.0)
+    assert estimate.km == pytest.approx(600.0)
+
+
+def test_estimate_speed_bands_and_trend():
+    """Consumption is split by speed band and compared week over week."""
+    slow = drive(600, km_per_liter=8.0, speed_kmh=30.0, fuel=100.0)
+    fast = drive(
+        600,
+        km_per_liter=12.0,
+        speed_kmh=90.0,
+        start=8 * DAY,
+        fuel=100.0,
+        odometer=1000.0,
+    )
+
+    estimate = estimate_consumption(concat(slow, fast))
+
+    assert estimate.by_speed_band["0-40"] == pytest.approx(8.0)
+    assert estimate.by_speed_band["80-110"] == pytest.approx(12.0)
+    # The last week (fast drive) against the week before (slow drive)
+    assert estimate.trend_km_per_liter == pytest.approx(4.0)
+    assert estimate.ci_low < estimate.km_per_liter < estimate.ci_high
+
+
+def test_estimate_window_ignores_old_samples():
+    """Samples older than the window are left out."""
+    old = drive(600, km_per_liter=5.0, fuel=200.0)
+    recent = drive(
+        600, km_per_liter=10.0, start=40 * DAY, fuel=200.0, odometer=1000.0
+    )
+
+    estimate = estimate_consumption(concat(old, recent), window_days=30.0)
+
+    assert estimate.km_per_liter == pytest.approx(10.0)
+
+
+def test_estimate_without_fuel_burnt():
+    """No estimate without fuel burnt."""
+    cols = drive(60, km_per_liter=10.0)
+    cols["fuel_liters"] = np.full(len(cols["timestamp"]), 40.0)
+
+    assert estimate_consumption(cols) is None
+    assert estimate_consumption(drive(0, km_per_liter=10.0)) is None
+
+
+def test_downsample_means_per_bin():
+    """Each bin holds the mean of its samples."""
+    cols = drive(99, km_per_liter=10.0)
+
+    rows = downsample(cols, 0.0, 100 * MINUTE, points=10)
+
+    assert len(rows) == 10
+    assert [r["samples"] for r in rows] == [10] * 10
+    assert rows[0]["timestamp"] == pytest.approx(5 * MINUTE)
+    assert rows[0]["odometer_km"] == pytest.approx(4.5)
+    assert rows[0]["speed_kmh"] == pytest.approx(60.0)
+    # Columns without readings are None
+    assert rows[0]["latitude"] is None
+
+
+def test_downsample_skips_empty_bins_and_ranges():
+    """Empty bins and ranges produce no rows."""
+    cols = concat(drive(9, 10.0), drive(9, 10.0, start=90 * MINUTE))
+
+    rows = downsample(cols, 0.0, 100 * MINUTE, points=10)
+
+    assert [r["samples"] for r in rows] == [10, 10]
+    assert downsample(cols, 200 * MINUTE, 300 * MINUTE, points=10) == []
+    assert downsample(cols, 0.0, 100 * MINUTE, points=0) == []
@@ -0,0 +1,83 @@
+"""
+File: test_intent_planner.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+import pytest
+
+from src.services.intent_planner import Intent, IntentPlanner
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Qual o status do carro?",
+        "Como está o estado do meu veículo?",
+        "Quanto combustível eu tenho?",
+        "Qual a autonomia do carro?",
+    ],
+)
+def test_match_car_status(text):
+    """Status questions plan car_status."""
+    assert IntentPlanner.match(text) == Intent("car_status")
+
+
+@pytest.mark.parametrize(
+    ("text", "distance"),
+    [
+        ("Consigo ir até Santos, 80 km?", 80.0),
+        ("Dá para viajar 120,5 km sem abastecer?", 120.5),
+        ("É possível percorrer 300 quilômetros?", 300.0),
+    ],
+)
+def test_match_trip_possible(text, distance):
+    """Trip questions plan trip_possible with the distance."""
+    assert IntentPlanner.match(text) == Intent(
+        "trip_possible", {"distance_km": distance}
+    )
+
+
+@pytest.mark.parametrize(
+    ("text", "destination_type"),
+    [
+        ("Me recomende uma praia para viajar", "praia"),
+        ("Sugira um destino na serra", "montanha"),
+        ("Para onde ir no feriado?", None),
+    ],
+)
+def test_match_recommend_destination(text, destination_type):
+    """Destination questions plan recommend_destination."""
+    assert IntentPlanner.match(text) == Intent(
+        "recommend_destination", {"destination_type": destination_type}
+    )
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        # Mentions fuel or a distance without asking for a planned intent
+        "Quanto custa encher o tanque de combustível?",
+        "Quanto tempo leva para percorrer 80 km?",
+        "A cada quantos km troco o óleo?",
+        "O carro faz 12 km por litro?",
+        # Several vehicles are left to the fleet tools
+        "Qual o status dos carros da frota?",
+        # Two intents at once
+        "Qual o status do carro? Me recomende uma praia",
+        "Bom dia!",
+    ],
+)
+def test_match_falls_back_to_the_reasoning_model(text):
+    """Other questions are left to the reasoning model."""
+    assert IntentPlanner.match(text) is None
+
+
+def test_match_rejects_long_queries(monkeypatch):
+    """Queries over INTENT_PLANNER_MAX_WORDS are not planned."""
+    monkeypatch.setenv("INTENT_PLANNER_MAX_WORDS", "3")
+
+    assert IntentPlanner.match("Qual o status do carro?") is None
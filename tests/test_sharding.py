@@ -0,0 +1,112 @@
+"""
+File: test_sharding.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+from collections import Counter
+import json
+
+import pytest
+from starlette.requests import Request
+
+from src.app.launcher import routing_key
+from src.utils.sharding import owns, shard_for
+
+
+def make_request(
+    path: str = "/chat",
+    body: dict | None = None,
+    headers: dict[str, str] | None = None,
+) -> tuple[Request, bytes]:
+    """Build a POST request and its raw body."""
+    raw_headers = [
+        (k.lower().encode(), v.encode()) for k, v in (headers or {}).items()
+    ]
+    if body is not None:
+        raw_headers.append((b"content-type", b"application/json"))
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": path,
+        "query_string": b"",
+        "headers": raw_headers,
+    }
+    return Request(scope), b"" if body is None else json.dumps(body).encode()
+
+
+def test_shard_for_is_stable_and_in_range():
+    """A key always maps to the same worker in range."""
+    assert shard_for("thread-1", 4) == shard_for("thread-1", 4)
+    assert all(0 <= shard_for(f"t{i}", 3) < 3 for i in range(100))
+    assert shard_for("anything", 1) == 0
+
+
+def test_shard_for_spreads_keys():
+    """Keys are spread evenly across workers."""
+    counts = Counter(shard_for(f"thread-{i}", 4) for i in range(4000))
+
+    assert set(counts) == {0, 1, 2, 3}
+    assert min(counts.values()) > 800
+
+
+def test_routing_key_prefers_the_header():
+    """The X-Thread-Id header wins over the body."""
+    request, body = make_request(
+        body={"thread_id": "from-body"}, headers={"X-Thread-Id": "from-header"}
+    )
+
+    assert routing_key(request, body) == "from-header"
+
+
+def test_routing_key_reads_the_json_body():
+    """The thread_id comes from the JSON body."""
+    request, body = make_request(body={"message": "oi", "thread_id": 42})
+
+    assert routing_key(request, body) == "42"
+
+
+@pytest.mark.parametrize(
+    "body", [None, {"message": "oi"}, ["thread_id"], {"thread_id": ""}]
+)
+def test_routing_key_without_thread_id(body):
+    """Requests without a thread_id have no key."""
+    request, raw = make_request(body=body)
+
+    assert routing_key(request, raw) is None
+
+
+def test_routing_key_ignores_invalid_json():
+    """An invalid JSON body has no key."""
+    request, _ = make_request(body={})
+
+    assert routing_key(request, b"{not json") is None
+
+
+def test_routing_key_of_telemetry_is_the_vehicle():
+    """Telemetry requests are routed by vehicle."""
+    request, body = make_request(
+        "/telemetry/vehicles/car-7/history",
+        body={"thread_id": "t"},
+        headers={"X-Thread-Id": "t"},
+    )
+
+    assert routing_key(request, body) == "car-7"
+
+
+def test_owns(monkeypatch):
+    """Each vehicle is owned by exactly one worker."""
+    monkeypatch.delenv("WORKER_INDEX", raising=False)
+    monkeypatch.delenv("WORKER_COUNT", raising=False)
+    assert owns("car")
+
+    monkeypatch.setenv("WORKER_COUNT", "3")
+    owners = []
+    for index in range(3):
+        monkeypatch.setenv("WORKER_INDEX", str(index))
+        owners.append(owns("car"))
+    assert owners.count(True) == 1
+    assert owners.index(True) == shard_for("car", 3)
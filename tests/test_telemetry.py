@@ -0,0 +1,95 @@
+"""
+File: test_telemetry.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+import pytest
+
+from src.data_models.telemetry import TelemetrySample
+from src.services.car.history import TelemetryHistory
+from src.services.car.telemetry import TelemetryService
+
+
+@pytest.fixture(autouse=True)
+def telemetry(monkeypatch, tmp_path):
+    """Empty telemetry with its history in a temporary directory."""
+    monkeypatch.setenv("TELEMETRY_HISTORY_DIR", str(tmp_path))
+    monkeypatch.setenv("TELEMETRY_MAX_VEHICLES", "2")
+    TelemetryService.clear()
+    TelemetryHistory.clear()
+    yield
+    TelemetryService.clear()
+    TelemetryHistory.clear()
+
+
+def sample(vehicle_id: str, timestamp: float, fuel: float = 40.0):
+    """Build a telemetry sample."""
+    return TelemetrySample(
+        vehicle_id=vehicle_id,
+        timestamp=timestamp,
+        fuel_liters=fuel,
+        autonomy_km_l=10.0,
+    )
+
+
+def test_ingest_keeps_samples_in_time_order():
+    """A batch is applied in time order."""
+    # Out of order within the batch: sorted, not stale
+    counts = TelemetryService.ingest(
+        [sample("car", 3.0, 38.0), sample("car", 1.0), sample("car", 2.0)]
+    )
+
+    assert counts == {"accepted": 3, "stale": 0, "rejected": 0}
+    assert TelemetryService.latest("car")["fuel_liters"] == pytest.approx(38.0)
+    assert [s["timestamp"] for s in TelemetryService.recent("car")] == [
+        1.0,
+        2.0,
+        3.0,
+    ]
+
+
+def test_ingest_counts_samples_older_than_latest_as_stale():
+    """Samples older than the latest reading are stale."""
+    TelemetryService.ingest([sample("car", 10.0)])
+
+    counts = TelemetryService.ingest(
+        [sample("car", 5.0), sample("car", 10.0), sample("car", 11.0)]
+    )
+
+    assert counts == {"accepted": 2, "stale": 1, "rejected": 0}
+    assert TelemetryService.latest("car")["timestamp"] == pytest.approx(11.0)
+    assert len(TelemetryHistory.view("car")["timestamp"]) == 3
+
+
+def test_ingest_rejects_vehicles_over_the_limit():
+    """Vehicles over TELEMETRY_MAX_VEHICLES are rejected."""
+    counts = TelemetryService.ingest(
+        [
+            sample("a", 1.0),
+            sample("b", 1.0),
+            sample("c", 1.0),
+            sample("c", 2.0),
+        ]
+    )
+
+    assert counts == {"accepted": 2, "stale": 0, "rejected": 2}
+    assert TelemetryService.latest("c") is None
+    assert TelemetryHistory.view("c") is None
+
+
+def test_restart_restores_the_latest_sample_from_history():
+    """The latest sample is restored from history."""
+    TelemetryService.ingest([sample("car", 1.0), sample("car", 2.0, 35.5)])
+    TelemetryHistory.flush()
+
+    TelemetryService.clear()
+    TelemetryHistory.clear()
+
+    assert TelemetryService.latest("car")["fuel_liters"] == pytest.approx(35.5)
+    ids, cols = TelemetryService.snapshots()
+    assert ids == ["car"]
+    assert cols["fuel_liters"][0] == pytest.approx(35.5)
@@ -0,0 +1,102 @@
+"""
+File: test_tool_result_store.py
+Project: Agentic AI example
+Created: Monday, 19th October 2026
+Author: Klaus
+
+MIT License
+"""
+
+import re
+
+import pytest
+
+from src.utils.tool_result_store import ToolResultStore
+
+
+@pytest.fixture(autouse=True)
+def store():
+    """Empty store around each test."""
+    ToolResultStore.clear()
+    yield
+    ToolResultStore.clear()
+
+
+def stored_ref(text: str) -> str:
+    """Return the reference left in a compacted result."""
+    match = re.search(r'ref="([0-9a-f]+)", offset=(\d+)', text)
+    assert match, text
+    return match.group(1)
+
+
+def test_short_results_are_kept_as_is():
+    """Results within the cap are not stored."""
+    assert ToolResultStore.compact("ok", max_chars=10) == "ok"
+    assert ToolResultStore.compact("x" * 10, max_chars=10) == "x" * 10
+    # 0 disables the cap
+    assert ToolResultStore.compact("x" * 100, max_chars=0) == "x" * 100
+    assert ToolResultStore.metrics()["results"] == 0
+
+
+def test_long_results_keep_the_head_and_a_reference():
+    """Long results keep their head and point to the full text."""
+    content = "abcdefghij" * 50
+
+    compacted = ToolResultStore.compact(content, max_chars=100)
+
+    assert compacted.startswith(content[:100] + "\n\n")
+    assert "100 de 500 caracteres" in compacted
+    assert "offset=100" in compacted
+    assert ToolResultStore.get(stored_ref(compacted)) == content
+
+
+def test_cut_at_a_close_line_break():
+    """The cut moves back to a nearby line break."""
+    content = "a" * 90 + "\n" + "b" * 200
+
+    compacted = ToolResultStore.compact(content, max_chars=100)
+
+    assert compacted.startswith("a" * 90 + "\n\n[")
+    assert "offset=90" in compacted
+
+
+def test_far_line_break_is_ignored():
+    """A line break far from the cap is ignored."""
+    content = "a" * 10 + "\n" + "b" * 200
+
+    compacted = ToolResultStore.compact(content, max_chars=100)
+
+    assert compacted.startswith(content[:100] + "\n\n[")
+
+
+def test_unreadable_results_are_only_truncated():
+    """Results without a read tool are truncated, not stored."""
+    compacted = ToolResultStore.compact("x" * 500, readable=False, max_chars=50)
+
+    assert compacted == (
+        "x" * 50 + "\n\n[Resultado truncado: 50 de 500 caracteres.]"
+    )
+    assert ToolResultStore.metrics()["results"] == 0
+
+
+def test_default_cap_comes_from_the_environment(monkeypatch):
+    """TOOL_RESULT_MAX_CHARS sets the default cap."""
+    monkeypatch.setenv("TOOL_RESULT_MAX_CHARS", "20")
+
+    compacted = ToolResultStore.compact("y" * 30)
+
+    assert compacted.startswith("y" * 20 + "\n\n")
+
+
+def test_store_evicts_least_recently_used(monkeypatch):
+    """The store evicts the least recently used result."""
+    # Room for two results of 1 KiB
+    monkeypatch.setenv("TOOL_RESULT_STORE_MAX_MB", str(2.5 / 1024))
+    first = ToolResultStore.put("1" * 1024)
+    second = ToolResultStore.put("2" * 1024)
+    ToolResultStore.get(first)
+
+    ToolResultStore.put("3" * 1024)
+
+    assert ToolResultStore.get(first) is not None
+    assert ToolResultStore.get(second) is None